@@ -5,6 +5,9 @@ WhisperX Note - 로컬 AI 기반 음성 회의록 시스템
 사용법:
     python run.py              # 웹 서버 실행
     python run.py --cli FILE   # CLI 모드로 파일 처리
+    python run.py --benchmark-storage  # 결과 저장 형식별 크기/로드 시간 비교
+    python run.py --migrate-storage    # 모든 세션 결과를 설정된 형식으로 변환
+    python run.py --gc-audio           # 오디오 저장소 정리 (중복 제거, 고아 다운로드 삭제)
 """
 
 import argparse
@@ -29,7 +32,7 @@ def run_web():
 
 def run_cli(audio_path: str, output_path: str = None, language: str = "korean"):
     """CLI 모드로 오디오 파일 처리"""
-    from src.transcriber import WhisperXTranscriber, format_transcription
+    from src.transcriber import WhisperXTranscriber, iter_transcription
     from src.meeting_minutes import MeetingMinutesGenerator
 
     audio_file = Path(audio_path)
@@ -46,8 +49,10 @@ def run_cli(audio_path: str, output_path: str = None, language: str = "korean"):
     transcriber.load_model()
     result = transcriber.transcribe_with_segments(audio_path, language=language)
 
-    # 결과 출력
-    print(format_transcription(result))
+    # 결과 출력 (줄 단위)
+    for part in iter_transcription(result):
+        sys.stdout.write(part)
+    print()
 
     # 회의록 생성 및 저장
     if output_path:
@@ -65,6 +70,50 @@ def run_cli(audio_path: str, output_path: str = None, language: str = "korean"):
         print(f"\n회의록 저장됨: {output_path}")
 
 
+def run_storage_benchmark():
+    """저장된 세션으로 결과 저장 형식 비교"""
+    from src.config import SESSIONS_DIR
+    from src.result_store import benchmark
+
+    report = benchmark(SESSIONS_DIR)
+    baseline = next((r for r in report if r["format"] == "json"), None)
+    print(f"세션 수: {report[0]['sessions'] if report else 0}")
+    print(f"{'형식':<14}{'크기(KB)':>12}{'비율':>8}{'로드(ms)':>12}")
+    for row in report:
+        ratio = row["bytes"] / baseline["bytes"] if baseline and baseline["bytes"] else 0
+        print(f"{row['format']:<14}{row['bytes'] / 1024:>12.1f}{ratio:>8.2f}{row['load_ms']:>12.2f}")
+
+
+def run_storage_migration():
+    """모든 세션 결과를 설정된 형식으로 변환"""
+    from src.config import SESSIONS_DIR, RESULT_FORMAT
+    from src.result_store import ResultStore
+
+    store = ResultStore(RESULT_FORMAT)
+    count = store.migrate_all(SESSIONS_DIR)
+    print(f"{count}개 세션을 {store.codec.name} 형식으로 변환했습니다.")
+
+
+def run_audio_gc(max_age_days: float):
+    """세션 오디오를 저장소로 이전하고 참조 없는 오디오/다운로드 삭제"""
+    from src.config import DOWNLOADS_DIR
+    from src.session_manager import SessionManager
+
+    session_manager = SessionManager()
+    store = session_manager.audio_store
+
+    migrated = session_manager.migrate_audio()
+    store.sync_refs(session_manager.audio_references())
+    blobs = store.collect_garbage()
+    downloads = store.collect_downloads(DOWNLOADS_DIR, max_age_days)
+    stats = store.stats()
+
+    print(f"세션 오디오 이전: {migrated}개")
+    print(f"참조 없는 오디오 삭제: {blobs['blobs']}개 ({blobs['bytes'] / 1024 / 1024:.1f} MB)")
+    print(f"고아 다운로드 삭제: {downloads['files']}개 ({downloads['bytes'] / 1024 / 1024:.1f} MB)")
+    print(f"저장소: 오디오 {stats['blobs']}개, {stats['bytes'] / 1024 / 1024:.1f} MB, 참조 {stats['refs']}개")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="WhisperX Note - 로컬 AI 기반 음성 회의록 시스템",
@@ -74,6 +123,7 @@ def main():
   python run.py                              # 웹 서버 실행
   python run.py --cli meeting.mp3            # CLI로 파일 처리
   python run.py --cli meeting.mp3 -o output.md -l korean
+  python run.py --benchmark-storage          # 결과 저장 형식 비교
         """
     )
 
@@ -86,9 +136,23 @@ def main():
         help="인식 언어 (기본: korean)"
     )
 
+    parser.add_argument("--benchmark-storage", action="store_true", help="결과 저장 형식별 크기/로드 시간 비교")
+    parser.add_argument("--migrate-storage", action="store_true", help="모든 세션 결과를 설정된 형식으로 변환")
+    parser.add_argument("--gc-audio", action="store_true", help="오디오 저장소 정리 (중복 제거, 고아 다운로드 삭제)")
+    parser.add_argument(
+        "--gc-max-age-days", type=float, default=7,
+        help="이 기간(일)보다 오래된, 세션에서 쓰지 않는 다운로드만 삭제 (기본: 7)"
+    )
+
     args = parser.parse_args()
 
-    if args.cli:
+    if args.benchmark_storage:
+        run_storage_benchmark()
+    elif args.migrate_storage:
+        run_storage_migration()
+    elif args.gc_audio:
+        run_audio_gc(args.gc_max_age_days)
+    elif args.cli:
         run_cli(args.cli, args.output, args.language)
     else:
         run_web()
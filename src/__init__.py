@@ -2,7 +2,7 @@
 WhisperX Note - 로컬 AI 기반 음성 회의록 시스템
 """
 
-from .transcriber import WhisperXTranscriber, format_transcription
+from .transcriber import WhisperXTranscriber, format_transcription, iter_transcription
 from .session_manager import SessionManager
 from .meeting_minutes import MeetingMinutesGenerator
 from .rag_chat import TranscriptRAG, get_rag
@@ -10,6 +10,7 @@ from .rag_chat import TranscriptRAG, get_rag
 __all__ = [
     "WhisperXTranscriber",
     "format_transcription",
+    "iter_transcription",
     "SessionManager",
     "MeetingMinutesGenerator",
     "TranscriptRAG",
@@ -3,27 +3,47 @@ WhisperX Note - FastAPI 웹 서버
 """
 
 import base64
+import json
 import mimetypes
-import subprocess
 import tempfile
+import threading
 from pathlib import Path
+from typing import Optional, Iterator
+from urllib.parse import quote
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from datetime import datetime
 import uvicorn
 
-from .config import STATIC_DIR, TEMPLATES_DIR, DOWNLOADS_DIR, ensure_dirs
-from .transcriber import WhisperXTranscriber
+from .config import (
+    STATIC_DIR, TEMPLATES_DIR, DOWNLOADS_DIR, SEARCH_INDEX_PATH, STRUCTURE_INDEX_PATH, SUMMARY_REFRESH_DELAY,
+    ensure_dirs
+)
+from .transcriber import WhisperXTranscriber, iter_transcription
 from .meeting_minutes import MeetingMinutesGenerator
 from .session_manager import SessionManager
 from .document_manager import DocumentManager
 from .folder_manager import FolderManager
-from .rag_chat import get_rag
+from .executor import pools, run_in_pool, iterate_in_pool, LoopLagMonitor
+from .exporter import SessionExporter, EXPORT_FORMATS, safe_filename, iter_encoded, STREAM_CHUNK_BYTES
+from .session_views import SessionViewCache, speaker_names
+from .summarizer import MeetingSummarizer
+from .chunk_manifest import ChunkManifest
+from .search_index import SearchIndex
+from .structure_index import StructureIndex
+from .rag_chat import get_rag, legacy_index_dirs
+from .youtube_downloader import YouTubeDownloader
 
 # 디렉토리 초기화
 ensure_dirs()
+
+# YouTube 원본 오디오 형식 재생용 MIME 타입
+mimetypes.add_type("audio/ogg", ".opus")
+mimetypes.add_type("audio/mp4", ".m4a")
+mimetypes.add_type("audio/webm", ".webm")
 DATA_DIR = Path("data")  # Ensure this exists or imported
 
 app = FastAPI(title="WhisperX Note")
@@ -33,40 +53,214 @@ app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
 
 # Managers
-session_manager = SessionManager()
-document_manager = DocumentManager(DATA_DIR)
-folder_manager = FolderManager(DATA_DIR)
+search_index = SearchIndex(SEARCH_INDEX_PATH)
+structure_index = StructureIndex(STRUCTURE_INDEX_PATH)
+session_manager = SessionManager(search_index=search_index, structure_index=structure_index)
+document_manager = DocumentManager(DATA_DIR, search_index=search_index, structure_index=structure_index)
+folder_manager = FolderManager(DATA_DIR, structure_index=structure_index)
 minutes_generator = MeetingMinutesGenerator()
+session_exporter = SessionExporter(session_manager, minutes_generator)
+session_views = SessionViewCache(minutes_generator)
+summarizer = MeetingSummarizer()
+
+# 편집 후 요약 갱신 예약 (session_id -> Timer)
+summary_timers: dict = {}
+summary_timers_lock = threading.Lock()
+
+# 이벤트 루프 지연 측정 (블로킹 작업이 루프를 막는지 확인용)
+loop_monitor = LoopLagMonitor()
+
+# 문서 업로드 진행 상황 (upload_id -> {"done", "total", "status"})
+upload_progress: dict = {}
+
+
+def rebuild_search_index() -> None:
+    """기존 세션/문서 전체를 전문 검색 색인에 등록"""
+    for meta in session_manager.list_sessions():
+        try:
+            _, result, _ = session_manager.load_session(meta["id"])
+            if result:
+                search_index.index_segments(meta["id"], result.get("segments", []))
+        except Exception as e:
+            print(f"검색 색인 오류 ({meta.get('id')}): {e}")
+    for doc in document_manager.list_documents():
+        try:
+            search_index.index_document(doc["id"], document_manager.iter_text(doc["id"]))
+        except Exception as e:
+            print(f"검색 색인 오류 ({doc.get('id')}): {e}")
+    print("전문 검색 색인 생성 완료")
+
+
+def rag_metadata(source_id: str) -> Optional[dict]:
+    """RAG 청크 메타데이터 (세션/문서 종류와 폴더, 없는 ID면 None)"""
+    doc = document_manager.get_document(source_id)
+    if doc:
+        return {"source_type": "document", "folder_id": doc.get("folder_id")}
+    meta = session_manager.catalog.get(source_id)
+    if meta:
+        return {"source_type": "session", "folder_id": meta.get("folder_id")}
+    return None
+
+
+def migrate_rag_index() -> None:
+    """이전 버전의 세션별 벡터 인덱스를 공유 컬렉션으로 이전"""
+    try:
+        count = get_rag().migrate_legacy(rag_metadata)
+        print(f"벡터 인덱스 이전 완료: {count}개")
+    except Exception as e:
+        print(f"벡터 인덱스 이전 오류: {e}")
+
+
+def rebuild_structure_index() -> None:
+    """폴더/세션/문서 메타데이터로 구조 색인 재구축"""
+    count = structure_index.rebuild({
+        "folder": folder_manager.list_folders(),
+        "session": [SessionManager.structure_entry(s) for s in session_manager.list_sessions()],
+        "document": document_manager.list_documents()
+    })
+    print(f"구조 색인 생성 완료: {count}개")
+
+
+if structure_index.is_new:
+    rebuild_structure_index()
+
+# 검색 색인이 새로 만들어졌으면 기존 데이터를 백그라운드에서 색인
+if search_index.is_new:
+    threading.Thread(target=rebuild_search_index, daemon=True).start()
+
+# 세션별 벡터 인덱스 디렉토리가 남아 있으면 백그라운드에서 공유 컬렉션으로 이전
+if legacy_index_dirs():
+    threading.Thread(target=migrate_rag_index, daemon=True).start()
+
+
+def _chunk_manifest(session_id: str) -> ChunkManifest:
+    return ChunkManifest(session_manager.base_dir / session_id, summarizer.chunk_chars)
+
+
+def _load_views(session_id: str, render: bool = True) -> dict:
+    """세션 로드 후 청크 매니페스트(바뀐 청크만)와 파생 뷰(내용이 바뀌었을 때만) 갱신
+
+    render=False이면 회의록/녹취록 뷰는 건너뜀 (views는 None)
+    """
+    meta, result, audio_path = session_manager.load_session(session_id)
+    segments = result.get("segments", []) if result else []
+    speaker_table = session_manager.get_speakers(session_id) if result else []
+    summary = session_manager.load_summary(session_id)
+
+    manifest = _chunk_manifest(session_id)
+    with manifest.lock:
+        if manifest.load().refresh(segments):
+            manifest.save()
+
+    # 편집 저널이 병합되기 전에도 발화 통계가 맞도록 청크별 통계 합계 사용
+    stats = manifest.speaker_stats()
+    for speaker in speaker_table:
+        speaker.update(stats.get(speaker["id"], {"talk_time": 0.0, "segment_count": 0}))
+
+    views = session_views.get(
+        session_manager.base_dir / session_id, meta, result, speaker_table, summary,
+        transcript_sections=manifest.sections()
+    ) if render else None
+    return {
+        "meta": meta,
+        "segments": segments,
+        "audio_path": audio_path,
+        "speaker_table": speaker_table,
+        "summary": summary,
+        "views": views
+    }
+
+
+def _render_views(session_id: str) -> None:
+    """세션 파생 뷰(회의록/녹취록/화자 목록)를 미리 렌더링하여 캐시"""
+    try:
+        _load_views(session_id)
+    except Exception as e:
+        print(f"뷰 렌더링 오류 ({session_id}): {e}")
+
+
+def refresh_views(session_id: str) -> None:
+    """저장/편집 직후 I/O 작업 풀에서 뷰 렌더링 (응답을 기다리게 하지 않음)"""
+    pools.submit("io", _render_views, session_id)
+
+
+def _build_summary(session_id: str) -> dict:
+    """구간별 요약(map, 바뀐 청크만) → 전체 요약(reduce) 후 저장하고 회의록 다시 렌더링"""
+    _, result, _ = session_manager.load_session(session_id)
+    if not result or not result.get("segments"):
+        raise ValueError("요약할 전사 내용이 없습니다")
+    summary = summarizer.summarize(result["segments"], _chunk_manifest(session_id))
+    session_manager.save_summary(session_id, summary)
+    _render_views(session_id)
+    return summary
+
+
+def _refresh_summary(session_id: str) -> None:
+    with summary_timers_lock:
+        summary_timers.pop(session_id, None)
+    try:
+        if session_manager.load_summary(session_id) is not None:
+            _build_summary(session_id)
+    except Exception as e:
+        print(f"요약 갱신 오류 ({session_id}): {e}")
+
+
+def schedule_summary_refresh(session_id: str) -> None:
+    """요약이 있는 세션은 편집이 멈추면 바뀐 청크만 다시 요약 (기존 예약은 취소하고 다시 예약)"""
+    with summary_timers_lock:
+        timer = summary_timers.pop(session_id, None)
+        if timer:
+            timer.cancel()
+        timer = threading.Timer(SUMMARY_REFRESH_DELAY, _refresh_summary, args=(session_id,))
+        timer.daemon = True
+        summary_timers[session_id] = timer
+        timer.start()
 
 
 # 헬퍼 함수: 세션 재인덱싱
 async def reindex_session(session_id: str) -> bool:
     """세션의 RAG 인덱스를 재생성합니다 (화자/텍스트 수정 후 호출)"""
     try:
-        meta, result, _ = session_manager.load_session(session_id)
+        meta, result, _ = await pools.run_io(session_manager.load_session, session_id)
         if not result or "segments" not in result:
             return False
-        
-        def format_time(seconds):
-            mins = int(seconds // 60)
-            secs = int(seconds % 60)
-            return f"{mins:02d}:{secs:02d}"
-        
-        full_text = "\n".join(
-            f"[{format_time(seg.get('start', 0))} - {format_time(seg.get('end', 0))}] [{seg.get('speaker', 'SPEAKER')}] {seg.get('text', '')}"
-            for seg in result["segments"]
-        )
-        
+
+        # 세그먼트 단위 청크로 나누어 바뀐 청크만 임베딩하고 없어진 청크만 삭제
         rag = get_rag()
-        rag.delete_index(session_id)
-        success = rag.index_transcript(session_id, full_text)
-        print(f"세션 재인덱싱 완료: {session_id}, 성공: {success}")
-        return success
+        diff = await pools.run_io(
+            rag.sync_segments, session_id, result["segments"],
+            {"source_type": "session", "folder_id": meta.get("folder_id")}
+        )
+        print(f"세션 재인덱싱 완료: {session_id}, 추가 {diff['added']} / 삭제 {diff['removed']} / 유지 {diff['kept']}")
+        return True
     except Exception as e:
         print(f"재인덱싱 오류: {e}")
         return False
 
 
+@app.on_event("startup")
+async def start_loop_monitor():
+    loop_monitor.start()
+
+
+@app.on_event("shutdown")
+async def stop_workers():
+    await loop_monitor.stop()
+    pools.shutdown(wait=False)
+
+
+@app.get("/api/metrics/loop")
+async def get_loop_metrics():
+    """이벤트 루프 지연과 작업 풀 상태"""
+    return {"loop": loop_monitor.snapshot(), "pools": pools.stats()}
+
+
+@app.get("/api/metrics/embeddings")
+async def get_embedding_metrics():
+    """RAG 임베딩 요청 처리량/재시도와 임베딩 캐시 통계"""
+    return await pools.run_io(get_rag().embedding_stats)
+
+
 @app.get("/")
 async def index(request: Request):
     """메인 페이지"""
@@ -74,33 +268,60 @@ async def index(request: Request):
 
 
 @app.get("/api/structure")
-async def get_structure():
-    """전체 구조(폴더, 세션, 문서) 조회"""
-    return {
-        "folders": folder_manager.list_folders(),
-        "sessions": [
-            {
-                "id": s.get("id"), 
-                "title": s.get("title", "무제"), 
-                "date": s.get("created_at", ""),
-                "folder_id": s.get("folder_id")
-            }
-            for s in session_manager.list_sessions()
-        ],
-        "documents": document_manager.list_documents()
-    }
+async def get_structure(request: Request, since: Optional[int] = None):
+    """전체 구조(폴더, 세션, 문서) 조회
+
+    - 응답에는 구조 버전(version)이 포함되며 ETag로도 전달된다.
+    - If-None-Match가 현재 버전과 같으면 304를 반환한다.
+    - since=버전을 주면 그 이후 바뀐 아이템과 삭제된 아이템(deleted)만 반환한다.
+    """
+    version = await pools.run_io(structure_index.version)
+    etag = f'"structure-{version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # since가 현재 버전보다 크면 색인이 재구축된 것이므로 전체 구조 반환
+    if since is not None and 0 <= since <= version:
+        data = await pools.run_io(structure_index.changes_since, since)
+        data["full"] = False
+    else:
+        data = await pools.run_io(structure_index.snapshot)
+        data["full"] = True
+        data["documents"].sort(key=lambda d: d.get("created_at", ""), reverse=True)
+        data["sessions"].sort(key=lambda s: s.get("date", ""), reverse=True)
+
+    return Response(
+        content=json.dumps(data, ensure_ascii=False),
+        media_type="application/json",
+        headers={"ETag": f'"structure-{data["version"]}"', "Cache-Control": "no-cache"}
+    )
+
+@app.get("/api/folders/{folder_id}/children")
+async def get_folder_children(folder_id: str, offset: int = 0, limit: int = 100, type: Optional[str] = None):
+    """폴더 한 단계의 자식 목록 (폴더 먼저, 최신순, 페이지 단위)
+
+    folder_id='root'이면 최상위. 폴더 아이템에는 하위 아이템 수(item_count)가 포함된다.
+    """
+    parent_id = None if folder_id == 'root' else folder_id
+    if parent_id and not await pools.run_io(structure_index.get, "folder", parent_id):
+        raise HTTPException(status_code=404, detail="Folder not found")
+    limit = max(1, min(limit, 500))
+    page = await pools.run_io(structure_index.list_children, parent_id, offset=max(0, offset), limit=limit, item_type=type)
+    page.update({"folder_id": folder_id, "offset": offset, "limit": limit})
+    return page
+
 
 @app.post("/api/folders")
 async def create_folder(name: str = Form(...), parent_id: str = Form(None)):
     """폴더 생성"""
     if parent_id == 'root': parent_id = None
-    folder = folder_manager.create_folder(name, parent_id)
+    folder = await pools.run_io(folder_manager.create_folder, name, parent_id)
     return {"success": True, "folder": folder}
 
 @app.put("/api/folders/{folder_id}")
 async def update_folder(folder_id: str, name: str = Form(...)):
     """폴더 수정 (이름)"""
-    folder = folder_manager.update_folder(folder_id, name=name)
+    folder = await pools.run_io(folder_manager.update_folder, folder_id, name=name)
     if folder:
         return {"success": True, "folder": folder}
     return {"success": False, "detail": "Folder not found"}
@@ -109,7 +330,7 @@ async def update_folder(folder_id: str, name: str = Form(...)):
 async def delete_folder(folder_id: str):
     """폴더 삭제"""
     # Note: Children will be orphaned (moved to root) by default implementation
-    if folder_manager.delete_folder(folder_id):
+    if await pools.run_io(folder_manager.delete_folder, folder_id):
         return {"success": True}
     return {"success": False, "detail": "Folder not found"}
 
@@ -127,26 +348,208 @@ async def move_item(
         target_folder_id = None
         
     if type == 'session':
-        success = session_manager.update_folder(item_id, target_folder_id)
+        success = await pools.run_io(session_manager.update_folder, item_id, target_folder_id)
     elif type == 'document':
-        success = document_manager.update_folder(item_id, target_folder_id)
+        success = await pools.run_io(document_manager.update_folder, item_id, target_folder_id)
     elif type == 'folder':
         # 폴더 이동
         try:
-            result = folder_manager.update_folder(item_id, parent_id=target_folder_id)
+            result = await pools.run_io(folder_manager.update_folder, item_id, parent_id=target_folder_id)
             success = result is not None
         except ValueError as e:
             return {"success": False, "detail": str(e)}
+
+    if success and type in ('session', 'document'):
+        # 벡터 인덱스 청크의 폴더 메타데이터도 갱신
+        pools.submit("io", _update_rag_folder, [item_id], target_folder_id)
             
     if success:
         return {"success": True}
     else:
         return {"success": False, "detail": "Move failed"}
 
+@app.post("/api/bulk")
+async def bulk_items(request: Request):
+    """여러 아이템 일괄 이동/삭제
+
+    {"action": "move" | "delete", "items": [{"id", "type"}], "target_folder_id": ...}
+    """
+    data = await request.json()
+    action = data.get("action")
+    items = data.get("items", [])
+    target_folder_id = data.get("target_folder_id")
+    if target_folder_id == 'root':
+        target_folder_id = None
+
+    ids_by_type = {"session": [], "document": [], "folder": []}
+    for item in items:
+        if item.get("type") in ids_by_type:
+            ids_by_type[item["type"]].append(item.get("id"))
+
+    if action not in ("move", "delete"):
+        return {"success": False, "detail": f"알 수 없는 작업: {action}"}
+    try:
+        done = await _apply_bulk(action, ids_by_type, target_folder_id)
+    except ValueError as e:
+        return {"success": False, "detail": str(e)}
+
+    return {"success": True, "count": len(done), "ids": done}
+
+
+def _update_rag_folder(source_ids: list, folder_id: Optional[str]) -> None:
+    try:
+        get_rag().update_folder(source_ids, folder_id)
+    except Exception as e:
+        print(f"벡터 인덱스 폴더 갱신 오류: {e}")
+
+
+@run_in_pool("io")
+def _apply_bulk(action: str, ids_by_type: dict, target_folder_id: Optional[str]) -> list:
+    if action == "move":
+        moved = (
+            session_manager.update_folders(ids_by_type["session"], target_folder_id)
+            + document_manager.update_folders(ids_by_type["document"], target_folder_id)
+        )
+        _update_rag_folder(moved, target_folder_id)
+        return moved + folder_manager.move_folders(ids_by_type["folder"], target_folder_id)
+    rag = get_rag()
+    for session_id in ids_by_type["session"]:
+        rag.delete_index(session_id)
+        session_manager.delete_session(session_id)
+        session_views.invalidate(session_id)
+    deleted_docs = document_manager.delete_documents(ids_by_type["document"])
+    for doc_id in deleted_docs:
+        rag.delete_index(doc_id)
+    return ids_by_type["session"] + deleted_docs + folder_manager.delete_folders(ids_by_type["folder"])
+
+
+@app.get("/api/search")
+async def search(q: str, limit: int = 20, type: str = None):
+    """전사/문서 전문 검색 (type: session | document)"""
+    return {"query": q, "hits": await _search_hits(q, limit, type)}
+
+
+@run_in_pool("io")
+def _search_hits(q: str, limit: int, type: Optional[str]) -> list:
+    hits = search_index.search(q, limit=limit, source_type=type)
+    speaker_names: dict = {}
+    for hit in hits:
+        if hit["source_type"] == "session":
+            sid = hit["source_id"]
+            meta = session_manager.catalog.get(sid) or {}
+            hit["title"] = meta.get("title", "무제")
+            if sid not in speaker_names:
+                speaker_names[sid] = {sp["id"]: sp["name"] for sp in session_manager.get_speakers(sid)}
+            hit["speaker"] = speaker_names[sid].get(hit["speaker"], hit["speaker"])
+        else:
+            doc = document_manager.get_document(hit["source_id"]) or {}
+            hit["title"] = doc.get("filename", "")
+    return hits
+
+
+def _export_session_ids(session_ids: list, folder_id: Optional[str], recursive: bool) -> list:
+    """내보낼 세션 ID 목록 (직접 지정 + 폴더 하위 세션)"""
+    ids = list(session_ids)
+    if folder_id == 'root':
+        if recursive:
+            ids.extend(s["id"] for s in session_manager.list_sessions())
+        else:
+            ids.extend(item["id"] for item in structure_index.list_children(None, limit=-1, item_type="session")["items"])
+    elif folder_id:
+        if recursive:
+            ids.extend(item["id"] for item in structure_index.descendants(folder_id) if item["type"] == "session")
+        else:
+            ids.extend(structure_index.child_ids(folder_id, "session"))
+    return list(dict.fromkeys(ids))
+
+
+async def _export_response(session_ids: list, folder_id: Optional[str], formats: list, recursive: bool):
+    ids = await pools.run_io(_export_session_ids, session_ids, folder_id, recursive)
+    if not ids:
+        raise HTTPException(status_code=404, detail="내보낼 세션이 없습니다")
+    formats = [fmt for fmt in formats if fmt in EXPORT_FORMATS] or list(EXPORT_FORMATS)
+
+    if folder_id and folder_id != 'root':
+        name = (folder_manager.get_folder(folder_id) or {}).get("name", "export")
+    else:
+        name = "whisperx_export"
+    filename = f"{safe_filename(name, 'export')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return StreamingResponse(
+        iterate_in_pool(session_exporter.iter_zip(ids, formats)),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}"}
+    )
+
+
+def _text_response(parts, media_type: str, filename: Optional[str] = None) -> StreamingResponse:
+    """텍스트 조각 스트림을 chunked 응답으로 (filename이 있으면 다운로드)"""
+    headers = {"Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}"} if filename else None
+    return StreamingResponse(
+        iterate_in_pool(iter_encoded(parts)),
+        media_type=f"{media_type}; charset=utf-8",
+        headers=headers
+    )
+
+
+def _iter_slices(text: str, size: int = STREAM_CHUNK_BYTES) -> Iterator[str]:
+    """캐시된 문서 문자열을 나누어 생성"""
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+@app.get("/api/session/{session_id}/minutes.md")
+async def stream_minutes(session_id: str, download: bool = False):
+    """회의록 마크다운 스트리밍 (캐시된 뷰 사용: 내용이 바뀐 경우에만 청크 매니페스트 구간으로 다시 렌더링)"""
+    try:
+        loaded = await pools.run_io(_load_views, session_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
+    filename = f"{safe_filename(loaded['meta'].get('title'))}.md" if download else None
+    return _text_response(_iter_slices(loaded["views"]["minutes"]), "text/markdown", filename)
+
+
+@app.get("/api/session/{session_id}/transcript.txt")
+async def stream_transcript(session_id: str, download: bool = False):
+    """타임스탬프별 전사 텍스트 스트리밍 (편집/화자 이름 반영)"""
+    try:
+        meta, result, _ = await pools.run_io(session_manager.load_session, session_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
+    filename = f"{safe_filename(meta.get('title'))}.txt" if download else None
+    return _text_response(iter_transcription(result or {}), "text/plain", filename)
+
+
+@app.get("/api/export")
+async def export_sessions_get(
+    session_ids: str = "",
+    folder_id: Optional[str] = None,
+    formats: str = ",".join(EXPORT_FORMATS),
+    recursive: bool = True
+):
+    """세션 일괄 내보내기 (ZIP 스트리밍, 쉼표로 구분한 session_ids 또는 folder_id)"""
+    return await _export_response(
+        [sid for sid in session_ids.split(",") if sid], folder_id,
+        [fmt.strip() for fmt in formats.split(",")], recursive
+    )
+
+
+@app.post("/api/export")
+async def export_sessions(request: Request):
+    """세션 일괄 내보내기 (ZIP 스트리밍)
+
+    {"session_ids": [...], "folder_id": ..., "formats": ["md", "json", "srt", "vtt"], "recursive": true}
+    """
+    data = await request.json()
+    return await _export_response(
+        data.get("session_ids") or [], data.get("folder_id"),
+        data.get("formats") or list(EXPORT_FORMATS), data.get("recursive", True)
+    )
+
+
 @app.get("/api/sessions")
 async def get_sessions():
     """세션 목록 조회"""
-    sessions = session_manager.list_sessions()
+    sessions = await pools.run_io(session_manager.list_sessions)
     return {
         "sessions": [
             {"id": s.get("id"), "title": s.get("title", "무제"), "date": s.get("created_at", "")}
@@ -156,49 +559,50 @@ async def get_sessions():
 
 
 @app.get("/api/session/{session_id}")
-async def get_session(session_id: str):
-    """세션 상세 조회"""
+async def get_session(session_id: str, text: bool = False):
+    """세션 상세 조회 (녹취록/회의록 문자열은 text=true일 때만 포함: 기본은 minutes.md, transcript.txt 스트리밍 사용)"""
     try:
-        meta, result, audio_path = session_manager.load_session(session_id)
+        return await _session_view(session_id, text)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-        segments = result.get("segments", []) if result else []
-        full_text = "\n".join(
-            f"[{seg.get('speaker', 'SPEAKER')}] {seg.get('text', '')}"
-            for seg in segments
-        )
 
-        # 회의록 생성
-        parts = [p.strip() for p in (meta.get("participants") or "").split(",") if p.strip()]
-        agendas = [a.strip() for a in (meta.get("agenda") or "").split("\n") if a.strip()]
-        minutes = minutes_generator.generate(
-            result or {},
-            title=meta.get("title", "무제"),
-            participants=parts,
-            agenda=agendas
-        )
-        minutes_md = minutes_generator.to_markdown(minutes)
-
-        # 화자 목록
-        speakers = sorted(set(seg.get("speaker") for seg in segments if seg.get("speaker")))
-
-        # 오디오 Base64
-        audio_base64 = ""
-        audio_mime = "audio/mpeg"
-        audio_file = Path(audio_path)
-        if audio_file.exists():
-            audio_base64 = base64.b64encode(audio_file.read_bytes()).decode()
-            audio_mime = mimetypes.guess_type(audio_path)[0] or "audio/mpeg"
-
-        return {
-            "meta": meta,
-            "segments": segments,
-            "transcript": full_text,
-            "minutes": minutes_md,
-            "speakers": speakers,
-            "audio": {"base64": audio_base64, "mime": audio_mime}
-        }
+@run_in_pool("io")
+def _session_view(session_id: str, text: bool = False) -> dict:
+    """세션 상세 응답 생성 (결과 로드, 오디오 인코딩, text=true이면 캐시된 회의록/녹취록 포함)"""
+    loaded = _load_views(session_id, render=text)
+    audio_path, views = loaded["audio_path"], loaded["views"]
+
+    # 오디오 Base64
+    audio_base64 = ""
+    audio_mime = "audio/mpeg"
+    audio_file = Path(audio_path)
+    if audio_file.exists():
+        audio_base64 = base64.b64encode(audio_file.read_bytes()).decode()
+        audio_mime = mimetypes.guess_type(audio_path)[0] or "audio/mpeg"
+
+    view = {
+        "meta": loaded["meta"],
+        "segments": loaded["segments"],
+        "speakers": speaker_names(loaded["speaker_table"]),
+        "speaker_table": loaded["speaker_table"],
+        "summary": loaded["summary"],
+        "audio": {"base64": audio_base64, "mime": audio_mime}
+    }
+    if views:
+        view["transcript"] = views["transcript"]
+        view["minutes"] = views["minutes"]
+    return view
+
+
+@app.post("/api/session/{session_id}/summarize")
+async def summarize_session(session_id: str):
+    """로컬 LLM으로 회의 요약/할 일 생성 (바뀐 구간만 다시 요약)"""
+    try:
+        summary = await pools.run_io(_build_summary, session_id)
+        return {"success": True, **summary}
     except Exception as e:
-        raise HTTPException(status_code=404, detail=str(e))
+        return {"success": False, "detail": str(e)}
 
 
 @app.put("/api/session/{session_id}/segment")
@@ -210,32 +614,46 @@ async def edit_segment(
 ):
     """개별 세그먼트 편집"""
     try:
-        meta, result, _ = session_manager.load_session(session_id)
-        if not result:
-            raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
-        
-        segments = result.get("segments", [])
-        if index < 0 or index >= len(segments):
-            raise HTTPException(status_code=400, detail="잘못된 세그먼트 인덱스")
-        
-        if field == "speaker":
-            segments[index]["speaker"] = value
-        elif field == "text":
-            segments[index]["text"] = value
-        else:
-            raise HTTPException(status_code=400, detail="잘못된 필드")
-        
-        # 세션 결과 저장
-        result["segments"] = segments
-        session_manager.save_result(session_id, result)
-        
+        await pools.run_io(session_manager.append_segment_edits, session_id, [{"index": index, "field": field, "value": value}])
+        refresh_views(session_id)
+        schedule_summary_refresh(session_id)
         return {"success": True}
-    except HTTPException:
-        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         return {"success": False, "detail": str(e)}
 
 
+@app.put("/api/session/{session_id}/segments")
+async def edit_segments(session_id: str, request: Request):
+    """여러 세그먼트 일괄 편집 ({"edits": [{"index", "field", "value"}, ...]})"""
+    try:
+        data = await request.json()
+        count = await pools.run_io(session_manager.append_segment_edits, session_id, data.get("edits", []))
+        if count:
+            refresh_views(session_id)
+            schedule_summary_refresh(session_id)
+        return {"success": True, "count": count}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        return {"success": False, "detail": str(e)}
+
+
+@run_in_pool("model")
+def _transcribe_audio(audio_path: str, lang_code: str, enable_diarization: bool, hf_token: str) -> dict:
+    """WhisperX 전사 (끝나면 메모리 해제를 위해 모델 언로드)"""
+    transcriber = WhisperXTranscriber(hf_token=hf_token if hf_token else None)
+    try:
+        return transcriber.transcribe_with_segments(
+            audio_path,
+            language=lang_code,
+            enable_diarization=enable_diarization
+        )
+    finally:
+        transcriber.unload_model()
+
+
 @app.post("/api/transcribe")
 async def transcribe(
     audio: UploadFile = File(...),
@@ -251,33 +669,30 @@ async def transcribe(
         # 임시 파일 저장
         suffix = Path(audio.filename).suffix
         with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp.write(await audio.read())
+            while block := await audio.read(1024 * 1024):
+                await pools.run_io(tmp.write, block)
             temp_path = tmp.name
 
         # 언어 매핑
         lang_map = {"한국어": "ko", "영어": "en", "일본어": "ja", "중국어": "zh"}
         lang_code = lang_map.get(language, "ko")
 
-        # 전사
-        transcriber = WhisperXTranscriber(hf_token=hf_token if hf_token else None)
-        result = transcriber.transcribe_with_segments(
-            temp_path,
-            language=lang_code,
-            enable_diarization=enable_diarization
-        )
-        # 메모리 해제를 위해 모델 언로드
-        transcriber.unload_model()
+        # 전사 (모델 작업 풀에서 실행)
+        result = await _transcribe_audio(temp_path, lang_code, enable_diarization, hf_token)
 
         # 세션 저장
-        session_id = session_manager.save_session(
+        session_id = await pools.run_io(
+            session_manager.save_session,
             audio_path=temp_path,
             result=result,
             title=title or "무제",
             participants=participants,
-            agenda=agenda
+            agenda=agenda,
+            move_audio=True
         )
+        refresh_views(session_id)
 
-        # 임시 파일 삭제
+        # 임시 파일 삭제 (저장소로 옮겨졌으면 이미 없음)
         Path(temp_path).unlink(missing_ok=True)
 
         return {"success": True, "session_id": session_id}
@@ -300,35 +715,30 @@ async def transcribe_file(request: Request):
 
         # 파일 존재 확인
         audio_path = Path(file_path)
-        if not audio_path.exists():
+        if not await pools.run_io(audio_path.exists):
             # downloads 폴더에서 찾기
             audio_path = DOWNLOADS_DIR / Path(file_path).name
 
-        if not audio_path.exists():
+        if not await pools.run_io(audio_path.exists):
             return {"success": False, "detail": f"파일을 찾을 수 없습니다: {file_path}"}
 
         # 언어 매핑
         lang_map = {"한국어": "ko", "영어": "en", "일본어": "ja", "중국어": "zh"}
         lang_code = lang_map.get(language, "ko")
 
-        # 전사
-        transcriber = WhisperXTranscriber(hf_token=hf_token if hf_token else None)
-        result = transcriber.transcribe_with_segments(
-            str(audio_path),
-            language=lang_code,
-            enable_diarization=enable_diarization
-        )
-        # 메모리 해제를 위해 모델 언로드
-        transcriber.unload_model()
+        # 전사 (모델 작업 풀에서 실행)
+        result = await _transcribe_audio(str(audio_path), lang_code, enable_diarization, hf_token)
 
         # 세션 저장
-        session_id = session_manager.save_session(
+        session_id = await pools.run_io(
+            session_manager.save_session,
             audio_path=str(audio_path),
             result=result,
             title=title,
             participants=participants,
             agenda=agenda
         )
+        refresh_views(session_id)
 
         return {"success": True, "session_id": session_id}
     except Exception as e:
@@ -339,7 +749,8 @@ async def transcribe_file(request: Request):
 async def update_title(session_id: str, title: str = Form(...)):
     """세션 제목 수정"""
     try:
-        session_manager.update_session_title(session_id, title)
+        await pools.run_io(session_manager.update_session_title, session_id, title)
+        refresh_views(session_id)
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -349,7 +760,10 @@ async def update_title(session_id: str, title: str = Form(...)):
 async def update_speaker(session_id: str, old_name: str = Form(...), new_name: str = Form(...)):
     """화자 이름 변경"""
     try:
-        success = session_manager.update_speaker_name(session_id, old_name, new_name)
+        success = await pools.run_io(session_manager.update_speaker_name, session_id, old_name, new_name)
+        if success:
+            refresh_views(session_id)
+            schedule_summary_refresh(session_id)
         return {"success": success}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -361,10 +775,11 @@ async def delete_session(session_id: str):
     try:
         # RAG 인덱스 삭제
         rag = get_rag()
-        rag.delete_index(session_id)
+        await pools.run_io(rag.delete_index, session_id)
 
         # 세션 데이터 삭제
-        session_manager.delete_session(session_id)
+        await pools.run_io(session_manager.delete_session, session_id)
+        session_views.invalidate(session_id)
         
         return {"success": True}
     except Exception as e:
@@ -387,9 +802,12 @@ def _find_ffmpeg() -> str | None:
     return None
 
 
+youtube_downloader = YouTubeDownloader(DOWNLOADS_DIR, ffmpeg_location=_find_ffmpeg())
+
+
 @app.post("/api/youtube")
 async def download_youtube(request: Request):
-    """YouTube 오디오 다운로드"""
+    """YouTube 오디오 다운로드 (이미 받은 영상은 즉시 반환, 아니면 백그라운드 작업 시작)"""
     try:
         data = await request.json()
         url = data.get("url", "")
@@ -397,89 +815,59 @@ async def download_youtube(request: Request):
         if not url:
             raise HTTPException(status_code=400, detail="URL이 필요합니다")
 
-        DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
+        cached = await pools.run_io(youtube_downloader.find_cached, youtube_downloader.extract_video_id(url))
+        if cached:
+            return {"success": True, "cached": True, **youtube_downloader.describe_file(cached)}
 
-        cmd = [
-            "yt-dlp",
-            "-x",
-            "--audio-format", "mp3",
-            "--audio-quality", "192K",
-            "-o", str(DOWNLOADS_DIR / "%(title)s.%(ext)s"),
-            "--print", "after_move:filepath",
-            url
-        ]
+        job = youtube_downloader.start(url, data.get("mode", "fast"))
+        return {"success": True, "job_id": job["id"], "status": job["status"]}
 
-        # ffmpeg 경로 추가
-        ffmpeg_path = _find_ffmpeg()
-        if ffmpeg_path:
-            cmd.extend(["--ffmpeg-location", ffmpeg_path])
+    except HTTPException:
+        raise
+    except Exception as e:
+        return {"success": False, "detail": str(e)}
 
-        result = subprocess.run(cmd, capture_output=True, timeout=300)
 
-        if result.returncode != 0:
-            try:
-                stderr = result.stderr.decode('utf-8')
-            except UnicodeDecodeError:
-                stderr = result.stderr.decode('cp949', errors='replace')
-            return {"success": False, "detail": stderr or "yt-dlp 오류"}
+@app.get("/api/youtube/{job_id}")
+async def get_youtube_job(job_id: str):
+    """YouTube 다운로드 작업 상태 조회"""
+    job = youtube_downloader.snapshot(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return job
 
-        try:
-            stdout = result.stdout.decode('utf-8')
-        except UnicodeDecodeError:
-            stdout = result.stdout.decode('cp949', errors='replace')
-        
-        filename = stdout.strip().split('\n')[-1] if stdout.strip() else ""
 
-        if filename:
-            file_path = Path(filename)
-            # 파일이 존재하거나, downloads 폴더에서 찾기
-            if not file_path.exists():
-                # 파일명만 추출해서 downloads 폴더에서 찾기
-                file_path = DOWNLOADS_DIR / file_path.name
+@app.get("/api/youtube/{job_id}/events")
+async def stream_youtube_job(job_id: str):
+    """YouTube 다운로드 진행 상황 스트리밍 (Server-Sent Events)"""
+    if not youtube_downloader.snapshot(job_id):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
 
-            if file_path.exists():
-                title = file_path.stem
-                return {
-                    "success": True,
-                    "filename": file_path.name,
-                    "path": str(file_path),
-                    "title": title
-                }
+    async def event_stream():
+        async for job in youtube_downloader.events(job_id):
+            yield f"data: {json.dumps(job, ensure_ascii=False)}\n\n"
 
-        return {"success": False, "detail": f"파일을 찾을 수 없습니다: {filename}"}
-
-    except subprocess.TimeoutExpired:
-        return {"success": False, "detail": "다운로드 시간 초과 (5분)"}
-    except Exception as e:
-        return {"success": False, "detail": str(e)}
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 
 @app.post("/api/index/{session_id}")
 async def index_session(session_id: str):
     """세션 전사 내용을 RAG 인덱스에 저장"""
     try:
-        meta, result, _ = session_manager.load_session(session_id)
+        meta, result, _ = await pools.run_io(session_manager.load_session, session_id)
 
         if not result or "segments" not in result:
             return {"success": False, "detail": "전사 결과가 없습니다"}
 
-        # 시간 정보 포함한 텍스트 생성
-        def format_time(seconds):
-            mins = int(seconds // 60)
-            secs = int(seconds % 60)
-            return f"{mins:02d}:{secs:02d}"
-        
-        full_text = "\n".join(
-            f"[{format_time(seg.get('start', 0))} - {format_time(seg.get('end', 0))}] [{seg.get('speaker', 'SPEAKER')}] {seg.get('text', '')}"
-            for seg in result["segments"]
-        )
-
         rag = get_rag()
-        # 기존 인덱스 삭제 후 재생성 (업데이트 반영)
-        rag.delete_index(session_id)
-        success = rag.index_transcript(session_id, full_text)
+        # 세그먼트 단위 청크(시간/화자는 메타데이터)로 기존 인덱스와 비교하여 바뀐 청크만 반영
+        diff = await pools.run_io(
+            rag.sync_segments, session_id, result["segments"],
+            {"source_type": "session", "folder_id": meta.get("folder_id")}
+        )
+        success = diff["added"] + diff["kept"] > 0
 
-        return {"success": success, "indexed": success}
+        return {"success": success, "indexed": success, **diff}
     except Exception as e:
         return {"success": False, "detail": str(e)}
 
@@ -491,8 +879,6 @@ async def chat(request: Request):
         data = await request.json()
         session_id = data.get("session_id")
         session_ids = data.get("session_ids", [])
-        session_id = data.get("session_id")
-        session_ids = data.get("session_ids", [])
         question = data.get("question", "")
         chat_id = data.get("chat_id")  # [NEW] chat_id supported
 
@@ -503,39 +889,9 @@ async def chat(request: Request):
         if not question:
             return {"success": False, "detail": "question이 필요합니다"}
 
-        rag = get_rag()
-
-        # 인덱스 확인 및 자동 생성 (모든 선택된 세션에 대해)
-        # 인덱스 확인 및 자동 생성 (모든 선택된 세션/문서에 대해)
-        for sid in session_ids:
-            # 먼저 문서인지 확인
-            doc = document_manager.get_document(sid)
-            if doc:
-                if not rag.is_indexed(sid):
-                    # 문서라면 저장된 텍스트가 필요함.
-                    # DocumentManager의 _extract_text는 이미 저장시에 수행됨.
-                    # 여기서는 다시 읽어서 인덱싱하거나, 저장 시 인덱싱했어야 함.
-                    # 하지만 편의상 여기서 재추출(또는 저장된 텍스트 필요). 
-                    # DocumentManager 구조상 add_document가 텍스트를 반환하므로,
-                    # 여기서는 간단히 파일에서 다시 읽거나, add_document 시점에 인덱싱하는 게 좋음.
-                    # 여기서는 파일에서 다시 읽도록 처리 (간소화)
-                    path = Path(doc['path'])
-                    # 간단히 다시 추출 시도 (성능상 비효율적일 수 있으나 안전함)
-                    text = document_manager._extract_text(path) 
-                    rag.index_transcript(sid, text)
-                continue
-
-            # 세션 확인
-            if not rag.is_indexed(sid):
-                meta, result, _ = session_manager.load_session(sid)
-                if result and "segments" in result:
-                    full_text = "\n".join(
-                        f"[{seg.get('start', 0):.1f}s ~ {seg.get('end', 0):.1f}s] [{seg.get('speaker', 'SPEAKER')}] {seg.get('text', '')}"
-                        for seg in result["segments"]
-                    )
-                    rag.index_transcript(sid, full_text)
-
-        answer = rag.query(question, session_ids)
+        # 인덱스 확인/생성과 LLM 질의는 I/O 작업 풀에서 실행 (Ollama HTTP 호출)
+        reply = await _answer_question(question, session_ids)
+        answer, citations = reply["answer"], reply["sources"]
 
         # [NEW] Save history (Support Global Chat)
         # If session_ids is empty, treat as "global" session
@@ -547,79 +903,109 @@ async def chat(request: Request):
         # But let's assume frontend sends chat_id if utilizing multi-chat.
         
         if chat_id:
-            # global 세션 폴더 자동 생성 (load/save 내부에서 처리됨)
-            history = session_manager.load_chat_history(main_sid, chat_id)
-            history.append({
-                "role": "user", 
-                "content": question, 
-                "timestamp": datetime.now().isoformat()
-            })
-            history.append({
-                "role": "assistant", 
-                "content": answer, 
-                "timestamp": datetime.now().isoformat()
-            })
-            session_manager.save_chat_history(main_sid, chat_id, history)
-
-        return {"success": True, "answer": answer}
+            # global 세션 폴더 자동 생성 (내부에서 처리됨)
+            await pools.run_io(session_manager.append_chat_messages, main_sid, chat_id, [
+                {"role": "user", "content": question, "timestamp": datetime.now().isoformat()},
+                {"role": "assistant", "content": answer, "citations": citations, "timestamp": datetime.now().isoformat()}
+            ])
+
+        return {"success": True, "answer": answer, "citations": citations}
 
     except Exception as e:
         return {"success": False, "detail": str(e)}
 
 
+@run_in_pool("io")
+def _answer_question(question: str, session_ids: list) -> dict:
+    """선택된 세션/문서의 인덱스를 확인(없으면 생성)한 뒤 RAG 질의 ({"answer", "sources"})"""
+    rag = get_rag()
+
+    # 인덱스 확인(한 번의 조회) 및 없는 세션/문서만 생성
+    indexed = rag.indexed_sources(session_ids)
+    for sid in session_ids:
+        if sid in indexed:
+            continue
+
+        # 먼저 문서인지 확인
+        doc = document_manager.get_document(sid)
+        if doc:
+            # 업로드 시 저장된 추출 텍스트 사이드카에서 스트리밍 (재파싱 없음)
+            rag.index_stream(sid, document_manager.iter_text(sid),
+                             metadata={"source_type": "document", "folder_id": doc.get("folder_id")})
+            continue
+
+        # 세션 확인
+        meta, result, _ = session_manager.load_session(sid)
+        if result and "segments" in result:
+            rag.sync_segments(sid, result["segments"], {"source_type": "session", "folder_id": meta.get("folder_id")})
+
+    return rag.query_with_sources(question, session_ids)
+
+
 @app.get("/api/session/{session_id}/chats")
 async def list_chats(session_id: str):
     """채팅 목록 조회"""
-    chats = session_manager.list_chat_histories(session_id)
+    chats = await pools.run_io(session_manager.list_chat_histories, session_id)
     return {"chats": chats}
 
 
 @app.post("/api/session/{session_id}/chats")
 async def create_chat(session_id: str):
     """새 채팅 생성"""
-    chat_id = session_manager.create_new_chat(session_id)
+    chat_id = await pools.run_io(session_manager.create_new_chat, session_id)
     return {"chat_id": chat_id}
 
 
 @app.get("/api/session/{session_id}/chat/{chat_id}")
-async def get_chat_history(session_id: str, chat_id: str):
-    """특정 채팅 기록 조회"""
-    history = session_manager.load_chat_history(session_id, chat_id)
-    return {"history": history}
+async def get_chat_history(session_id: str, chat_id: str, limit: int = None, before: int = None):
+    """특정 채팅 기록 조회 (limit/before로 최근 메시지부터 페이지 단위 조회)"""
+    history = await pools.run_io(session_manager.load_chat_history, session_id, chat_id, limit=limit, before=before)
+    info = await pools.run_io(session_manager.get_chat_info, session_id, chat_id) or {}
+    total = info.get("message_count", len(history))
+    end = min(before, total) if before is not None else total
+    return {"history": history, "total": total, "start": max(0, end - len(history))}
 
 
 @app.delete("/api/session/{session_id}/chat/{chat_id}")
 async def delete_chat_history(session_id: str, chat_id: str):
     """특정 채팅 기록 삭제"""
-    success = session_manager.delete_chat_history(session_id, chat_id)
+    success = await pools.run_io(session_manager.delete_chat_history, session_id, chat_id)
     return {"success": success}
 
 
 @app.get("/api/documents")
 async def get_documents():
     """문서 목록 조회"""
-    docs = document_manager.list_documents()
+    docs = await pools.run_io(document_manager.list_documents)
     return {"documents": docs}
 
 
 @app.post("/api/documents")
-async def upload_document(file: UploadFile = File(...)):
+async def upload_document(file: UploadFile = File(...), upload_id: str = Form(None)):
     """문서 업로드 및 인덱싱"""
+    def on_progress(done: int, total: int):
+        if upload_id:
+            upload_progress[upload_id] = {"done": done, "total": total, "status": "extracting"}
+
     try:
         # 임시 파일 저장 -> DocumentManager로 이동
         with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp:
-            content = await file.read()
-            tmp.write(content)
+            while block := await file.read(1024 * 1024):
+                await pools.run_io(tmp.write, block)
             tmp_path = Path(tmp.name)
 
-        # 문서 등록
-        result = document_manager.add_document(tmp_path, file.filename)
+        # 문서 등록 (대용량 PDF 추출 중에도 진행 상황 조회가 가능하도록 스레드에서 실행)
+        result = await pools.run_io(document_manager.add_document, tmp_path, file.filename, on_progress)
         doc_info = result['info']
-        text_content = result['text']
 
-        # 즉시 RAG 인덱싱
+        # 즉시 RAG 인덱싱 (사이드카에서 스트리밍)
+        if upload_id:
+            upload_progress[upload_id] = {**upload_progress.get(upload_id, {}), "status": "indexing"}
         rag = get_rag()
-        rag.index_transcript(doc_info['id'], text_content)
+        await pools.run_io(
+            rag.index_stream, doc_info['id'], document_manager.iter_text(doc_info['id']),
+            metadata={"source_type": "document", "folder_id": doc_info.get("folder_id")}
+        )
 
         # 임시 파일 삭제
         tmp_path.unlink()
@@ -627,16 +1013,28 @@ async def upload_document(file: UploadFile = File(...)):
         return {"success": True, "document": doc_info}
     except Exception as e:
         return {"success": False, "detail": str(e)}
+    finally:
+        if upload_id:
+            upload_progress.pop(upload_id, None)
+
+
+@app.get("/api/documents/progress/{upload_id}")
+async def get_upload_progress(upload_id: str):
+    """문서 업로드 처리 진행 상황 조회"""
+    progress = upload_progress.get(upload_id)
+    if not progress:
+        return {"found": False}
+    return {"found": True, **progress}
 
 
 @app.delete("/api/documents/{doc_id}")
 async def delete_document(doc_id: str):
     """문서 삭제"""
     try:
-        success = document_manager.delete_document(doc_id)
+        success = await pools.run_io(document_manager.delete_document, doc_id)
         if success:
             rag = get_rag()
-            rag.delete_index(doc_id)
+            await pools.run_io(rag.delete_index, doc_id)
             return {"success": True}
         else:
             return {"success": False, "detail": "문서를 찾을 수 없습니다"}
@@ -661,7 +1059,7 @@ async def get_document_content(doc_id: str):
         if suffix == '.pdf':
             # PDF는 base64로 인코딩하여 반환 (브라우저 미리보기용)
             import base64
-            pdf_data = base64.b64encode(file_path.read_bytes()).decode('utf-8')
+            pdf_data = base64.b64encode(await pools.run_io(file_path.read_bytes)).decode('utf-8')
             return {
                 "success": True,
                 "content": pdf_data,
@@ -671,7 +1069,7 @@ async def get_document_content(doc_id: str):
         
         if suffix in text_extensions or suffix == '':
             try:
-                content = file_path.read_text(encoding='utf-8', errors='replace')
+                content = await pools.run_io(file_path.read_text, encoding='utf-8', errors='replace')
                 return {
                     "success": True,
                     "content": content,
@@ -690,7 +1088,7 @@ async def get_document_content(doc_id: str):
 async def check_index_status(session_id: str):
     """세션 인덱스 상태 확인"""
     rag = get_rag()
-    return {"indexed": rag.is_indexed(session_id)}
+    return {"indexed": await pools.run_io(rag.is_indexed, session_id)}
 
 
 def main():
@@ -0,0 +1,45 @@
+"""
+오디오 PCM 캐시 모듈
+전사용 16kHz 모노 PCM(s16le)을 오디오 파일 옆에 캐시
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+# WhisperX 입력 형식 (whisperx.audio.SAMPLE_RATE와 동일)
+SAMPLE_RATE = 16000
+CACHE_SUFFIX = ".pcm16k"
+
+
+def cache_path_for(audio_path: Path) -> Path:
+    """오디오 파일의 PCM 캐시 경로"""
+    audio_path = Path(audio_path)
+    return audio_path.with_name(audio_path.name + CACHE_SUFFIX)
+
+
+def build_decode_command(audio_path: Path, output_path: Path, ffmpeg_location: Optional[str] = None) -> List[str]:
+    """오디오를 16kHz 모노 s16le로 디코딩하는 ffmpeg 명령"""
+    ffmpeg = str(Path(ffmpeg_location) / "ffmpeg") if ffmpeg_location else "ffmpeg"
+    return [
+        ffmpeg, "-nostdin", "-y",
+        "-threads", "0",
+        "-i", str(audio_path),
+        "-f", "s16le",
+        "-ac", "1",
+        "-acodec", "pcm_s16le",
+        "-ar", str(SAMPLE_RATE),
+        str(output_path)
+    ]
+
+
+def load_cached(audio_path: Path) -> Optional[np.ndarray]:
+    """유효한 PCM 캐시가 있으면 float32 파형으로 로드 (whisperx.load_audio와 동일 형식)"""
+    audio_path = Path(audio_path)
+    cache_path = cache_path_for(audio_path)
+    if not cache_path.exists():
+        return None
+    if audio_path.exists() and cache_path.stat().st_mtime < audio_path.stat().st_mtime:
+        return None  # 원본이 더 최신이면 캐시 무효
+    return np.fromfile(cache_path, dtype=np.int16).astype(np.float32) / 32768.0
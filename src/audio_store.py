@@ -0,0 +1,194 @@
+"""
+오디오 저장소 모듈
+오디오 파일을 내용 해시(sha256) 기준으로 한 번만 저장하고 세션별 참조로 수명을 관리
+"""
+
+import hashlib
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from .audio_cache import CACHE_SUFFIX
+from .metadata_store import JsonStore
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_file(path: Path) -> str:
+    """파일 내용의 sha256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AudioStore:
+    """내용 주소 기반 오디오 저장소
+
+    - blob: <base_dir>/<해시 앞 2자리>/<해시><확장자>
+    - refs.json: {해시: {"suffix", "size", "refs": [참조 ID...]}}
+    참조가 모두 해제된 blob은 삭제한다. 원본과 같은 파일시스템이면 복사 대신 하드링크를 만든다.
+    """
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.refs = JsonStore(self.base_dir / "refs.json")
+
+    def _blob_path(self, file_hash: str, suffix: str) -> Path:
+        return self.base_dir / file_hash[:2] / f"{file_hash}{suffix}"
+
+    def path_for(self, file_hash: str) -> Optional[Path]:
+        """해시에 해당하는 blob 경로 (없으면 None)"""
+        entry = self.refs.read().get(file_hash)
+        if not entry:
+            return None
+        path = self._blob_path(file_hash, entry["suffix"])
+        return path if path.exists() else None
+
+    def add(self, src_path: Path, ref_id: str, move: bool = False) -> Tuple[str, Path]:
+        """오디오 등록 후 참조 추가 ((해시, blob 경로) 반환)
+
+        move=True이면 원본을 저장소로 옮긴다 (임시 업로드 파일 등).
+        이미 같은 내용이 있으면 새로 저장하지 않는다.
+        """
+        src_path = Path(src_path)
+        file_hash = hash_file(src_path)
+        with self.refs.transaction() as refs:
+            entry = refs.get(file_hash)
+            suffix = entry["suffix"] if entry else src_path.suffix.lower()
+            blob_path = self._blob_path(file_hash, suffix)
+            if not blob_path.exists():
+                self._materialize(src_path, blob_path, move)
+            elif move:
+                src_path.unlink(missing_ok=True)
+
+            entry = refs.setdefault(file_hash, {"suffix": suffix, "size": blob_path.stat().st_size, "refs": []})
+            if ref_id not in entry["refs"]:
+                entry["refs"].append(ref_id)
+        return file_hash, blob_path
+
+    @staticmethod
+    def _materialize(src_path: Path, blob_path: Path, move: bool) -> None:
+        """원본을 blob 위치에 배치 (이동 / 하드링크 / 복사 순으로 시도)"""
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = blob_path.with_name(f"{blob_path.name}.{os.getpid()}.tmp")
+        tmp_path.unlink(missing_ok=True)
+        if move:
+            shutil.move(str(src_path), str(tmp_path))
+        else:
+            try:
+                os.link(src_path, tmp_path)
+            except OSError:
+                shutil.copy2(src_path, tmp_path)
+        os.replace(tmp_path, blob_path)
+
+    def release(self, file_hash: str, ref_id: str) -> bool:
+        """참조 해제 (마지막 참조였으면 blob 삭제 후 True)"""
+        with self.refs.transaction() as refs:
+            entry = refs.get(file_hash)
+            if not entry:
+                return False
+            if ref_id in entry["refs"]:
+                entry["refs"].remove(ref_id)
+            if entry["refs"]:
+                return False
+            del refs[file_hash]
+            self._remove_blob(self._blob_path(file_hash, entry["suffix"]))
+        return True
+
+    @staticmethod
+    def _remove_blob(blob_path: Path) -> None:
+        blob_path.unlink(missing_ok=True)
+        blob_path.with_name(blob_path.name + CACHE_SUFFIX).unlink(missing_ok=True)
+
+    # ----- 정리 (GC) -----
+
+    def sync_refs(self, live_refs: Dict[str, List[str]]) -> None:
+        """실제 세션 메타데이터 기준으로 참조 목록을 교체 (중단된 작업으로 어긋난 참조 복구)"""
+        with self.refs.transaction() as refs:
+            for file_hash, entry in refs.items():
+                entry["refs"] = sorted(set(live_refs.get(file_hash, [])))
+
+    def collect_garbage(self) -> Dict[str, int]:
+        """참조 없는 blob과 남은 임시 파일 삭제 ({"blobs", "bytes"} 반환)"""
+        removed = {"blobs": 0, "bytes": 0}
+        with self.refs.transaction() as refs:
+            for file_hash in [h for h, entry in refs.items() if not entry["refs"]]:
+                entry = refs.pop(file_hash)
+                blob_path = self._blob_path(file_hash, entry["suffix"])
+                if blob_path.exists():
+                    removed["bytes"] += blob_path.stat().st_size
+                    removed["blobs"] += 1
+                self._remove_blob(blob_path)
+
+            known = {self._blob_path(h, entry["suffix"]).name for h, entry in refs.items()}
+            for path in self.base_dir.glob("??/*"):
+                name = path.name[:-len(CACHE_SUFFIX)] if path.name.endswith(CACHE_SUFFIX) else path.name
+                if name not in known:
+                    removed["bytes"] += path.stat().st_size
+                    path.unlink(missing_ok=True)
+        return removed
+
+    def _blob_inodes(self) -> Set[Tuple[int, int]]:
+        inodes = set()
+        for file_hash, entry in self.refs.read().items():
+            try:
+                stat = self._blob_path(file_hash, entry["suffix"]).stat()
+                inodes.add((stat.st_dev, stat.st_ino))
+            except FileNotFoundError:
+                continue
+        return inodes
+
+    def collect_downloads(self, downloads_dir: Path, max_age_days: float = 7) -> Dict[str, int]:
+        """세션에서 참조하지 않는 오래된 다운로드 파일 삭제 ({"files", "bytes"} 반환)
+
+        저장소 blob과 하드링크된 파일이나 내용이 같은 파일은 세션이 쓰고 있으므로 남긴다.
+        원본이 없어진 PCM 캐시와 남은 임시 파일도 함께 삭제한다.
+        """
+        downloads_dir = Path(downloads_dir)
+        removed = {"files": 0, "bytes": 0}
+        if not downloads_dir.exists():
+            return removed
+
+        cutoff = time.time() - max_age_days * 86400
+        inodes = self._blob_inodes()
+        refs = self.refs.read()
+
+        def remove(path: Path) -> None:
+            removed["bytes"] += path.stat().st_size
+            removed["files"] += 1
+            path.unlink(missing_ok=True)
+
+        for path in sorted(downloads_dir.iterdir()):
+            if not path.is_file() or path.name.endswith(CACHE_SUFFIX):
+                continue
+            stat = path.stat()
+            if stat.st_mtime > cutoff:
+                continue
+            if path.suffix in (".tmp", ".part", ".ytdl"):
+                remove(path)
+                continue
+            if (stat.st_dev, stat.st_ino) in inodes:
+                continue
+            if hash_file(path) in refs:
+                continue
+            remove(path)
+
+        for cache_path in downloads_dir.glob(f"*{CACHE_SUFFIX}*"):
+            source = cache_path.with_name(cache_path.name.split(CACHE_SUFFIX)[0])
+            if not source.exists():
+                remove(cache_path)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """blob 수, 총 크기, 참조 수"""
+        refs = self.refs.read()
+        return {
+            "blobs": len(refs),
+            "bytes": sum(entry.get("size", 0) for entry in refs.values()),
+            "refs": sum(len(entry["refs"]) for entry in refs.values())
+        }
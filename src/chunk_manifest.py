@@ -0,0 +1,231 @@
+"""
+녹취록 청크 매니페스트 모듈
+세션 녹취록을 세그먼트 번호 범위로 나눈 청크 목록과 청크별 파생 결과(렌더링된 녹취록 구간, 화자 통계, 요약)를 보관
+
+- 청크 경계는 세그먼트 번호로 고정되므로 한 세그먼트를 편집해도 다른 청크의 경계는 바뀌지 않는다
+- 청크마다 내용 해시를 두고, 해시가 바뀐 청크의 파생 결과만 다시 만든다
+- 저장 위치: 세션 디렉토리의 chunks.json
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .config import SUMMARY_CHUNK_CHARS
+
+CHUNK_MANIFEST_FILENAME = "chunks.json"
+
+# 청크 형식이 바뀌면 올려서 경계부터 다시 계산
+MANIFEST_VERSION = 1
+
+# 청크가 한도의 이 비율을 넘었으면 화자가 바뀌는 곳에서 먼저 끊음
+SPEAKER_BREAK_RATIO = 0.75
+
+# 편집으로 청크가 한도의 이 배수보다 길어지면 그 청크만 다시 나눔
+RESPLIT_RATIO = 2
+
+_SEGMENT_FIELDS = ("start", "end", "speaker", "speaker_id", "text")
+
+_locks: Dict[str, threading.RLock] = {}
+_locks_guard = threading.Lock()
+
+
+def _format_time(seconds: Optional[float]) -> str:
+    seconds = int(seconds or 0)
+    hours, rest = divmod(seconds, 3600)
+    mins, secs = divmod(rest, 60)
+    return f"{hours:02d}:{mins:02d}:{secs:02d}" if hours else f"{mins:02d}:{secs:02d}"
+
+
+def segment_line(seg: Dict[str, Any]) -> str:
+    """LLM 입력용 한 줄 ("[MM:SS] 화자: 내용", 내용이 없으면 빈 문자열)"""
+    text = " ".join(str(seg.get("text", "")).split())
+    if not text:
+        return ""
+    return f"[{_format_time(seg.get('start'))}] {seg.get('speaker') or 'SPEAKER'}: {text}"
+
+
+def transcript_line(seg: Dict[str, Any]) -> str:
+    """녹취록 화면용 한 줄 ("[화자] 내용")"""
+    return f"[{seg.get('speaker', 'SPEAKER')}] {seg.get('text', '')}"
+
+
+def chunk_segments(segments: List[Dict[str, Any]], max_chars: int = SUMMARY_CHUNK_CHARS,
+                   offset: int = 0) -> List[Dict[str, Any]]:
+    """세그먼트를 요약 단위 청크로 묶기
+
+    세그먼트 중간에서는 자르지 않으며, 청크가 어느 정도 찼으면 화자가 바뀌는 곳에서 끊는다.
+    내용이 없는 세그먼트는 앞 청크에 붙인다.
+    반환: [{"first", "last", "start", "end", "speakers", "text"}] (first/last는 offset을 더한 세그먼트 번호)
+    """
+    chunks: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    size = 0
+    last_speaker = None
+
+    for i, seg in enumerate(segments, offset):
+        line = segment_line(seg)
+        speaker = seg.get("speaker") or "SPEAKER"
+        if line and current and current["lines"]:
+            speaker_changed = last_speaker is not None and speaker != last_speaker
+            if size + len(line) + 1 > max_chars or (speaker_changed and size >= max_chars * SPEAKER_BREAK_RATIO):
+                current = None
+        if current is None:
+            current = {"first": i, "last": i, "start": seg.get("start"), "end": seg.get("end"),
+                       "speakers": [], "lines": []}
+            chunks.append(current)
+            size = 0
+
+        current["last"] = i
+        current["end"] = seg.get("end")
+        if line:
+            current["lines"].append(line)
+            size += len(line) + 1
+            if speaker not in current["speakers"]:
+                current["speakers"].append(speaker)
+            last_speaker = speaker
+
+    for chunk in chunks:
+        chunk["text"] = "\n".join(chunk.pop("lines"))
+    return chunks
+
+
+def chunk_hash(segments: List[Dict[str, Any]]) -> str:
+    raw = json.dumps([[seg.get(field) for field in _SEGMENT_FIELDS] for seg in segments],
+                     ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _speaker_stats(segments: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """화자 ID별 발화 시간/세그먼트 수"""
+    stats: Dict[str, Dict[str, Any]] = {}
+    for seg in segments:
+        speaker_id = seg.get("speaker_id") or seg.get("speaker")
+        if not speaker_id:
+            continue
+        entry = stats.setdefault(speaker_id, {"talk_time": 0.0, "segment_count": 0})
+        entry["talk_time"] += max(0.0, (seg.get("end") or 0) - (seg.get("start") or 0))
+        entry["segment_count"] += 1
+    return stats
+
+
+class ChunkManifest:
+    """세션 하나의 청크 매니페스트
+
+    segments는 load_session이 돌려준 세그먼트(편집 반영, 화자는 표시 이름)를 사용한다.
+    session_dir가 None이면 파일에 저장하지 않는다 (일회성 요약).
+    """
+
+    def __init__(self, session_dir: Optional[Path], max_chars: int = SUMMARY_CHUNK_CHARS):
+        self.session_dir = Path(session_dir) if session_dir else None
+        self.path = self.session_dir / CHUNK_MANIFEST_FILENAME if self.session_dir else None
+        self.max_chars = max_chars
+        self.segment_count = 0
+        self.chunks: List[Dict[str, Any]] = []
+        if self.path is None:
+            self.lock = threading.RLock()
+        else:
+            with _locks_guard:
+                self.lock = _locks.setdefault(str(self.path), threading.RLock())
+
+    def load(self) -> "ChunkManifest":
+        if self.path is None:
+            return self
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return self
+        if data.get("version") == MANIFEST_VERSION and data.get("max_chars") == self.max_chars:
+            self.segment_count = data.get("segment_count", 0)
+            self.chunks = data.get("chunks", [])
+        return self
+
+    def save(self) -> None:
+        if self.path is None or not self.session_dir.exists():
+            return
+        data = {
+            "version": MANIFEST_VERSION,
+            "max_chars": self.max_chars,
+            "segment_count": self.segment_count,
+            "chunks": self.chunks
+        }
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def refresh(self, segments: List[Dict[str, Any]]) -> List[int]:
+        """세그먼트와 비교하여 바뀐 청크만 다시 만들기 (다시 만든 청크 번호 반환)
+
+        세그먼트 수가 바뀌었으면(전사 결과를 새로 저장한 경우) 경계부터 다시 계산한다.
+        """
+        if len(segments) != self.segment_count or not self.chunks:
+            self.segment_count = len(segments)
+            self.chunks = [self._build(segments, chunk) for chunk in chunk_segments(segments, self.max_chars)]
+            return list(range(len(self.chunks)))
+
+        chunks: List[Dict[str, Any]] = []
+        changed: List[int] = []
+        for chunk in self.chunks:
+            part = segments[chunk["first"]:chunk["last"] + 1]
+            if chunk_hash(part) == chunk["hash"]:
+                chunks.append(chunk)
+                continue
+            text_size = sum(len(segment_line(seg)) + 1 for seg in part)
+            if text_size > self.max_chars * RESPLIT_RATIO:
+                rebuilt = chunk_segments(part, self.max_chars, offset=chunk["first"])
+            else:
+                rebuilt = [{"first": chunk["first"], "last": chunk["last"]}]
+            for new_chunk in rebuilt:
+                changed.append(len(chunks))
+                chunks.append(self._build(segments, new_chunk))
+        self.chunks = chunks
+        return changed
+
+    @staticmethod
+    def _build(segments: List[Dict[str, Any]], chunk: Dict[str, Any]) -> Dict[str, Any]:
+        """청크 파생 결과 생성 (요약은 요약 단계에서 채움)"""
+        part = segments[chunk["first"]:chunk["last"] + 1]
+        speakers = []
+        for seg in part:
+            speaker = seg.get("speaker") or "SPEAKER"
+            if segment_line(seg) and speaker not in speakers:
+                speakers.append(speaker)
+        return {
+            "first": chunk["first"],
+            "last": chunk["last"],
+            "start": part[0].get("start") if part else None,
+            "end": part[-1].get("end") if part else None,
+            "speakers": speakers,
+            "hash": chunk_hash(part),
+            "transcript": "\n".join(transcript_line(seg) for seg in part),
+            "speaker_stats": _speaker_stats(part)
+        }
+
+    def text(self, chunk: Dict[str, Any], segments: List[Dict[str, Any]]) -> str:
+        """청크의 LLM 입력 텍스트"""
+        return "\n".join(line for line in map(segment_line, segments[chunk["first"]:chunk["last"] + 1]) if line)
+
+    def sections(self) -> List[str]:
+        """청크별 렌더링된 녹취록 구간 (녹취록 화면과 회의록의 녹취록 절에 그대로 사용)"""
+        return [chunk["transcript"] for chunk in self.chunks]
+
+    def transcript(self) -> str:
+        """녹취록 화면 문자열 (청크 구간을 이어 붙임)"""
+        return "\n".join(self.sections())
+
+    def speaker_stats(self) -> Dict[str, Dict[str, Any]]:
+        """화자 ID별 발화 통계 합계"""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for chunk in self.chunks:
+            for speaker_id, stats in chunk["speaker_stats"].items():
+                entry = totals.setdefault(speaker_id, {"talk_time": 0.0, "segment_count": 0})
+                entry["talk_time"] += stats["talk_time"]
+                entry["segment_count"] += stats["segment_count"]
+        for entry in totals.values():
+            entry["talk_time"] = round(entry["talk_time"], 3)
+        return totals
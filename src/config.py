@@ -13,6 +13,31 @@ SESSIONS_DIR = DATA_DIR / "sessions"
 CHROMA_DIR = DATA_DIR / "chroma_db"
 OUTPUTS_DIR = DATA_DIR / "outputs"
 DOWNLOADS_DIR = DATA_DIR / "downloads"
+AUDIO_STORE_DIR = DATA_DIR / "audio"
+SEARCH_INDEX_PATH = DATA_DIR / "search_index.db"
+STRUCTURE_INDEX_PATH = DATA_DIR / "structure.db"
+
+# 전사 결과 저장 형식 ("json.gz": 표준 라이브러리만 사용 / "json": 기존 형식 /
+# "msgpack.zst": msgpack, zstandard 설치 필요 - 나중에 패키지가 없으면 해당 세션을 읽을 수 없음)
+RESULT_FORMAT = "json.gz"
+
+# 로컬 LLM (Ollama) 회의 요약 설정
+OLLAMA_BASE_URL = "http://localhost:11434"
+SUMMARY_MODEL = "exaone"
+SUMMARY_CONCURRENCY = 3       # 동시에 요약하는 청크 수
+SUMMARY_CHUNK_CHARS = 4000    # 청크 하나의 최대 문자 수
+SUMMARY_CACHE_DIR = DATA_DIR / "summary_cache"
+SUMMARY_REFRESH_DELAY = 10.0  # 편집이 이 시간(초) 동안 멈추면 요약을 갱신
+
+# RAG 임베딩 캐시 ((임베딩 모델, 청크 텍스트 해시) -> 벡터)
+EMBEDDING_CACHE_PATH = DATA_DIR / "embedding_cache.db"
+
+# RAG 임베딩 요청 (Ollama /api/embed)
+EMBED_REQUEST_BATCH = 16      # 요청 하나에 담는 청크 수
+EMBED_CONCURRENCY = 4         # 동시에 진행하는 임베딩 요청 수
+EMBED_MAX_RETRIES = 3         # 일시적 오류(연결 실패, 5xx, 429) 재시도 횟수
+EMBED_RETRY_BACKOFF = 0.5     # 첫 재시도 대기(초), 이후 2배씩 증가
+EMBED_TIMEOUT = 120           # 요청 하나의 제한 시간(초)
 
 # 모델 디렉토리
 MODELS_DIR = ROOT_DIR / "models"
@@ -1,54 +1,104 @@
+import gzip
+import hashlib
 import json
+import os
+import threading
 import uuid
 import shutil
+from concurrent.futures import as_completed
+from itertools import accumulate
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Callable, Iterable, Iterator
 import pypdf
 
+from .executor import pools
+from .metadata_store import JsonStore
+from .search_index import SearchIndex
+from .structure_index import StructureIndex
+
+# 이 페이지 수 미만의 PDF는 프로세스 풀 없이 순차 추출
+PDF_PARALLEL_MIN_PAGES = 32
+# 워커 하나가 한 번에 처리하는 페이지 수
+PDF_PAGES_PER_TASK = 16
+# 텍스트 스트리밍 블록 크기 (문자 수)
+TEXT_BLOCK_SIZE = 64 * 1024
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def _extract_pdf_pages(file_path: str, start: int, end: int) -> List[str]:
+    """PDF의 [start, end) 페이지 텍스트 추출 (워커 프로세스에서 실행)"""
+    with open(file_path, 'rb') as f:
+        reader = pypdf.PdfReader(f)
+        return [(reader.pages[i].extract_text() or "") + "\n" for i in range(start, end)]
+
+
 class DocumentManager:
     """업로드된 문서(PDF, TXT, 코드 등)를 관리하고 텍스트를 추출하는 클래스"""
 
-    def __init__(self, base_dir: Path):
+    def __init__(
+        self,
+        base_dir: Path,
+        search_index: Optional[SearchIndex] = None,
+        structure_index: Optional[StructureIndex] = None
+    ):
         self.base_dir = base_dir / "documents"
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.search_index = search_index
+        self.structure_index = structure_index
         self.metadata_file = self.base_dir / "documents.json"
-        self._load_metadata()
+        self.store = JsonStore(self.metadata_file)
+
+    def _publish(self, documents: Iterable[Dict], deleted_ids: Iterable[str] = ()) -> None:
+        """구조 색인에 변경 반영"""
+        if self.structure_index:
+            self.structure_index.upsert_many("document", documents)
+            self.structure_index.remove_many("document", deleted_ids)
+
+    @property
+    def documents(self) -> Dict[str, Dict]:
+        return self.store.read()
 
     def update_folder(self, doc_id: str, folder_id: Optional[str]) -> bool:
-        if doc_id not in self.documents:
-            return False
-        
-        self.documents[doc_id]["folder_id"] = folder_id if folder_id != "root" else None
-        self._save_metadata()
-        return True
+        return bool(self.update_folders([doc_id], folder_id))
 
-    def _load_metadata(self):
-        if self.metadata_file.exists():
-            try:
-                with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                    self.documents = json.load(f)
-            except Exception:
-                self.documents = {}
-        else:
-            self.documents = {}
+    def update_folders(self, doc_ids: Iterable[str], folder_id: Optional[str]) -> List[str]:
+        """여러 문서를 한 번의 기록으로 폴더 이동 (이동된 문서 ID 목록 반환)"""
+        moved = []
+        with self.store.transaction() as documents:
+            for doc_id in doc_ids:
+                if doc_id in documents:
+                    documents[doc_id]["folder_id"] = folder_id if folder_id != "root" else None
+                    moved.append(doc_id)
+            changed = [documents[doc_id] for doc_id in moved]
+        self._publish(changed)
+        return moved
 
-    def _save_metadata(self):
-        with open(self.metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(self.documents, f, ensure_ascii=False, indent=2)
+    def add_document(
+        self,
+        file_path: Path,
+        original_filename: str,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> Dict:
+        """파일을 저장하고 텍스트를 추출하여 등록
 
-    def add_document(self, file_path: Path, original_filename: str) -> Dict:
-        """파일을 저장하고 텍스트를 추출하여 등록"""
+        progress_callback(done, total)은 PDF 페이지 추출 진행 시 호출된다.
+        """
         doc_id = str(uuid.uuid4())
         saved_path = self.base_dir / f"{doc_id}_{original_filename}"
         
         # 파일 복사/이동
         shutil.copy2(file_path, saved_path)
 
-        # 텍스트 추출
-        text_content = self._extract_text(saved_path)
-        if not text_content:
-            text_content = "" # 빈 텍스트라도 허용 (에러 방지)
+        # 텍스트 추출 (동일 내용의 파일은 기존 사이드카 재사용, 실패하면 업로드 실패)
+        file_hash = self._hash_file(saved_path)
+        if not self._sidecar_path(file_hash).exists():
+            try:
+                self._build_sidecar(saved_path, file_hash, progress_callback)
+            except Exception:
+                saved_path.unlink(missing_ok=True)
+                raise
 
         created_at = datetime.now().isoformat()
         
@@ -58,40 +108,162 @@ class DocumentManager:
             "path": str(saved_path),
             "created_at": created_at,
             "type": saved_path.suffix.lower().replace('.', ''),
-            "size": saved_path.stat().st_size
+            "size": saved_path.stat().st_size,
+            "sha256": file_hash
         }
 
-        self.documents[doc_id] = doc_info
-        self._save_metadata()
+        with self.store.transaction() as documents:
+            documents[doc_id] = doc_info
+        self._publish([doc_info])
 
-        return {
-            "info": doc_info,
-            "text": text_content
-        }
+        if self.search_index:
+            self.search_index.index_document(doc_id, self.iter_text(doc_id))
 
-    def _extract_text(self, file_path: Path) -> str:
-        """파일 확장자에 따라 텍스트 추출"""
-        suffix = file_path.suffix.lower()
-        
+        return {"info": doc_info}
+
+    def get_text(self, doc_id: str) -> str:
+        """문서의 추출 텍스트 전체 조회 (대용량 문서는 iter_text 사용)"""
+        return "".join(self.iter_text(doc_id))
+
+    def iter_text(self, doc_id: str, block_size: int = TEXT_BLOCK_SIZE) -> Iterator[str]:
+        """문서의 추출 텍스트를 사이드카에서 블록 단위로 스트리밍"""
+        sidecar_path = self._ensure_sidecar(doc_id)
+        if sidecar_path is None:
+            return
+        with gzip.open(sidecar_path, 'rt', encoding='utf-8') as f:
+            f.readline()  # 헤더
+            for block in iter(lambda: f.read(block_size), ''):
+                yield block
+
+    def get_page_offsets(self, doc_id: str) -> Optional[List[int]]:
+        """PDF 페이지별 시작 오프셋 조회 (PDF가 아니면 None)"""
+        sidecar_path = self._ensure_sidecar(doc_id)
+        if sidecar_path is None:
+            return None
         try:
-            if suffix == '.pdf':
-                return self._extract_pdf(file_path)
-            elif suffix in ['.txt', '.py', '.js', '.html', '.css', '.md', '.json', '.yaml', '.yml', '.c', '.cpp', '.h', '.java']:
-                return file_path.read_text(encoding='utf-8', errors='replace')
+            with gzip.open(sidecar_path, 'rt', encoding='utf-8') as f:
+                return json.loads(f.readline()).get("pages")
+        except Exception as e:
+            print(f"Error reading sidecar {sidecar_path}: {e}")
+            return None
+
+    def _ensure_sidecar(self, doc_id: str) -> Optional[Path]:
+        """사이드카 경로 반환 (없으면 원본에서 추출하여 생성)"""
+        doc_info = self.documents.get(doc_id)
+        if not doc_info:
+            return None
+
+        path = Path(doc_info['path'])
+        file_hash = doc_info.get("sha256")
+        if not file_hash:
+            # 해시가 없는 기존 문서는 최초 접근 시 해시를 기록
+            if not path.exists():
+                return None
+            file_hash = self._hash_file(path)
+            with self.store.transaction() as documents:
+                if doc_id in documents:
+                    documents[doc_id]["sha256"] = file_hash
+
+        sidecar_path = self._sidecar_path(file_hash)
+        if not sidecar_path.exists():
+            if not path.exists():
+                return None
+            try:
+                self._build_sidecar(path, file_hash)
+            except Exception:
+                return None  # 사이드카를 남기지 않으므로 다음 접근 시 다시 추출
+        return sidecar_path
+
+    def _hash_file(self, file_path: Path) -> str:
+        sha = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(block)
+        return sha.hexdigest()
+
+    def _sidecar_path(self, file_hash: str) -> Path:
+        return self.base_dir / f"{file_hash}.txt.gz"
+
+    def _build_sidecar(
+        self,
+        file_path: Path,
+        file_hash: str,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> None:
+        """파일 확장자에 따라 텍스트를 추출하여 사이드카 생성
+
+        추출에 실패하면 사이드카를 만들지 않고 예외를 그대로 올린다
+        (빈 사이드카를 남기면 같은 내용의 파일이 영구히 빈 텍스트가 되므로).
+        """
+        try:
+            if file_path.suffix.lower() == '.pdf':
+                text, page_offsets = self._extract_pdf(file_path, progress_callback)
+                self._write_sidecar(file_hash, [text], page_offsets)
             else:
-                # 기본적으로 텍스트로 시도
-                return file_path.read_text(encoding='utf-8', errors='replace')
+                # PDF 외에는 텍스트로 간주하고 블록 단위로 복사 (전체를 메모리에 올리지 않음)
+                self._write_sidecar(file_hash, self._iter_file_text(file_path), None)
         except Exception as e:
             print(f"Error extracting text from {file_path}: {e}")
-            return ""
+            raise
+
+    def _iter_file_text(self, file_path: Path, block_size: int = TEXT_BLOCK_SIZE) -> Iterator[str]:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            for block in iter(lambda: f.read(block_size), ''):
+                yield block
+
+    def _write_sidecar(self, file_hash: str, blocks: Iterable[str], page_offsets: Optional[List[int]]) -> None:
+        """추출 텍스트를 gzip 사이드카로 저장 (첫 줄: JSON 헤더, 이후: 본문)"""
+        sidecar_path = self._sidecar_path(file_hash)
+        # 같은 파일을 동시에 올려도 임시 파일이 겹치지 않도록 프로세스/스레드별 이름 사용
+        tmp_path = sidecar_path.with_name(f"{sidecar_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        header = {"sha256": file_hash, "pages": page_offsets}
+        try:
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                f.write(json.dumps(header) + "\n")
+                for block in blocks:
+                    f.write(block)
+            os.replace(tmp_path, sidecar_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
 
-    def _extract_pdf(self, file_path: Path) -> str:
-        text = ""
+    def _extract_pdf(
+        self,
+        file_path: Path,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> Tuple[str, List[int]]:
+        """페이지 범위를 CPU 작업 풀(프로세스)에 나누어 추출하고 순서대로 결합"""
         with open(file_path, 'rb') as f:
-            reader = pypdf.PdfReader(f)
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-        return text
+            total = len(pypdf.PdfReader(f).pages)
+
+        ranges = [
+            (start, min(start + PDF_PAGES_PER_TASK, total))
+            for start in range(0, total, PDF_PAGES_PER_TASK)
+        ]
+        results: Dict[int, List[str]] = {}
+        done = 0
+
+        if total < PDF_PARALLEL_MIN_PAGES:
+            for start, end in ranges:
+                results[start] = _extract_pdf_pages(str(file_path), start, end)
+                done += end - start
+                if progress_callback:
+                    progress_callback(done, total)
+        else:
+            futures = {
+                pools.submit("cpu", _extract_pdf_pages, str(file_path), start, end): (start, end)
+                for start, end in ranges
+            }
+            for future in as_completed(futures):
+                start, end = futures[future]
+                results[start] = future.result()
+                done += end - start
+                if progress_callback:
+                    progress_callback(done, total)
+
+        pages = [page for start, _ in ranges for page in results[start]]
+        page_offsets = [0, *accumulate(len(page) for page in pages)][:len(pages)]
+        return "".join(pages), page_offsets
 
     def get_document(self, doc_id: str) -> Optional[Dict]:
         return self.documents.get(doc_id)
@@ -103,18 +275,29 @@ class DocumentManager:
         return docs
 
     def delete_document(self, doc_id: str) -> bool:
-        if doc_id not in self.documents:
-            return False
+        return bool(self.delete_documents([doc_id]))
 
-        doc_info = self.documents[doc_id]
-        path = Path(doc_info['path'])
-        
-        if path.exists():
-            try:
-                path.unlink()
-            except Exception as e:
-                print(f"Error deleting file {path}: {e}")
+    def delete_documents(self, doc_ids: Iterable[str]) -> List[str]:
+        """여러 문서를 한 번의 기록으로 삭제 (삭제된 문서 ID 목록 반환)"""
+        with self.store.transaction() as documents:
+            removed = [documents.pop(doc_id) for doc_id in doc_ids if doc_id in documents]
+            remaining_hashes = {d.get("sha256") for d in documents.values()}
+        self._publish([], [doc_info["id"] for doc_info in removed])
+
+        for doc_info in removed:
+            path = Path(doc_info['path'])
+            if path.exists():
+                try:
+                    path.unlink()
+                except Exception as e:
+                    print(f"Error deleting file {path}: {e}")
+
+            if self.search_index:
+                self.search_index.remove("document", doc_info["id"])
+
+            # 같은 내용을 참조하는 문서가 없으면 사이드카도 삭제
+            file_hash = doc_info.get("sha256")
+            if file_hash and file_hash not in remaining_hashes:
+                self._sidecar_path(file_hash).unlink(missing_ok=True)
 
-        del self.documents[doc_id]
-        self._save_metadata()
-        return True
+        return [doc_info["id"] for doc_info in removed]
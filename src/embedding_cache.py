@@ -0,0 +1,131 @@
+"""
+임베딩 캐시 모듈
+(임베딩 모델, 청크 텍스트 해시)별 벡터를 SQLite에 보관하여 같은 청크를 다시 임베딩하지 않음
+"""
+
+import hashlib
+import sqlite3
+from array import array
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+# 스키마 변경 시 증가 (불일치하면 새로 생성)
+SCHEMA_VERSION = 1
+
+# SQLite IN (...) 절 하나에 넣는 최대 항목 수
+_LOOKUP_BATCH = 500
+
+
+def text_hash(text: str) -> str:
+    """청크 텍스트의 sha256"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """(모델, 텍스트 해시) -> 벡터 (float32로 저장)"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._has_schema():
+            self._create_schema()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """트랜잭션 단위 연결 (정상 종료 시 커밋, 예외 시 롤백)"""
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            with conn:
+                yield conn
+
+    def _has_schema(self) -> bool:
+        if not self.db_path.exists():
+            return False
+        with self._connect() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+    def _create_schema(self) -> None:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(f"""
+                DROP TABLE IF EXISTS embeddings;
+                CREATE TABLE embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                ) WITHOUT ROWID;
+                PRAGMA user_version = {SCHEMA_VERSION};
+            """)
+
+    def get_many(self, model: str, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """캐시된 벡터 ({해시: 벡터}, 없는 해시는 빠짐)"""
+        hashes = list(dict.fromkeys(hashes))
+        found: Dict[str, List[float]] = {}
+        with self._connect() as conn:
+            for i in range(0, len(hashes), _LOOKUP_BATCH):
+                batch = hashes[i:i + _LOOKUP_BATCH]
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? "
+                    f"AND text_hash IN ({','.join('?' * len(batch))})",
+                    [model, *batch]
+                )
+                for digest, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[digest] = vector.tolist()
+        return found
+
+    def put_many(self, model: str, items: Iterable[Tuple[str, Sequence[float]]]) -> None:
+        """벡터 저장 ((해시, 벡터) 목록)"""
+        rows = [(model, digest, array("f", vector).tobytes()) for digest, vector in items]
+        if not rows:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)", rows
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            count, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()
+        return {"vectors": count, "bytes": size}
+
+
+class CachedEmbeddings(Embeddings):
+    """임베딩 모델 앞에 캐시를 두는 어댑터 (캐시에 없는 텍스트만 실제 모델로 임베딩)"""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model: str):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [text_hash(text) for text in texts]
+        vectors = self.cache.get_many(self.model, hashes)
+
+        missing = {}
+        for digest, text in zip(hashes, texts):
+            if digest not in vectors:
+                missing.setdefault(digest, text)
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            embedded = self.embeddings.embed_documents(list(missing.values()))
+            new_items = list(zip(missing.keys(), embedded))
+            self.cache.put_many(self.model, new_items)
+            vectors.update(new_items)
+        return [list(vectors[digest]) for digest in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        # 질문은 매번 달라서 캐시하지 않음
+        return self.embeddings.embed_query(text)
+
+    def seed(self, items: Iterable[Tuple[str, Sequence[float]]]) -> None:
+        """이미 계산된 (텍스트, 벡터)를 캐시에 등록 (기존 인덱스의 벡터 재사용)"""
+        self.cache.put_many(self.model, ((text_hash(text), vector) for text, vector in items))
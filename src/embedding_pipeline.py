@@ -0,0 +1,171 @@
+"""
+임베딩 파이프라인 모듈
+청크를 배치로 묶어 Ollama /api/embed로 동시에 보내고, 실패한 배치는 지수 백오프로 재시도
+
+- 배치 크기: EMBED_REQUEST_BATCH (요청 하나에 담는 텍스트 수)
+- 동시 요청 수: EMBED_CONCURRENCY (진행 중인 요청 수 상한)
+- 처리량/재시도/실패 통계는 stats()로 조회
+- Ollama HTTP API만 사용 (base_url을 바꾸면 로컬 대체 서버로 시험할 수 있음)
+"""
+
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from .config import (
+    OLLAMA_BASE_URL, EMBED_REQUEST_BATCH, EMBED_CONCURRENCY,
+    EMBED_MAX_RETRIES, EMBED_RETRY_BACKOFF, EMBED_TIMEOUT
+)
+
+# 재시도하는 HTTP 상태 (요청 자체가 잘못된 4xx는 바로 실패)
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+# 백오프 상한(초)
+MAX_BACKOFF = 30.0
+
+
+class EmbeddingStats:
+    """임베딩 요청 통계 (스레드 안전)"""
+
+    def __init__(self):
+        self.requests = 0
+        self.texts = 0
+        self.chars = 0
+        self.retries = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.request_seconds = 0.0
+        self.busy_seconds = 0.0
+        self._busy_since: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.in_flight == 0:
+                self._busy_since = time.perf_counter()
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finish(self, texts: int, chars: int, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if self.in_flight == 0 and self._busy_since is not None:
+                self.busy_seconds += time.perf_counter() - self._busy_since
+                self._busy_since = None
+            self.request_seconds += seconds
+            if ok:
+                self.requests += 1
+                self.texts += texts
+                self.chars += chars
+            else:
+                self.failures += 1
+
+    def retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            busy = self.busy_seconds
+            if self._busy_since is not None:
+                busy += time.perf_counter() - self._busy_since
+            return {
+                "requests": self.requests,
+                "texts": self.texts,
+                "chars": self.chars,
+                "retries": self.retries,
+                "failures": self.failures,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "busy_seconds": round(busy, 3),
+                "texts_per_second": round(self.texts / busy, 2) if busy else 0.0,
+                "mean_request_ms": round(self.request_seconds / (self.requests + self.failures) * 1000, 2)
+                if self.requests + self.failures else 0.0
+            }
+
+
+class EmbeddingPipeline(Embeddings):
+    """배치/동시 요청/재시도를 갖춘 Ollama 임베딩 (LangChain Embeddings 호환)"""
+
+    def __init__(
+        self,
+        model: str,
+        base_url: str = OLLAMA_BASE_URL,
+        batch_size: int = EMBED_REQUEST_BATCH,
+        concurrency: int = EMBED_CONCURRENCY,
+        max_retries: int = EMBED_MAX_RETRIES,
+        backoff: float = EMBED_RETRY_BACKOFF,
+        timeout: float = EMBED_TIMEOUT
+    ):
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff = backoff
+        self.timeout = timeout
+        self.stats = EmbeddingStats()
+        # 여러 호출(인덱싱 동시 실행)이 겹쳐도 전체 진행 중 요청 수는 concurrency 이하
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """배치로 나누어 최대 concurrency개씩 동시에 임베딩 (입력 순서대로 반환)"""
+        if not texts:
+            return []
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) == 1:
+            return self._embed_batch(batches[0])
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches)), thread_name_prefix="embed") as pool:
+            return [vector for vectors in pool.map(self._embed_batch, batches) for vector in vectors]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed_batch([text])[0]
+
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """배치 하나 임베딩 (일시적 오류는 지수 백오프 + 지터로 재시도)"""
+        attempt = 0
+        while True:
+            try:
+                return self._request(batch)
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                attempt += 1
+                self.stats.retry()
+                delay = min(MAX_BACKOFF, self.backoff * 2 ** (attempt - 1))
+                delay *= random.uniform(0.5, 1.0)
+                print(f"임베딩 요청 재시도 {attempt}/{self.max_retries} ({delay:.1f}초 후): {e}")
+                time.sleep(delay)
+
+    def _request(self, batch: List[str]) -> List[List[float]]:
+        request = urllib.request.Request(
+            f"{self.base_url}/api/embed",
+            data=json.dumps({"model": self.model, "input": batch}, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"}
+        )
+        with self._slots:
+            self.stats.start()
+            started = time.perf_counter()
+            ok = False
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    embeddings = json.loads(response.read().decode("utf-8")).get("embeddings") or []
+                if len(embeddings) != len(batch):
+                    raise ValueError(f"임베딩 수 불일치 (요청 {len(batch)}, 응답 {len(embeddings)})")
+                ok = True
+                return embeddings
+            finally:
+                self.stats.finish(len(batch), sum(len(text) for text in batch), time.perf_counter() - started, ok)
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, urllib.error.HTTPError):
+            return error.code in RETRY_STATUS
+        return isinstance(error, (urllib.error.URLError, TimeoutError, ConnectionError))
@@ -0,0 +1,201 @@
+"""
+실행 계층 모듈
+블로킹 작업을 종류별 풀로 보내 이벤트 루프를 막지 않도록 하고, 이벤트 루프 지연을 측정
+
+- io: 파일/SQLite/네트워크(Ollama HTTP 포함) 작업 (스레드 풀)
+- cpu: 순수 CPU 작업 (프로세스 풀, 최상위 함수만 가능)
+- model: 프로세스 내 모델 추론 (WhisperX, GPU 메모리를 고려해 기본 1개씩 실행)
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+IO_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+CPU_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+MODEL_WORKERS = 1
+
+# 이벤트 루프 지연 측정 간격(초) / 보관할 측정값 수 / 이 값(ms)을 넘으면 지연으로 기록
+LOOP_LAG_INTERVAL = 0.5
+LOOP_LAG_WINDOW = 600
+LOOP_LAG_STALL_MS = 100.0
+
+
+class PoolStats:
+    """풀별 작업 통계 (스레드 안전)"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.submitted = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+
+    def finish(self, seconds: float, failed: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            self.failed += int(failed)
+            self.busy_seconds += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "running": min(self.in_flight, self.workers),
+                "queued": max(0, self.in_flight - self.workers),
+                "completed": self.completed,
+                "failed": self.failed,
+                "busy_seconds": round(self.busy_seconds, 3)
+            }
+
+
+class WorkPools:
+    """작업 종류별 실행 풀 (처음 사용할 때 생성)"""
+
+    def __init__(self, io_workers: int = IO_WORKERS, cpu_workers: int = CPU_WORKERS, model_workers: int = MODEL_WORKERS):
+        self._sizes = {"io": io_workers, "cpu": cpu_workers, "model": model_workers}
+        self._pools: Dict[str, Executor] = {}
+        self._stats = {kind: PoolStats(size) for kind, size in self._sizes.items()}
+        self._lock = threading.Lock()
+
+    def get_pool(self, kind: str) -> Executor:
+        """종류별 풀 (지연 생성, 재사용)"""
+        with self._lock:
+            if kind not in self._pools:
+                if kind == "cpu":
+                    self._pools[kind] = ProcessPoolExecutor(max_workers=self._sizes[kind])
+                else:
+                    self._pools[kind] = ThreadPoolExecutor(max_workers=self._sizes[kind], thread_name_prefix=kind)
+            return self._pools[kind]
+
+    def submit(self, kind: str, func: Callable[..., T], *args, **kwargs) -> "Future[T]":
+        """동기 코드에서 작업 제출 (통계 포함)"""
+        stats = self._stats[kind]
+        stats.start()
+        started = time.perf_counter()
+        future = self.get_pool(kind).submit(func, *args, **kwargs)
+        future.add_done_callback(
+            lambda f: stats.finish(time.perf_counter() - started, f.cancelled() or f.exception() is not None)
+        )
+        return future
+
+    async def run(self, kind: str, func: Callable[..., T], *args, **kwargs) -> T:
+        """풀에서 실행하고 결과를 기다림 (이벤트 루프는 다른 요청을 계속 처리)"""
+        return await asyncio.wrap_future(self.submit(kind, func, *args, **kwargs))
+
+    async def run_io(self, func: Callable[..., T], *args, **kwargs) -> T:
+        return await self.run("io", func, *args, **kwargs)
+
+    async def run_cpu(self, func: Callable[..., T], *args, **kwargs) -> T:
+        return await self.run("cpu", func, *args, **kwargs)
+
+    async def run_model(self, func: Callable[..., T], *args, **kwargs) -> T:
+        return await self.run("model", func, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {kind: stats.snapshot() for kind, stats in self._stats.items()}
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class LoopLagMonitor:
+    """이벤트 루프 지연 측정 (예정된 sleep이 실제로 얼마나 늦게 깨어나는지)"""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, window: int = LOOP_LAG_WINDOW,
+                 stall_ms: float = LOOP_LAG_STALL_MS):
+        self.interval = interval
+        self.stall_ms = stall_ms
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._max_ms = 0.0
+        self._stalls = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (loop.time() - started - self.interval) * 1000)
+            self._samples.append(lag_ms)
+            self._max_ms = max(self._max_ms, lag_ms)
+            if lag_ms >= self.stall_ms:
+                self._stalls += 1
+                print(f"이벤트 루프 지연: {lag_ms:.0f}ms")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """최근 측정값 통계 (ms)"""
+        samples = sorted(self._samples)
+
+        def percentile(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))], 2) if samples else 0.0
+
+        return {
+            "interval_ms": self.interval * 1000,
+            "samples": len(samples),
+            "current_ms": round(self._samples[-1], 2) if self._samples else 0.0,
+            "mean_ms": round(sum(samples) / len(samples), 2) if samples else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(self._max_ms, 2),
+            "stalls": self._stalls,
+            "stall_threshold_ms": self.stall_ms
+        }
+
+
+# 애플리케이션 전체에서 공유하는 풀
+pools = WorkPools()
+
+
+def run_in_pool(kind: str) -> Callable[[Callable[..., T]], Callable[..., "asyncio.Future[T]"]]:
+    """동기 함수를 지정한 풀에서 실행하는 코루틴 함수로 감싸는 데코레이터"""
+    def decorator(func: Callable[..., T]):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await pools.run(kind, func, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def iterate_in_pool(iterable: Iterable[T], kind: str = "io") -> AsyncIterator[T]:
+    """동기 이터레이터를 풀에서 한 항목씩 진행 (StreamingResponse용)"""
+    iterator = iter(iterable)
+    done = object()
+    while True:
+        item = await pools.run(kind, next, iterator, done)
+        if item is done:
+            return
+        yield item
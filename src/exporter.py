@@ -0,0 +1,186 @@
+"""
+세션 일괄 내보내기 모듈
+여러 세션을 회의록(Markdown), JSON, SRT, WebVTT로 렌더링하여 ZIP으로 스트리밍
+"""
+
+import json
+import re
+import zipfile
+from datetime import datetime
+from typing import Dict, Any, List, Iterable, Iterator, Optional
+
+from .meeting_minutes import MeetingMinutesGenerator
+from .session_manager import SessionManager
+from .session_views import split_participants, split_agenda
+
+EXPORT_FORMATS = ("md", "json", "srt", "vtt")
+
+# 스트리밍 응답에서 한 번에 보내는 최소 크기 (작은 줄 단위 조각을 모아서 전송)
+STREAM_CHUNK_BYTES = 64 * 1024
+
+_ENTRY_NAMES = {
+    "md": "minutes.md",
+    "json": "transcript.json",
+    "srt": "subtitles.srt",
+    "vtt": "subtitles.vtt"
+}
+
+_UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|\x00-\x1f]+')
+
+
+def _format_cue_time(seconds: Optional[float], separator: str) -> str:
+    """자막 타임스탬프 (HH:MM:SS,mmm 또는 HH:MM:SS.mmm)"""
+    total_ms = max(0, int(round((seconds or 0) * 1000)))
+    hours, rest = divmod(total_ms, 3600 * 1000)
+    mins, rest = divmod(rest, 60 * 1000)
+    secs, ms = divmod(rest, 1000)
+    return f"{hours:02d}:{mins:02d}:{secs:02d}{separator}{ms:03d}"
+
+
+def _cue_text(seg: Dict[str, Any]) -> str:
+    text = " ".join(str(seg.get("text", "")).split())
+    speaker = seg.get("speaker")
+    return f"[{speaker}] {text}" if speaker else text
+
+
+def iter_srt(segments: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """SRT 자막 (세그먼트 하나당 큐 하나)"""
+    for i, seg in enumerate(segments, 1):
+        start = _format_cue_time(seg.get("start"), ",")
+        end = _format_cue_time(seg.get("end"), ",")
+        yield f"{i}\n{start} --> {end}\n{_cue_text(seg)}\n\n"
+
+
+def iter_vtt(segments: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """WebVTT 자막 (화자는 voice 태그로 표시)"""
+    yield "WEBVTT\n\n"
+    for seg in segments:
+        start = _format_cue_time(seg.get("start"), ".")
+        end = _format_cue_time(seg.get("end"), ".")
+        text = " ".join(str(seg.get("text", "")).split()).replace("-->", "->")
+        speaker = seg.get("speaker")
+        if speaker:
+            text = f"<v {speaker}>{text}"
+        yield f"{start} --> {end}\n{text}\n\n"
+
+
+def iter_json(meta: Dict[str, Any], segments: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """{"meta": ..., "segments": [...]} JSON (세그먼트 단위로 생성)"""
+    yield '{"meta": ' + json.dumps(meta, ensure_ascii=False) + ', "segments": ['
+    for i, seg in enumerate(segments):
+        yield ("" if i == 0 else ", ") + json.dumps(seg, ensure_ascii=False)
+    yield "]}\n"
+
+
+def iter_encoded(parts: Iterable[str], chunk_bytes: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    """텍스트 조각을 UTF-8로 인코딩하여 chunk_bytes 이상씩 모아 생성"""
+    buffer: List[bytes] = []
+    size = 0
+    for part in parts:
+        data = part.encode("utf-8")
+        buffer.append(data)
+        size += len(data)
+        if size >= chunk_bytes:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def safe_filename(name: str, default: str = "무제") -> str:
+    """ZIP 항목/다운로드 파일 이름으로 쓸 수 있게 정리"""
+    name = _UNSAFE_FILENAME.sub("_", name or "").strip(" .")
+    return name[:80] or default
+
+
+class _ZipStream:
+    """ZipFile이 쓴 바이트를 모아 두었다가 꺼내 가는 쓰기 전용 스트림 (seek 불가)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class SessionExporter:
+    """세션 ZIP 내보내기 (세션 하나씩 로드하여 렌더링하므로 메모리 사용량은 세션 수와 무관)"""
+
+    def __init__(self, session_manager: SessionManager, minutes_generator: Optional[MeetingMinutesGenerator] = None):
+        self.session_manager = session_manager
+        self.minutes_generator = minutes_generator or MeetingMinutesGenerator()
+
+    def _render_minutes(
+        self,
+        meta: Dict[str, Any],
+        segments: List[Dict[str, Any]],
+        summary: Optional[Dict[str, Any]]
+    ) -> Iterator[str]:
+        minutes = self.minutes_generator.generate(
+            {"segments": segments},
+            title=meta.get("title", "무제"),
+            participants=split_participants(meta),
+            agenda=split_agenda(meta),
+            summary=summary
+        )
+        yield from self.minutes_generator.iter_markdown(minutes)
+
+    def _render(self, fmt: str, session_id: str, meta: Dict[str, Any], segments: List[Dict[str, Any]]) -> Iterator[str]:
+        if fmt == "md":
+            return self._render_minutes(meta, segments, self.session_manager.load_summary(session_id))
+        if fmt == "json":
+            return iter_json(meta, segments)
+        if fmt == "srt":
+            return iter_srt(segments)
+        return iter_vtt(segments)
+
+    def iter_zip(self, session_ids: Iterable[str], formats: Iterable[str] = EXPORT_FORMATS) -> Iterator[bytes]:
+        """ZIP 바이트 스트림 생성 (세션별 폴더에 형식별 파일)"""
+        formats = [fmt for fmt in formats if fmt in EXPORT_FORMATS]
+        stream = _ZipStream()
+        with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for session_id in session_ids:
+                try:
+                    meta, result, _ = self.session_manager.load_session(session_id)
+                except Exception as e:
+                    print(f"내보내기 오류 ({session_id}): {e}")
+                    continue
+
+                segments = [
+                    {k: v for k, v in seg.items() if k != "speaker_id"}
+                    for seg in (result or {}).get("segments", [])
+                ]
+                folder = f"{safe_filename(meta.get('title'))}_{session_id[:8]}"
+                date_time = self._zip_date(meta.get("created_at"))
+
+                for fmt in formats:
+                    info = zipfile.ZipInfo(f"{folder}/{_ENTRY_NAMES[fmt]}", date_time=date_time)
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    with zf.open(info, "w", force_zip64=True) as entry:
+                        for text in self._render(fmt, session_id, meta, segments):
+                            entry.write(text.encode("utf-8"))
+                            yield from self._drain(stream)
+                    yield from self._drain(stream)
+        yield from self._drain(stream)
+
+    @staticmethod
+    def _drain(stream: _ZipStream) -> Iterator[bytes]:
+        data = stream.drain()
+        if data:
+            yield data
+
+    @staticmethod
+    def _zip_date(created_at: Optional[str]) -> tuple:
+        try:
+            return datetime.fromisoformat(created_at).timetuple()[:6]
+        except (TypeError, ValueError):
+            return datetime.now().timetuple()[:6]
@@ -1,31 +1,30 @@
-import json
 import uuid
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable
+
+from .metadata_store import JsonStore
+from .structure_index import StructureIndex
 
 class FolderManager:
     """폴더 구조 관리 클래스"""
 
-    def __init__(self, base_dir: Path):
+    def __init__(self, base_dir: Path, structure_index: Optional[StructureIndex] = None):
         self.base_dir = base_dir
         self.base_dir.mkdir(parents=True, exist_ok=True)
         self.metadata_file = self.base_dir / "folders.json"
-        self._load_metadata()
+        self.store = JsonStore(self.metadata_file)
+        self.structure_index = structure_index
 
-    def _load_metadata(self):
-        if self.metadata_file.exists():
-            try:
-                with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                    self.folders = json.load(f)
-            except Exception:
-                self.folders = {}
-        else:
-            self.folders = {}
+    def _publish(self, folders: Iterable[Dict], deleted_ids: Iterable[str] = ()) -> None:
+        """구조 색인에 변경 반영"""
+        if self.structure_index:
+            self.structure_index.upsert_many("folder", folders)
+            self.structure_index.remove_many("folder", deleted_ids)
 
-    def _save_metadata(self):
-        with open(self.metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(self.folders, f, ensure_ascii=False, indent=2)
+    @property
+    def folders(self) -> Dict[str, Dict]:
+        return self.store.read()
 
     def create_folder(self, name: str, parent_id: Optional[str] = None) -> Dict:
         folder_id = str(uuid.uuid4())
@@ -38,60 +37,87 @@ class FolderManager:
             "created_at": created_at
         }
         
-        self.folders[folder_id] = folder_info
-        self._save_metadata()
+        with self.store.transaction() as folders:
+            folders[folder_id] = folder_info
+        self._publish([folder_info])
         return folder_info
 
     def update_folder(self, folder_id: str, name: Optional[str] = None, parent_id: Optional[str] = None) -> Optional[Dict]:
-        if folder_id not in self.folders:
-            return None
-        
-        if name is not None:
-            self.folders[folder_id]["name"] = name
-        
-        # Handle parent_id update (folder move)
-        # Note: parent_id argument being None means "don't change", not "set to root"
-        # Use "root" string to explicitly move to root
-        if parent_id is not None:
-            # Prevent setting parent to self
-            if parent_id == folder_id:
-                raise ValueError("Cannot set parent to self")
+        with self.store.transaction() as folders:
+            if folder_id not in folders:
+                return None
             
-            # Convert "root" to None for storage
-            new_parent_id = None if parent_id == "root" else parent_id
+            if name is not None:
+                folders[folder_id]["name"] = name
             
-            # Check for circular reference (prevent moving folder into its own descendant)
-            if new_parent_id is not None:
-                # Check if new_parent_id is a descendant of folder_id
-                current = new_parent_id
-                visited = set()
-                while current:
-                    if current in visited:
-                        break  # Prevent infinite loop
-                    if current == folder_id:
-                        raise ValueError("Cannot move folder into its own descendant")
-                    visited.add(current)
-                    parent_folder = self.folders.get(current)
-                    current = parent_folder.get("parent_id") if parent_folder else None
+            # Handle parent_id update (folder move)
+            # Note: parent_id argument being None means "don't change", not "set to root"
+            # Use "root" string to explicitly move to root
+            if parent_id is not None:
+                self._move(folders, folder_id, parent_id)
             
-            self.folders[folder_id]["parent_id"] = new_parent_id
-            
-        self._save_metadata()
-        return self.folders[folder_id]
+            folder_info = folders[folder_id]
+        self._publish([folder_info])
+        return folder_info
+
+    def move_folders(self, folder_ids: Iterable[str], parent_id: Optional[str]) -> List[str]:
+        """여러 폴더를 한 번의 기록으로 이동 (이동된 폴더 ID 목록 반환)"""
+        moved = []
+        with self.store.transaction() as folders:
+            for folder_id in folder_ids:
+                if folder_id in folders:
+                    self._move(folders, folder_id, parent_id or "root")
+                    moved.append(folder_id)
+            changed = [folders[fid] for fid in moved]
+        self._publish(changed)
+        return moved
+
+    @staticmethod
+    def _move(folders: Dict[str, Dict], folder_id: str, parent_id: str) -> None:
+        # Prevent setting parent to self
+        if parent_id == folder_id:
+            raise ValueError("Cannot set parent to self")
+        
+        # Convert "root" to None for storage
+        new_parent_id = None if parent_id == "root" else parent_id
+        
+        # Check for circular reference (prevent moving folder into its own descendant)
+        if new_parent_id is not None:
+            # Check if new_parent_id is a descendant of folder_id
+            current = new_parent_id
+            visited = set()
+            while current:
+                if current in visited:
+                    break  # Prevent infinite loop
+                if current == folder_id:
+                    raise ValueError("Cannot move folder into its own descendant")
+                visited.add(current)
+                parent_folder = folders.get(current)
+                current = parent_folder.get("parent_id") if parent_folder else None
+        
+        folders[folder_id]["parent_id"] = new_parent_id
 
     def delete_folder(self, folder_id: str) -> bool:
-        if folder_id in self.folders:
-            del self.folders[folder_id]
+        return bool(self.delete_folders([folder_id]))
+
+    def delete_folders(self, folder_ids: Iterable[str]) -> List[str]:
+        """여러 폴더를 한 번의 기록으로 삭제 (삭제된 폴더 ID 목록 반환)"""
+        deleted = []
+        with self.store.transaction() as folders:
+            for folder_id in folder_ids:
+                if folder_id in folders:
+                    del folders[folder_id]
+                    deleted.append(folder_id)
             
             # Orphaned children handling?
             # Strategy: Move children to Root (parent_id = None)
-            for fid, info in self.folders.items():
-                if info.get("parent_id") == folder_id:
+            orphans = []
+            for fid, info in folders.items():
+                if info.get("parent_id") in deleted:
                     info["parent_id"] = None
-            
-            self._save_metadata()
-            return True
-        return False
+                    orphans.append(info)
+        self._publish(orphans, deleted)
+        return deleted
 
     def list_folders(self) -> List[Dict]:
         return list(self.folders.values())
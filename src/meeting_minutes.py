@@ -6,7 +6,9 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+from .chunk_manifest import transcript_line
 
 
 class MeetingMinutesGenerator:
@@ -17,9 +19,10 @@ class MeetingMinutesGenerator:
         transcription_result: Dict[str, Any],
         title: str = "회의록",
         participants: Optional[List[str]] = None,
-        agenda: Optional[List[str]] = None
+        agenda: Optional[List[str]] = None,
+        summary: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """전사 결과로부터 회의록 생성"""
+        """전사 결과로부터 회의록 생성 (summary: 요약 단계 결과 {"summary", "action_items"})"""
         minutes = {
             "title": title,
             "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
@@ -33,13 +36,17 @@ class MeetingMinutesGenerator:
             "notes": ""
         }
 
-        # 전사 결과 처리
+        # 전사 결과 처리 (마크다운의 녹취록 절은 세그먼트가 있으면 세그먼트에서 한 줄씩 생성)
+        minutes["segments"] = transcription_result.get("segments", [])
         if "full_text" in transcription_result:
             minutes["transcript"] = transcription_result["full_text"]
-            minutes["segments"] = transcription_result.get("segments", [])
         else:
             minutes["transcript"] = transcription_result.get("text", "")
 
+        if summary:
+            minutes["summary"] = summary.get("summary", "")
+            minutes["action_items"] = list(summary.get("action_items") or [])
+
         # 회의 시간 계산
         if minutes["segments"]:
             last_segment = minutes["segments"][-1]
@@ -73,49 +80,69 @@ class MeetingMinutesGenerator:
             return f"{hours:02d}:{mins:02d}:{secs:02d}"
         return f"{mins:02d}:{secs:02d}"
 
-    def to_markdown(self, minutes: Dict[str, Any]) -> str:
+    def to_markdown(self, minutes: Dict[str, Any], transcript_sections: Optional[Iterable[str]] = None) -> str:
         """회의록을 마크다운 형식으로 변환"""
-        lines = [
-            f"# {minutes['title']}",
-            "",
-            f"**일시:** {minutes['date']}"
-        ]
+        return "".join(self.iter_markdown(minutes, transcript_sections))
+
+    def iter_markdown(self, minutes: Dict[str, Any], transcript_sections: Optional[Iterable[str]] = None) -> Iterator[str]:
+        """회의록 마크다운을 줄 단위로 생성 (전체 문서를 한 문자열로 만들지 않음)
+
+        transcript_sections: 청크별로 미리 렌더링해 둔 녹취록 구간 (있으면 녹취록 절을 그대로 이어 붙임,
+        없으면 세그먼트마다 한 줄씩 생성하고, 세그먼트도 없으면 transcript 문자열 사용)
+        """
+        for i, line in enumerate(self._markdown_lines(minutes, transcript_sections)):
+            yield line if i == 0 else "\n" + line
+
+    def _markdown_lines(self, minutes: Dict[str, Any], transcript_sections: Optional[Iterable[str]]) -> Iterator[str]:
+        yield f"# {minutes['title']}"
+        yield ""
+        yield f"**일시:** {minutes['date']}"
 
         if minutes["duration"]:
-            lines.append(f"**소요시간:** {minutes['duration']}")
+            yield f"**소요시간:** {minutes['duration']}"
 
         if minutes["participants"]:
-            lines.append(f"**참석자:** {', '.join(minutes['participants'])}")
+            yield f"**참석자:** {', '.join(minutes['participants'])}"
 
-        lines.append("")
+        yield ""
 
         if minutes["agenda"]:
-            lines.append("## 안건")
+            yield "## 안건"
             for i, item in enumerate(minutes["agenda"], 1):
-                lines.append(f"{i}. {item}")
-            lines.append("")
+                yield f"{i}. {item}"
+            yield ""
+
+        if minutes["summary"]:
+            yield from ["## 요약", "", minutes["summary"], ""]
 
-        lines.extend(["## 녹취록", "", minutes["transcript"], ""])
+        yield from ["## 녹취록", ""]
+        if transcript_sections:
+            yield from transcript_sections
+        elif minutes["segments"]:
+            yield from map(transcript_line, minutes["segments"])
+        else:
+            yield minutes["transcript"]
+        yield ""
 
         if minutes["action_items"]:
-            lines.append("## 액션 아이템")
+            yield "## 액션 아이템"
             for item in minutes["action_items"]:
-                lines.append(f"- [ ] {item}")
-            lines.append("")
+                yield f"- [ ] {item}"
+            yield ""
 
         if minutes["notes"]:
-            lines.extend(["## 비고", minutes["notes"], ""])
-
-        return "\n".join(lines)
+            yield from ["## 비고", minutes["notes"], ""]
 
     def to_json(self, minutes: Dict[str, Any]) -> str:
         """회의록을 JSON 형식으로 변환"""
         return json.dumps(minutes, ensure_ascii=False, indent=2)
 
     def save_markdown(self, minutes: Dict[str, Any], filepath: str) -> None:
-        """회의록을 마크다운 파일로 저장"""
-        Path(filepath).write_text(self.to_markdown(minutes), encoding="utf-8")
+        """회의록을 마크다운 파일로 저장 (줄 단위로 기록)"""
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.writelines(self.iter_markdown(minutes))
 
     def save_json(self, minutes: Dict[str, Any], filepath: str) -> None:
-        """회의록을 JSON 파일로 저장"""
-        Path(filepath).write_text(self.to_json(minutes), encoding="utf-8")
+        """회의록을 JSON 파일로 저장 (인코딩 결과를 조각 단위로 기록)"""
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(minutes, f, ensure_ascii=False, indent=2)
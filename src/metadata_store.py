@@ -0,0 +1,101 @@
+"""
+메타데이터 저장소 모듈
+JSON 메타데이터 파일을 프로세스 간 잠금과 원자적 교체로 안전하게 갱신
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(lock_path: Path) -> Iterator[None]:
+    """잠금 파일을 이용한 프로세스 간 배타 잠금"""
+    with open(lock_path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class JsonStore:
+    """JSON 객체 하나를 담는 파일 저장소
+
+    - read(): 디스크 파일이 바뀐 경우에만 다시 읽는 캐시 조회
+    - transaction(): 잠금 상태에서 최신 내용을 읽어 수정하고, 블록이 끝나면 한 번만 기록
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._thread_lock = threading.RLock()
+        self._data: Dict[str, Any] = {}
+        self._stamp: Optional[Tuple[int, int]] = None
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _load(self) -> None:
+        stamp = self._file_stamp()
+        if stamp is not None and stamp == self._stamp:
+            return
+        data: Dict[str, Any] = {}
+        if stamp is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"메타데이터 로드 오류 ({self.path}): {e}")
+        self._data, self._stamp = data, stamp
+
+    def read(self) -> Dict[str, Any]:
+        """현재 내용 (다른 프로세스가 갱신했으면 다시 로드)"""
+        with self._thread_lock:
+            self._load()
+            return self._data
+
+    @contextmanager
+    def transaction(self) -> Iterator[Dict[str, Any]]:
+        """잠금 -> 최신 내용 로드 -> 수정 -> 원자적 기록 (예외 시 기록하지 않음)"""
+        with self._thread_lock, file_lock(self.lock_path):
+            self._load()
+            data = json.loads(json.dumps(self._data))  # 실패 시 캐시가 오염되지 않도록 복사본 수정
+            yield data
+            self._write(data)
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._data, self._stamp = data, self._file_stamp()
@@ -4,14 +4,54 @@ LangChain + ChromaDB + Ollama 사용
 """
 
 import shutil
+import threading
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
-from langchain_ollama import OllamaEmbeddings, ChatOllama
+from langchain_ollama import ChatOllama
 
-from .config import CHROMA_DIR
+from .chunk_manifest import SPEAKER_BREAK_RATIO
+from .config import CHROMA_DIR, EMBEDDING_CACHE_PATH
+from .embedding_cache import CachedEmbeddings, EmbeddingCache, text_hash
+from .embedding_pipeline import EmbeddingPipeline
+
+# 한 번에 벡터스토어에 추가하는 청크 수 (임베딩 요청은 파이프라인이 다시 배치로 나누어 동시에 보냄)
+EMBED_BATCH_SIZE = 64
+# 스트리밍 분할 시 버퍼에 모으는 최대 문자 수
+STREAM_BUFFER_CHARS = 16 * 1024
+
+# 모든 세션/문서 청크를 담는 공유 컬렉션 (source_id/source_type/folder_id 메타데이터로 구분)
+SHARED_COLLECTION = "transcripts"
+SHARED_DIR_NAME = "shared"
+# 이전 버전의 세션별 인덱스 디렉토리 접두어
+LEGACY_PREFIX = "session_"
+
+# 녹취록 청크 하나의 최대 문자 수 (세그먼트 단위로 채우고, 한 세그먼트가 더 길 때만 그 세그먼트를 나눔)
+TRANSCRIPT_CHUNK_CHARS = 500
+
+# 청크 ID에 쓰는 텍스트 해시 길이 ("<source_id>:<해시 앞부분>")
+CHUNK_ID_HASH_CHARS = 16
+
+# 질문 하나에 가져오는 청크 수 (출처당, 전체 최대)
+QUERY_K_PER_SOURCE = 3
+QUERY_K_MAX = 20
+
+
+def _format_time(seconds: float) -> str:
+    mins = int(seconds // 60)
+    secs = int(seconds % 60)
+    return f"{mins:02d}:{secs:02d}"
+
+
+def legacy_index_dirs(persist_dir: Path = CHROMA_DIR) -> List[Path]:
+    """이전 버전의 세션별 인덱스 디렉토리 목록"""
+    persist_dir = Path(persist_dir)
+    if not persist_dir.exists():
+        return []
+    return sorted(p for p in persist_dir.iterdir() if p.is_dir() and p.name.startswith(LEGACY_PREFIX))
 
 
 class TranscriptRAG:
@@ -21,7 +61,8 @@ class TranscriptRAG:
         self,
         persist_dir: Optional[Path] = None,
         model_name: str = "llama3.2:3b",
-        embedding_model: str = "nomic-embed-text"
+        embedding_model: str = "nomic-embed-text",
+        embedding_cache_path: Optional[Path] = None
     ):
         self.persist_dir = Path(persist_dir) if persist_dir else CHROMA_DIR
         self.persist_dir.mkdir(parents=True, exist_ok=True)
@@ -35,80 +76,258 @@ class TranscriptRAG:
             separators=["\n\n", "\n", ".", "!", "?", ",", " "]
         )
 
-        self.embeddings = OllamaEmbeddings(model=embedding_model)
+        # (임베딩 모델, 청크 텍스트 해시) 캐시를 거쳐 바뀐 청크만 Ollama로 임베딩
+        self.embedding_pipeline = EmbeddingPipeline(embedding_model)
+        self.embeddings = CachedEmbeddings(
+            self.embedding_pipeline,
+            EmbeddingCache(embedding_cache_path or EMBEDDING_CACHE_PATH),
+            embedding_model
+        )
         self.llm = ChatOllama(model="exaone", temperature=0.3)
 
-        self._stores: dict = {}
-
-    def _get_collection_name(self, session_id: str) -> str:
-        return f"session_{session_id.replace('-', '_')}"
-
-    def _get_persist_path(self, session_id: str) -> Path:
-        return self.persist_dir / self._get_collection_name(session_id)
-
-    def index_transcript(self, session_id: str, text: str) -> bool:
+        self._store: Optional[Chroma] = None
+        self._store_lock = threading.Lock()
+
+    def _get_store(self) -> Chroma:
+        """공유 벡터스토어 (처음 사용할 때 열기)"""
+        with self._store_lock:
+            if self._store is None:
+                self._store = Chroma(
+                    collection_name=SHARED_COLLECTION,
+                    embedding_function=self.embeddings,
+                    persist_directory=str(self.persist_dir / SHARED_DIR_NAME)
+                )
+            return self._store
+
+    @property
+    def _collection(self):
+        return self._get_store()._collection
+
+    @staticmethod
+    def _source_filter(source_ids: List[str]) -> Dict[str, Any]:
+        if len(source_ids) == 1:
+            return {"source_id": source_ids[0]}
+        return {"source_id": {"$in": list(source_ids)}}
+
+    @staticmethod
+    def _base_metadata(source_id: str, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """청크 메타데이터 (Chroma는 None 값을 저장하지 않으므로 루트 폴더는 빈 문자열)"""
+        metadata = metadata or {}
+        return {
+            "source_id": source_id,
+            "source_type": metadata.get("source_type") or "session",
+            "folder_id": metadata.get("folder_id") or ""
+        }
+
+    @staticmethod
+    def _chunk_id(source_id: str, chunk: str, seen: Dict[str, int]) -> str:
+        """내용 기반 청크 ID ("<source_id>:<해시>", 같은 출처에 같은 텍스트가 반복되면 "~2", "~3"...)"""
+        chunk_id = f"{source_id}:{text_hash(chunk)[:CHUNK_ID_HASH_CHARS]}"
+        seen[chunk_id] = seen.get(chunk_id, 0) + 1
+        return chunk_id if seen[chunk_id] == 1 else f"{chunk_id}~{seen[chunk_id]}"
+
+    def index_transcript(self, session_id: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
         """전사 텍스트를 벡터 인덱스에 저장"""
-        try:
-            chunks = self.text_splitter.split_text(text)
-            if not chunks:
-                return False
-
-            collection_name = self._get_collection_name(session_id)
-            persist_path = str(self._get_persist_path(session_id))
-
-            vectorstore = Chroma.from_texts(
-                texts=chunks,
-                embedding=self.embeddings,
-                collection_name=collection_name,
-                persist_directory=persist_path
-            )
+        return self.index_stream(session_id, [text], metadata=metadata)
 
-            self._stores[session_id] = vectorstore
-            return True
+    def index_stream(
+        self,
+        source_id: str,
+        blocks: Iterable[str],
+        batch_size: int = EMBED_BATCH_SIZE,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """텍스트 블록 스트림을 청크로 나누어 배치 단위로 임베딩/저장
+
+        블록은 순서대로 한 번만 소비되며, 메모리에는 분할 버퍼와
+        임베딩 배치 하나만 유지된다. 청크 ID는 텍스트 해시 기반(_chunk_id)이다.
+        metadata: {"source_type": "session" | "document", "folder_id": ...}
+        """
+        try:
+            base = self._base_metadata(source_id, metadata)
+            chunks = self.iter_chunks(blocks)
+            seen: Dict[str, int] = {}
+            count = 0
+            while batch := list(islice(chunks, batch_size)):
+                self._get_store().add_texts(
+                    batch,
+                    metadatas=[{**base, "chunk": n} for n in range(count, count + len(batch))],
+                    ids=[self._chunk_id(source_id, chunk, seen) for chunk in batch]
+                )
+                count += len(batch)
+            return count > 0
 
         except Exception as e:
             print(f"인덱싱 오류: {e}")
             return False
 
-    def delete_index(self, session_id: str) -> None:
-        """세션의 벡터 인덱스 삭제"""
-        try:
-            # 메모리 캐시 제거
-            if session_id in self._stores:
-                del self._stores[session_id]
-
-            # 디스크 데이터 제거
-            persist_path = self._get_persist_path(session_id)
-            if persist_path.exists():
-                import shutil
-                shutil.rmtree(persist_path)
-                print(f"인덱스 삭제 완료: {session_id}")
-        except Exception as e:
-            print(f"인덱스 삭제 오류: {e}")
-
-    def _get_vectorstore(self, session_id: str) -> Optional[Chroma]:
-        """세션의 벡터스토어 가져오기"""
-        if session_id in self._stores:
-            return self._stores[session_id]
-
-        persist_path = self._get_persist_path(session_id)
-        if not persist_path.exists():
-            return None
+    def sync_segments(
+        self,
+        source_id: str,
+        segments: List[Dict[str, Any]],
+        metadata: Optional[Dict[str, Any]] = None,
+        batch_size: int = EMBED_BATCH_SIZE
+    ) -> Dict[str, int]:
+        """녹취록 세그먼트를 세그먼트 단위 청크(iter_segment_chunks)로 인덱싱
+
+        기존 인덱스와 비교하여 바뀐 부분만 반영한다 (삭제 후 전체 재인덱싱 대신 사용)
+        """
+        return self._sync(source_id, self.iter_segment_chunks(segments), metadata, batch_size)
+
+    def _sync(
+        self,
+        source_id: str,
+        chunks: Iterable[Tuple[str, Dict[str, Any]]],
+        metadata: Optional[Dict[str, Any]],
+        batch_size: int
+    ) -> Dict[str, int]:
+        """(청크 텍스트, 청크별 메타데이터)를 기존 인덱스와 비교하여 반영
+
+        - 새로 생긴 청크만 추가 (임베딩 캐시에 없는 텍스트만 실제로 임베딩)
+        - 없어진 청크는 삭제, 그대로인 청크는 벡터를 유지하고 번호/시간/화자/폴더 메타데이터만 갱신
+          (청크 텍스트에 화자 이름이 없으므로 화자 이름만 바꾸면 다시 임베딩하지 않음)
+        - 없어질 청크의 벡터는 먼저 캐시에 넣으므로, 이전 번호 기반 ID의 청크도 다시 임베딩하지 않는다
+        반환: {"added", "removed", "kept"}
+        """
+        base = self._base_metadata(source_id, metadata)
+        seen: Dict[str, int] = {}
+        target: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        for n, (chunk, extra) in enumerate(chunks):
+            target[self._chunk_id(source_id, chunk, seen)] = (chunk, {**base, **extra, "chunk": n})
+
+        existing = self._collection.get(where={"source_id": source_id}, include=["metadatas"])
+        current = dict(zip(existing["ids"], existing["metadatas"]))
+        added = [chunk_id for chunk_id in target if chunk_id not in current]
+        removed = [chunk_id for chunk_id in current if chunk_id not in target]
+        changed = [chunk_id for chunk_id, meta in current.items()
+                   if chunk_id in target and meta != target[chunk_id][1]]
+
+        if added and removed:
+            old = self._collection.get(ids=removed, include=["documents", "embeddings"])
+            self.embeddings.seed(
+                (doc, vector) for doc, vector in zip(old["documents"], old["embeddings"]) if doc
+            )
 
-        try:
-            vectorstore = Chroma(
-                collection_name=self._get_collection_name(session_id),
-                embedding_function=self.embeddings,
-                persist_directory=str(persist_path)
+        # 추가 → 삭제 순서로 반영하여 그 사이에 검색해도 빈 결과가 나오지 않게 함
+        for i in range(0, len(added), batch_size):
+            batch = added[i:i + batch_size]
+            self._get_store().add_texts(
+                [target[chunk_id][0] for chunk_id in batch],
+                metadatas=[target[chunk_id][1] for chunk_id in batch],
+                ids=batch
             )
-            self._stores[session_id] = vectorstore
-            return vectorstore
-        except Exception as e:
-            print(f"벡터스토어 로드 오류: {e}")
-            return None
+        if removed:
+            self._collection.delete(ids=removed)
+        if changed:
+            self._collection.update(ids=changed, metadatas=[target[chunk_id][1] for chunk_id in changed])
+
+        return {"added": len(added), "removed": len(removed), "kept": len(target) - len(added)}
+
+    def embedding_stats(self) -> Dict[str, Any]:
+        """임베딩 요청 처리량과 캐시 적중 통계"""
+        return {
+            "model": self.embedding_model,
+            "batch_size": self.embedding_pipeline.batch_size,
+            "concurrency": self.embedding_pipeline.concurrency,
+            "requests": self.embedding_pipeline.stats.snapshot(),
+            "cache": {"hits": self.embeddings.hits, "misses": self.embeddings.misses,
+                      **self.embeddings.cache.stats()}
+        }
+
+    def iter_segment_chunks(
+        self,
+        segments: List[Dict[str, Any]],
+        max_chars: int = TRANSCRIPT_CHUNK_CHARS
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """녹취록 세그먼트를 발화 단위로 묶은 청크 (텍스트, {"start", "end", "speakers"})
+
+        - 세그먼트 중간에서는 자르지 않으며, 청크가 어느 정도 찼으면 화자가 바뀌는 곳에서 끊는다
+        - 청크 텍스트는 발화 내용만 담고 (발화가 바뀌면 줄바꿈), 시간과 화자 표시 이름은 메타데이터로 저장한다.
+          화자 이름을 바꿔도 청크 텍스트와 해시(청크 ID, 임베딩 캐시 키)는 그대로이므로 다시 임베딩하지 않는다
+        - 발화 구분은 바뀌지 않는 speaker_id 기준 (없으면 speaker)
+        - max_chars보다 긴 세그먼트만 text_splitter로 나누며, 나뉜 조각은 그 세그먼트의 시간을 가진다
+        """
+        turns: List[List[Any]] = []  # [화자 ID, [텍스트, ...]]
+        names: Dict[str, str] = {}  # 청크에 등장한 화자 ID -> 표시 이름 (등장 순서)
+        size = 0
+        start = end = 0.0
+
+        def flush() -> Tuple[str, Dict[str, Any]]:
+            text = "\n".join(" ".join(texts) for _, texts in turns)
+            speakers = list(dict.fromkeys(names.values()))
+            return text, {"start": round(start, 2), "end": round(end, 2), "speakers": ", ".join(speakers)}
+
+        for seg in segments:
+            text = " ".join(str(seg.get("text", "")).split())
+            if not text:
+                continue
+            name = seg.get("speaker") or "SPEAKER"
+            speaker = seg.get("speaker_id") or name
+            pieces = [text] if len(text) <= max_chars else self.text_splitter.split_text(text)
+            for piece in pieces:
+                same_turn = bool(turns) and turns[-1][0] == speaker
+                length = len(piece) + 1
+                if turns and (size + length > max_chars or (not same_turn and size >= max_chars * SPEAKER_BREAK_RATIO)):
+                    yield flush()
+                    turns, names, size, same_turn = [], {}, 0, False
+                if not turns:
+                    start = float(seg.get("start") or 0)
+                if same_turn:
+                    turns[-1][1].append(piece)
+                else:
+                    turns.append([speaker, [piece]])
+                names.setdefault(speaker, name)
+                size += length
+                end = float(seg.get("end") or start)
+
+        if turns:
+            yield flush()
+
+    def iter_chunks(self, blocks: Iterable[str]) -> Iterator[str]:
+        """텍스트 블록을 점진적으로 분할하여 청크를 생성
+
+        버퍼가 STREAM_BUFFER_CHARS를 넘을 때마다 분할하고, 마지막 청크는
+        다음 블록과 이어 붙여 다시 분할하도록 버퍼에 남긴다.
+        분할된 청크는 앞뒤 공백이 제거되어 있으므로, 남길 때는 청크가 아니라
+        버퍼의 원문 꼬리(마지막 청크 시작 위치부터)를 남겨 블록 경계의 공백/줄바꿈을 보존한다.
+        """
+        buffer = ""
+        for block in blocks:
+            buffer += block
+            if len(buffer) < STREAM_BUFFER_CHARS:
+                continue
+            chunks = self.text_splitter.split_text(buffer)
+            if not chunks:
+                buffer = ""
+                continue
+            yield from chunks[:-1]
+            tail_start = buffer.rfind(chunks[-1])
+            buffer = buffer[tail_start:] if tail_start >= 0 else chunks[-1]
+
+        if buffer:
+            yield from self.text_splitter.split_text(buffer)
+
+    def update_folder(self, source_ids: List[str], folder_id: Optional[str]) -> int:
+        """이동한 세션/문서 청크의 folder_id 메타데이터 갱신 (갱신한 청크 수 반환)"""
+        if not source_ids:
+            return 0
+        found = self._collection.get(where=self._source_filter(source_ids), include=["metadatas"])
+        if not found["ids"]:
+            return 0
+        metadatas = [{**meta, "folder_id": folder_id or ""} for meta in found["metadatas"]]
+        self._collection.update(ids=found["ids"], metadatas=metadatas)
+        return len(found["ids"])
 
     def query(self, question: str, session_ids: list[str]) -> str:
         """RAG 기반 질문 답변 (다중 세션 지원)"""
+        return self.query_with_sources(question, session_ids)["answer"]
+
+    def query_with_sources(self, question: str, session_ids: list[str]) -> Dict[str, Any]:
+        """RAG 기반 질문 답변과 근거 청크 출처
+
+        반환: {"answer", "sources": [{"source_id", "source_type", "start", "end", "speakers"}]}
+        (start/end는 세그먼트 단위로 인덱싱된 녹취록 청크에만 있음)
+        """
         
         # 1. 문서/세션 ID가 없으면 일반 대화 모드
         if not session_ids:
@@ -119,21 +338,18 @@ class TranscriptRAG:
             질문: {question}
             답변:
             """
-            try:
-                response = self.llm.invoke(prompt)
-                return response.content
-            except Exception as e:
-                return f"오류가 발생했습니다: {e}"
+            return {"answer": self._invoke(prompt), "sources": []}
 
-        docs = []
-        
-        # 각 세션에서 관련 문서 검색
-        for session_id in session_ids:
-            vectorstore = self._get_vectorstore(session_id)
-            if vectorstore:
-                # 각 세션에서 상위 3개씩 검색 (세션이 많아지면 조절 필요)
-                session_docs = vectorstore.similarity_search(question, k=3)
-                docs.extend(session_docs)
+        # 선택된 세션/문서 전체를 대상으로 한 번의 필터 검색
+        try:
+            docs = self._get_store().similarity_search(
+                question,
+                k=min(QUERY_K_MAX, QUERY_K_PER_SOURCE * len(session_ids)),
+                filter=self._source_filter(session_ids)
+            )
+        except Exception as e:
+            print(f"벡터 검색 오류: {e}")
+            docs = []
 
         if not docs:
             # 검색 결과가 없으면 일반 답변 시도
@@ -143,19 +359,15 @@ class TranscriptRAG:
             질문: {question}
             답변:
             """
-            try:
-                response = self.llm.invoke(prompt)
-                return response.content
-            except Exception as e:
-                return f"오류가 발생했습니다: {e}"
+            return {"answer": self._invoke(prompt), "sources": []}
 
-        try:
-            # 컨텍스트 조합
-            context = "\n\n".join(doc.page_content for doc in docs)
+        # 컨텍스트 조합 (녹취록 청크는 시간/화자 머리글을 붙여 답변에서 시점을 언급할 수 있게 함)
+        context = "\n\n".join(self._context_block(doc.page_content, doc.metadata) for doc in docs)
 
-            prompt = f"""당신은 제공된 문서를 분석하는 AI 도우미입니다.
+        prompt = f"""당신은 제공된 문서를 분석하는 AI 도우미입니다.
 아래 제공된 여러 출처(회의록, 문서, 코드 등)의 내용을 기반으로 질문에 답변해주세요.
 내용이 여러 출처에 걸쳐 있다면, 이를 종합하여 설명해주세요.
+회의 녹취록을 근거로 할 때는 해당 시점을 [MM:SS] 형식으로 함께 적어주세요.
 답변은 정확하고 도움이 되어야 하며, 제공된 문맥에 없는 내용은 지어내지 마세요.
 한국어로 답변해주세요.
 
@@ -166,34 +378,121 @@ class TranscriptRAG:
 
 답변:"""
 
+        return {"answer": self._invoke(prompt), "sources": self._citations(docs)}
+
+    def _invoke(self, prompt: str) -> str:
+        try:
             response = self.llm.invoke(prompt)
             return response.content
-
         except Exception as e:
             return f"오류가 발생했습니다: {e}"
 
+    @staticmethod
+    def _context_block(text: str, metadata: Dict[str, Any]) -> str:
+        if "start" not in metadata:
+            return text
+        header = f"[{_format_time(metadata['start'])} - {_format_time(metadata.get('end', metadata['start']))}]"
+        if metadata.get("speakers"):
+            header += f" 화자: {metadata['speakers']}"
+        return f"{header}\n{text}"
+
+    @staticmethod
+    def _citations(docs: List[Any]) -> List[Dict[str, Any]]:
+        """검색된 청크의 출처 (같은 출처/시점은 한 번만, 검색 순위 순서)"""
+        citations: List[Dict[str, Any]] = []
+        seen = set()
+        for doc in docs:
+            meta = doc.metadata or {}
+            key = (meta.get("source_id"), meta.get("chunk"))
+            if key in seen or not meta.get("source_id"):
+                continue
+            seen.add(key)
+            citation = {"source_id": meta["source_id"], "source_type": meta.get("source_type") or "session"}
+            if "start" in meta:
+                citation.update(start=meta["start"], end=meta.get("end"), speakers=meta.get("speakers") or "")
+            citations.append(citation)
+        return citations
+
     def is_indexed(self, session_id: str) -> bool:
-        """세션이 인덱싱되어 있는지 확인"""
-        return self._get_persist_path(session_id).exists()
+        """세션/문서가 인덱싱되어 있는지 확인"""
+        return bool(self._collection.get(where={"source_id": session_id}, limit=1, include=[])["ids"])
+
+    def indexed_sources(self, source_ids: List[str]) -> Set[str]:
+        """인덱싱된 세션/문서 ID (한 번의 조회로 확인)"""
+        if not source_ids:
+            return set()
+        found = self._collection.get(where=self._source_filter(source_ids), include=[])
+        return {chunk_id.rsplit(":", 1)[0] for chunk_id in found["ids"]}
 
     def delete_index(self, session_id: str) -> bool:
-        """세션 인덱스 삭제"""
-        persist_path = self._get_persist_path(session_id)
+        """세션/문서 인덱스 삭제 (이전 버전의 세션별 디렉토리도 함께 삭제)"""
+        deleted = False
+        try:
+            found = self._collection.get(where={"source_id": session_id}, include=[])
+            if found["ids"]:
+                self._collection.delete(ids=found["ids"])
+                deleted = True
+        except Exception as e:
+            print(f"인덱스 삭제 오류: {e}")
 
-        if persist_path.exists():
-            shutil.rmtree(persist_path)
-            self._stores.pop(session_id, None)
-            return True
-        return False
+        legacy_path = self.persist_dir / f"{LEGACY_PREFIX}{session_id.replace('-', '_')}"
+        if legacy_path.exists():
+            shutil.rmtree(legacy_path)
+            deleted = True
+        return deleted
+
+    # ----- 이전 버전 인덱스 이전 -----
+
+    def migrate_legacy(self, metadata_for: Callable[[str], Optional[Dict[str, Any]]]) -> int:
+        """세션별 디렉토리의 청크를 임베딩 그대로 공유 컬렉션으로 옮기고 디렉토리 삭제
+
+        metadata_for(source_id): {"source_type", "folder_id"} (없는 세션/문서면 None → 건너뜀)
+        반환: 이전한 디렉토리 수
+        """
+        count = 0
+        for legacy_path in legacy_index_dirs(self.persist_dir):
+            # 세션/문서 ID는 UUID이므로 컬렉션 이름의 '_'를 '-'로 되돌림
+            source_id = legacy_path.name[len(LEGACY_PREFIX):].replace("_", "-")
+            metadata = metadata_for(source_id)
+            if metadata is None:
+                print(f"인덱스 이전 건너뜀 (출처 없음): {legacy_path.name}")
+                continue
+            try:
+                legacy = Chroma(
+                    collection_name=legacy_path.name,
+                    embedding_function=self.embeddings,
+                    persist_directory=str(legacy_path)
+                )
+                data = legacy._collection.get(include=["documents", "embeddings"])
+                if data["ids"]:
+                    base = self._base_metadata(source_id, metadata)
+                    numbers = range(len(data["ids"]))
+                    seen: Dict[str, int] = {}
+                    self.embeddings.seed(zip(data["documents"], data["embeddings"]))
+                    self._collection.upsert(
+                        ids=[self._chunk_id(source_id, doc or "", seen) for doc in data["documents"]],
+                        embeddings=data["embeddings"],
+                        documents=data["documents"],
+                        metadatas=[{**base, "chunk": n} for n in numbers]
+                    )
+                del legacy
+                shutil.rmtree(legacy_path)
+                count += 1
+            except Exception as e:
+                print(f"인덱스 이전 오류 ({legacy_path.name}): {e}")
+        return count
 
 
 # 싱글톤 인스턴스
 _rag_instance: Optional[TranscriptRAG] = None
+_rag_lock = threading.Lock()
 
 
 def get_rag() -> TranscriptRAG:
-    """RAG 인스턴스 가져오기 (싱글톤)"""
+    """RAG 인스턴스 가져오기 (싱글톤, 작업 풀/이전 스레드에서 동시에 불려도 한 번만 생성)"""
     global _rag_instance
     if _rag_instance is None:
-        _rag_instance = TranscriptRAG()
+        with _rag_lock:
+            if _rag_instance is None:
+                _rag_instance = TranscriptRAG()
     return _rag_instance
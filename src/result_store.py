@@ -0,0 +1,261 @@
+"""
+전사 결과 저장 형식 모듈
+세션 결과(result)를 교체 가능한 형식으로 저장하고, 기존 result.json은 읽을 때 새 형식으로 이전
+
+형식:
+- json: 기존 result.json (indent=2)
+- json.gz: 세그먼트를 열(column) 단위로 묶은 압축 JSON (표준 라이브러리만 사용)
+- msgpack.zst: 열 단위 MessagePack + zstd 압축 (msgpack, zstandard 설치 시)
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, ContextManager, Type
+
+try:
+    import msgpack
+    import zstandard
+except ImportError:
+    msgpack = None
+    zstandard = None
+
+# 모든 세그먼트에 공통으로 있는 키만 열로 묶고 나머지는 세그먼트별 extra로 보관
+_COLUMNAR_MARKER = "__columnar__"
+
+
+def to_columnar(result: Dict[str, Any]) -> Dict[str, Any]:
+    """segments를 {"columns": {키: [값...]}, "extra": [...]} 형태로 변환 (반복되는 키 제거)"""
+    segments = result.get("segments")
+    if not isinstance(segments, list) or not segments:
+        return dict(result)
+
+    common = set(segments[0])
+    for seg in segments[1:]:
+        common &= set(seg)
+    keys = [key for key in segments[0] if key in common]
+
+    extra = [{k: v for k, v in seg.items() if k not in common} or None for seg in segments]
+    packed = {k: v for k, v in result.items() if k != "segments"}
+    packed["segments"] = {
+        _COLUMNAR_MARKER: 1,
+        "count": len(segments),
+        "columns": {key: [seg[key] for seg in segments] for key in keys},
+        "extra": extra if any(extra) else None
+    }
+    return packed
+
+
+def from_columnar(packed: Dict[str, Any]) -> Dict[str, Any]:
+    """to_columnar의 역변환 (열 단위가 아니면 그대로 반환)"""
+    segments = packed.get("segments")
+    if not isinstance(segments, dict) or not segments.get(_COLUMNAR_MARKER):
+        return packed
+
+    columns = segments["columns"]
+    extra = segments.get("extra") or [None] * segments["count"]
+    result = {k: v for k, v in packed.items() if k != "segments"}
+    result["segments"] = [
+        {**{key: values[i] for key, values in columns.items()}, **(extra[i] or {})}
+        for i in range(segments["count"])
+    ]
+    return result
+
+
+class ResultCodec(ABC):
+    """결과 직렬화 형식 (dumps/loads를 구현하지 않은 코덱은 생성 시 TypeError)"""
+
+    name = ""
+    filename = ""
+    # 필요한 선택 패키지 (설치되지 않으면 available_codecs에서 빠짐)
+    requires: tuple = ()
+
+    @abstractmethod
+    def dumps(self, result: Dict[str, Any]) -> bytes:
+        ...
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Dict[str, Any]:
+        ...
+
+
+class JsonCodec(ResultCodec):
+    """기존 형식 (사람이 읽을 수 있는 JSON)"""
+
+    name = "json"
+    filename = "result.json"
+
+    def dumps(self, result: Dict[str, Any]) -> bytes:
+        return json.dumps(result, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def loads(self, data: bytes) -> Dict[str, Any]:
+        return json.loads(data.decode("utf-8"))
+
+
+class GzipJsonCodec(ResultCodec):
+    """열 단위 JSON + gzip"""
+
+    name = "json.gz"
+    filename = "result.json.gz"
+
+    def dumps(self, result: Dict[str, Any]) -> bytes:
+        raw = json.dumps(to_columnar(result), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return gzip.compress(raw, compresslevel=6, mtime=0)
+
+    def loads(self, data: bytes) -> Dict[str, Any]:
+        return from_columnar(json.loads(gzip.decompress(data).decode("utf-8")))
+
+
+class MsgpackZstdCodec(ResultCodec):
+    """열 단위 MessagePack + zstd"""
+
+    name = "msgpack.zst"
+    filename = "result.msgpack.zst"
+    requires = ("msgpack", "zstandard")
+
+    def dumps(self, result: Dict[str, Any]) -> bytes:
+        return zstandard.ZstdCompressor(level=10).compress(msgpack.packb(to_columnar(result), use_bin_type=True))
+
+    def loads(self, data: bytes) -> Dict[str, Any]:
+        return from_columnar(msgpack.unpackb(zstandard.ZstdDecompressor().decompress(data), raw=False))
+
+
+# 알려진 모든 형식 (읽을 수 없는 형식의 파일도 찾아서 오류를 낼 수 있도록)
+CODEC_TYPES: List[Type[ResultCodec]] = [JsonCodec, GzipJsonCodec, MsgpackZstdCodec]
+
+
+def available_codecs() -> Dict[str, ResultCodec]:
+    """사용 가능한 형식 (이름 -> 코덱)"""
+    codecs: List[ResultCodec] = [JsonCodec(), GzipJsonCodec()]
+    if msgpack is not None and zstandard is not None:
+        codecs.append(MsgpackZstdCodec())
+    return {codec.name: codec for codec in codecs}
+
+
+class CodecUnavailableError(RuntimeError):
+    """결과 파일은 있지만 읽는 데 필요한 패키지가 설치되지 않음"""
+
+
+class ResultStore:
+    """세션 디렉토리의 결과 파일 읽기/쓰기
+
+    읽기는 어느 형식이든 찾아서 읽고, 쓰기는 항상 선택된 형식으로 한다.
+    migrate=True이면 다른 형식으로 저장된 결과를 읽을 때 선택된 형식으로 다시 쓴다.
+    lock_for(session_dir)가 주어지면 변환은 그 잠금 안에서 한다 (세션 쓰기와 경쟁하지 않도록).
+    """
+
+    def __init__(self, format: str = GzipJsonCodec.name, migrate: bool = True,
+                 lock_for: Optional[Callable[[Path], ContextManager]] = None):
+        self.codecs = available_codecs()
+        if format not in self.codecs:
+            known = {codec_type.name: codec_type for codec_type in CODEC_TYPES}
+            if format in known:
+                raise CodecUnavailableError(
+                    f"결과 저장 형식 {format}에 필요한 패키지가 없습니다: {', '.join(known[format].requires)}"
+                )
+            raise ValueError(f"지원하지 않는 결과 저장 형식입니다: {format}")
+        self.codec = self.codecs[format]
+        self.migrate = migrate
+        self.lock_for = lock_for
+
+    def find(self, session_dir: Path) -> Optional[Path]:
+        """저장된 결과 파일 경로 (선택된 형식 우선, 읽을 수 없는 형식도 포함)"""
+        for filename in [self.codec.filename, *(codec_type.filename for codec_type in CODEC_TYPES)]:
+            path = Path(session_dir) / filename
+            if path.exists():
+                return path
+        return None
+
+    def exists(self, session_dir: Path) -> bool:
+        return self.find(session_dir) is not None
+
+    def _codec_for(self, path: Path) -> ResultCodec:
+        for codec_type in CODEC_TYPES:
+            if path.name != codec_type.filename:
+                continue
+            if codec_type.name not in self.codecs:
+                raise CodecUnavailableError(
+                    f"{path}을(를) 읽으려면 다음 패키지가 필요합니다: {', '.join(codec_type.requires)}"
+                )
+            return self.codecs[codec_type.name]
+        raise ValueError(f"알 수 없는 결과 파일 형식입니다: {path.name}")
+
+    def load(self, session_dir: Path) -> Optional[Dict[str, Any]]:
+        """결과 로드 (없으면 None)"""
+        path = self.find(session_dir)
+        if path is None:
+            return None
+        codec = self._codec_for(path)
+        result = codec.loads(path.read_bytes())
+        if self.migrate and codec is not self.codec:
+            try:
+                with self.lock_for(Path(session_dir)) if self.lock_for else nullcontext():
+                    # 잠금을 기다리는 동안 다른 쪽이 먼저 저장/변환했으면 그 결과를 덮어쓰지 않음
+                    if self.find(session_dir) == path:
+                        self.save(session_dir, result)
+            except Exception as e:
+                print(f"결과 형식 변환 실패 ({session_dir}): {e}")
+        return result
+
+    def save(self, session_dir: Path, result: Dict[str, Any]) -> Path:
+        """선택된 형식으로 원자적으로 저장하고 다른 형식 파일은 삭제"""
+        path = Path(session_dir) / self.codec.filename
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(self.codec.dumps(result))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        for codec in self.codecs.values():
+            if codec is not self.codec:
+                (Path(session_dir) / codec.filename).unlink(missing_ok=True)
+        return path
+
+    def migrate_all(self, sessions_dir: Path) -> int:
+        """모든 세션 결과를 선택된 형식으로 변환 (변환한 세션 수 반환)"""
+        count = 0
+        for session_dir in Path(sessions_dir).iterdir():
+            path = self.find(session_dir) if session_dir.is_dir() else None
+            if path is None or path.name == self.codec.filename:
+                continue
+            self.save(session_dir, self._codec_for(path).loads(path.read_bytes()))
+            count += 1
+        return count
+
+
+def benchmark(sessions_dir: Path, repeat: int = 3) -> List[Dict[str, Any]]:
+    """저장된 세션 결과로 형식별 크기와 로드 시간 비교
+
+    반환: [{"format", "sessions", "bytes", "load_ms"}] (load_ms는 전체 세션 1회 로드 시간의 최솟값)
+    """
+    reader = ResultStore(format="json", migrate=False)
+    results = []
+    for session_dir in sorted(Path(sessions_dir).iterdir()):
+        if session_dir.is_dir() and reader.exists(session_dir):
+            results.append(reader.load(session_dir))
+
+    report = []
+    for codec in available_codecs().values():
+        blobs = [codec.dumps(result) for result in results]
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for blob in blobs:
+                codec.loads(blob)
+            best = min(best, time.perf_counter() - start)
+        report.append({
+            "format": codec.name,
+            "sessions": len(blobs),
+            "bytes": sum(len(blob) for blob in blobs),
+            "load_ms": round(best * 1000, 2) if blobs else 0.0
+        })
+    return report
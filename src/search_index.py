@@ -0,0 +1,256 @@
+"""
+전문 검색 모듈
+전사 세그먼트와 문서 텍스트에 대한 로컬 역색인 (SQLite)
+한글/한자/가나는 문자 n-gram, 그 외는 단어 단위로 토큰화
+"""
+
+import math
+import re
+import sqlite3
+import unicodedata
+from collections import Counter, defaultdict
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Iterable, Iterator, Optional
+
+# 스키마 변경 시 증가 (불일치하면 새로 생성 후 재색인 필요)
+SCHEMA_VERSION = 1
+
+# 문서 텍스트를 나누는 검색 단위(문단) 최대 길이
+DOCUMENT_PASSAGE_CHARS = 500
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+_CJK_PATTERN = re.compile(r"[ᄀ-ᇿ㄰-㆏가-힣぀-ヿ㐀-䶿一-鿿]")
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def _iter_runs(word: str) -> Iterator[tuple]:
+    """단어를 (CJK 여부, 부분 문자열) 구간으로 분리 (예: 'gpt모델' -> gpt / 모델)"""
+    start = 0
+    for i in range(1, len(word) + 1):
+        if i == len(word) or bool(_CJK_PATTERN.match(word[i])) != bool(_CJK_PATTERN.match(word[start])):
+            yield bool(_CJK_PATTERN.match(word[start])), word[start:i]
+            start = i
+
+
+def tokenize(text: str, for_query: bool = False) -> List[str]:
+    """검색 토큰 생성
+
+    CJK 구간은 문자 bigram(색인 시 unigram도 함께), 그 외는 단어 그대로 사용한다.
+    질의는 한 글자 구간만 unigram으로 검색하고 나머지는 bigram만 사용한다.
+    """
+    tokens = []
+    for word in _WORD_PATTERN.findall(_normalize(text)):
+        for is_cjk, run in _iter_runs(word):
+            if not is_cjk:
+                tokens.append(run)
+                continue
+            if len(run) == 1 or not for_query:
+                tokens.extend(run)
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+class SearchIndex:
+    """세그먼트/문서 문단 단위 역색인"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.is_new = not self._has_schema()
+        if self.is_new:
+            self._create_schema()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """트랜잭션 단위 연결 (정상 종료 시 커밋, 예외 시 롤백)"""
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            conn.row_factory = sqlite3.Row
+            with conn:
+                yield conn
+
+    def _has_schema(self) -> bool:
+        if not self.db_path.exists():
+            return False
+        with self._connect() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+    def _create_schema(self) -> None:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(f"""
+                DROP TABLE IF EXISTS postings;
+                DROP TABLE IF EXISTS entries;
+                CREATE TABLE entries (
+                    id INTEGER PRIMARY KEY,
+                    source_type TEXT NOT NULL,
+                    source_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    start_ms INTEGER,
+                    end_ms INTEGER,
+                    speaker TEXT,
+                    text TEXT NOT NULL,
+                    length INTEGER NOT NULL,
+                    UNIQUE (source_type, source_id, position)
+                );
+                CREATE TABLE postings (
+                    term TEXT NOT NULL,
+                    entry_id INTEGER NOT NULL,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (term, entry_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX idx_postings_entry ON postings (entry_id);
+                PRAGMA user_version = {SCHEMA_VERSION};
+            """)
+
+    # ----- 색인 -----
+
+    def _insert_entry(self, conn: sqlite3.Connection, source_type: str, source_id: str, position: int,
+                      text: str, start_ms: Optional[int] = None, end_ms: Optional[int] = None,
+                      speaker: Optional[str] = None) -> None:
+        tokens = tokenize(text)
+        cursor = conn.execute(
+            "INSERT INTO entries (source_type, source_id, position, start_ms, end_ms, speaker, text, length) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (source_type, source_id, position, start_ms, end_ms, speaker, text, len(tokens))
+        )
+        conn.executemany(
+            "INSERT INTO postings (term, entry_id, tf) VALUES (?, ?, ?)",
+            [(term, cursor.lastrowid, tf) for term, tf in Counter(tokens).items()]
+        )
+
+    def _delete_entries(self, conn: sqlite3.Connection, where: str, params: tuple) -> None:
+        conn.execute(f"DELETE FROM postings WHERE entry_id IN (SELECT id FROM entries WHERE {where})", params)
+        conn.execute(f"DELETE FROM entries WHERE {where}", params)
+
+    @staticmethod
+    def _to_ms(seconds: Optional[float]) -> Optional[int]:
+        return int(round(seconds * 1000)) if seconds is not None else None
+
+    def index_segments(self, session_id: str, segments: List[Dict[str, Any]]) -> None:
+        """세션의 세그먼트 전체를 (재)색인"""
+        with self._connect() as conn:
+            self._delete_entries(conn, "source_type = 'session' AND source_id = ?", (session_id,))
+            for i, seg in enumerate(segments):
+                self._insert_entry(
+                    conn, "session", session_id, i, seg.get("text", ""),
+                    self._to_ms(seg.get("start")), self._to_ms(seg.get("end")),
+                    seg.get("speaker_id") or seg.get("speaker")
+                )
+
+    def update_segment(self, session_id: str, index: int, text: Optional[str] = None,
+                       speaker: Optional[str] = None) -> None:
+        """세그먼트 하나의 텍스트/화자만 갱신 (None인 필드와 시간 정보는 유지)"""
+        where = "source_type = 'session' AND source_id = ? AND position = ?"
+        with self._connect() as conn:
+            if text is None:
+                # 화자만 바뀐 경우 토큰은 그대로이므로 행만 갱신
+                if speaker is not None:
+                    conn.execute(f"UPDATE entries SET speaker = ? WHERE {where}", (speaker or None, session_id, index))
+                return
+            row = conn.execute(f"SELECT start_ms, end_ms, speaker FROM entries WHERE {where}",
+                               (session_id, index)).fetchone()
+            if speaker is None:
+                speaker = row["speaker"] if row else None
+            self._delete_entries(conn, where, (session_id, index))
+            self._insert_entry(
+                conn, "session", session_id, index, text,
+                row["start_ms"] if row else None, row["end_ms"] if row else None, speaker or None
+            )
+
+    def index_document(self, doc_id: str, blocks: Iterable[str]) -> None:
+        """문서 텍스트를 문단 단위로 나누어 (재)색인 (블록 스트림을 한 번만 소비)"""
+        with self._connect() as conn:
+            self._delete_entries(conn, "source_type = 'document' AND source_id = ?", (doc_id,))
+            for position, passage in enumerate(self._iter_passages(blocks)):
+                self._insert_entry(conn, "document", doc_id, position, passage)
+
+    @staticmethod
+    def _iter_passages(blocks: Iterable[str]) -> Iterator[str]:
+        """줄 경계를 우선하여 DOCUMENT_PASSAGE_CHARS 이하의 문단으로 분할"""
+        buffer = ""
+        for block in blocks:
+            buffer += block
+            while len(buffer) >= DOCUMENT_PASSAGE_CHARS:
+                cut = buffer.rfind("\n", 0, DOCUMENT_PASSAGE_CHARS)
+                if cut <= 0:
+                    cut = DOCUMENT_PASSAGE_CHARS
+                passage, buffer = buffer[:cut].strip(), buffer[cut:]
+                if passage:
+                    yield passage
+        if buffer.strip():
+            yield buffer.strip()
+
+    def remove(self, source_type: str, source_id: str) -> None:
+        """세션/문서의 색인 삭제"""
+        with self._connect() as conn:
+            self._delete_entries(conn, "source_type = ? AND source_id = ?", (source_type, source_id))
+
+    # ----- 검색 -----
+
+    def search(self, query: str, limit: int = 20, source_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """질의의 모든 토큰을 포함하는 항목을 BM25 점수순으로 반환"""
+        terms = list(dict.fromkeys(tokenize(query, for_query=True)))
+        if not terms:
+            return []
+
+        placeholders = ",".join("?" * len(terms))
+        with self._connect() as conn:
+            total, avg_length = conn.execute("SELECT COUNT(*), AVG(length) FROM entries").fetchone()
+            if not total:
+                return []
+            doc_freq = dict(conn.execute(
+                f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term", terms
+            ).fetchall())
+            if len(doc_freq) < len(terms):
+                return []  # 어떤 항목에도 없는 토큰이 있으면 결과 없음
+
+            matches: Dict[int, Dict[str, int]] = defaultdict(dict)
+            for term, entry_id, tf in conn.execute(
+                f"SELECT term, entry_id, tf FROM postings WHERE term IN ({placeholders})", terms
+            ):
+                matches[entry_id][term] = tf
+            candidates = [entry_id for entry_id, tfs in matches.items() if len(tfs) == len(terms)]
+            if not candidates:
+                return []
+
+            rows = {}
+            for i in range(0, len(candidates), 500):
+                batch = candidates[i:i + 500]
+                sql = f"SELECT * FROM entries WHERE id IN ({','.join('?' * len(batch))})"
+                params: list = list(batch)
+                if source_type:
+                    sql += " AND source_type = ?"
+                    params.append(source_type)
+                rows.update((row["id"], row) for row in conn.execute(sql, params))
+
+        scored = []
+        for entry_id, row in rows.items():
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * row["length"] / (avg_length or 1))
+            score = 0.0
+            for term, tf in matches[entry_id].items():
+                idf = math.log(1 + (total - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            scored.append((score, row))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [
+            {
+                "source_type": row["source_type"],
+                "source_id": row["source_id"],
+                "segment_index": row["position"],
+                "start_ms": row["start_ms"],
+                "end_ms": row["end_ms"],
+                "speaker": row["speaker"],
+                "text": row["text"],
+                "score": round(score, 4)
+            }
+            for score, row in scored[:limit]
+        ]
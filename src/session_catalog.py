@@ -0,0 +1,105 @@
+"""
+세션 카탈로그 모듈
+세션 메타데이터를 SQLite에 색인하여 목록 조회를 쿼리 한 번으로 처리
+"""
+
+import json
+import sqlite3
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Iterable, Iterator, Optional
+
+# 스키마 변경 시 증가 (불일치하면 디스크에서 재구축)
+SCHEMA_VERSION = 1
+
+
+class SessionCatalog:
+    """세션 메타데이터 카탈로그 (metadata.json의 색인 사본)"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.is_new = not self._has_schema()
+        if self.is_new:
+            self._create_schema()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """트랜잭션 단위 연결 (정상 종료 시 커밋, 예외 시 롤백)"""
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            conn.row_factory = sqlite3.Row
+            with conn:
+                yield conn
+
+    def _has_schema(self) -> bool:
+        if not self.db_path.exists():
+            return False
+        with self._connect() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+    def _create_schema(self) -> None:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(f"""
+                DROP TABLE IF EXISTS sessions;
+                CREATE TABLE sessions (
+                    id TEXT PRIMARY KEY,
+                    title TEXT,
+                    created_at TEXT,
+                    folder_id TEXT,
+                    metadata TEXT NOT NULL
+                );
+                CREATE INDEX idx_sessions_created ON sessions (created_at DESC);
+                CREATE INDEX idx_sessions_folder ON sessions (folder_id, created_at DESC);
+                PRAGMA user_version = {SCHEMA_VERSION};
+            """)
+
+    @staticmethod
+    def _row_values(metadata: Dict[str, Any]) -> tuple:
+        return (
+            metadata["id"],
+            metadata.get("title"),
+            metadata.get("created_at", ""),
+            metadata.get("folder_id"),
+            json.dumps(metadata, ensure_ascii=False)
+        )
+
+    def upsert(self, metadata: Dict[str, Any]) -> None:
+        """세션 메타데이터 추가/갱신"""
+        self.upsert_many([metadata])
+
+    def upsert_many(self, metadatas: Iterable[Dict[str, Any]]) -> None:
+        """여러 세션 메타데이터를 한 트랜잭션으로 추가/갱신"""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sessions (id, title, created_at, folder_id, metadata) VALUES (?, ?, ?, ?, ?)",
+                [self._row_values(m) for m in metadatas]
+            )
+
+    def remove(self, session_id: str) -> None:
+        """세션 제거"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """세션 메타데이터 조회"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT metadata FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return json.loads(row["metadata"]) if row else None
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        """세션 목록 (최신순)"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT metadata FROM sessions ORDER BY created_at DESC").fetchall()
+        return [json.loads(row["metadata"]) for row in rows]
+
+    def rebuild(self, metadatas: Iterable[Dict[str, Any]]) -> int:
+        """카탈로그 전체를 주어진 메타데이터로 재구축"""
+        rows = [self._row_values(m) for m in metadatas]
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions")
+            conn.executemany(
+                "INSERT OR REPLACE INTO sessions (id, title, created_at, folder_id, metadata) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
@@ -4,39 +4,105 @@
 """
 
 import json
+import os
 import shutil
+import threading
 import uuid
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple, Dict, Any, List
 
-from .config import SESSIONS_DIR
+from .audio_store import AudioStore
+from .config import SESSIONS_DIR, AUDIO_STORE_DIR, RESULT_FORMAT
+from .result_store import ResultStore
+from .search_index import SearchIndex
+from .session_catalog import SessionCatalog
+from .structure_index import StructureIndex
+
+# 세그먼트 편집 저널 설정
+EDITABLE_SEGMENT_FIELDS = ("speaker", "text")
+# 마지막 편집 후 이 시간(초) 동안 추가 편집이 없으면 결과 파일로 병합
+COMPACT_DELAY = 5.0
+# 미병합 편집이 이 개수를 넘으면 즉시 병합
+COMPACT_MAX_PENDING = 200
+
+# 화자 표시 색상 (화자 테이블에 등록된 순서대로 배정)
+SPEAKER_COLORS = [
+    "#e94560", "#6366f1", "#10b981", "#f59e0b", "#ec4899",
+    "#8b5cf6", "#14b8a6", "#f97316", "#06b6d4", "#84cc16"
+]
 
 
 
 class SessionManager:
     """회의 세션 관리"""
 
-    def __init__(self, base_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        base_dir: Optional[Path] = None,
+        search_index: Optional[SearchIndex] = None,
+        structure_index: Optional[StructureIndex] = None,
+        audio_store: Optional[AudioStore] = None
+    ):
         self.base_dir = Path(base_dir) if base_dir else SESSIONS_DIR
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.search_index = search_index
+        self.structure_index = structure_index
+        # 세션 오디오는 내용 해시 기준으로 한 번만 저장 (metadata.json의 audio_sha256으로 참조)
+        self.audio_store = audio_store or AudioStore(AUDIO_STORE_DIR)
+        # 세션별 편집 저널 잠금 / 병합 예약 타이머 / 미병합 편집 수
+        self._locks: Dict[str, threading.RLock] = {}
+        self._segment_counts: Dict[str, int] = {}
+        self._locks_guard = threading.Lock()
+        self._compact_timers: Dict[str, threading.Timer] = {}
+        self._pending_edits: Dict[str, int] = {}
+        # 전사 결과 파일 (기존 result.json은 읽을 때 설정된 형식으로 변환)
+        self.results = ResultStore(RESULT_FORMAT, lock_for=lambda session_dir: self._get_lock(session_dir.name))
+
+        # 세션 목록 조회용 카탈로그 (없거나 스키마가 바뀌면 디스크에서 재구축)
+        self.catalog = SessionCatalog(self.base_dir / "catalog.db")
+        if self.catalog.is_new:
+            self.rebuild_catalog()
 
     def update_folder(self, session_id: str, folder_id: Optional[str]) -> bool:
         """세션의 폴더 이동"""
-        session_dir = self._get_session_dir(session_id)
-        meta_path = session_dir / "metadata.json"
-        
-        if not meta_path.exists():
-            return False
-            
-        try:
-            meta = self._load_json(meta_path)
-            meta["folder_id"] = folder_id if folder_id != "root" else None
-            self._save_json(meta_path, meta)
-            return True
-        except Exception as e:
-            print(f"Error updating session folder: {e}")
-            return False
+        return bool(self.update_folders([session_id], folder_id))
+
+    def update_folders(self, session_ids: List[str], folder_id: Optional[str]) -> List[str]:
+        """여러 세션의 폴더 이동 (카탈로그는 한 트랜잭션으로 갱신, 이동된 세션 ID 반환)"""
+        moved = []
+        for session_id in session_ids:
+            meta_path = self._get_session_dir(session_id) / "metadata.json"
+            if not meta_path.exists():
+                continue
+            try:
+                meta = self._load_json(meta_path)
+                meta["folder_id"] = folder_id if folder_id != "root" else None
+                self._save_json_atomic(meta_path, meta)
+                moved.append(meta)
+            except Exception as e:
+                print(f"Error updating session folder: {e}")
+
+        if moved:
+            self.catalog.upsert_many(moved)
+            self._publish(moved)
+        return [meta["id"] for meta in moved]
+
+    @staticmethod
+    def structure_entry(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """라이브러리 트리에 표시할 세션 요약"""
+        return {
+            "id": metadata.get("id"),
+            "title": metadata.get("title", "무제"),
+            "date": metadata.get("created_at", ""),
+            "folder_id": metadata.get("folder_id")
+        }
+
+    def _publish(self, metadatas: List[Dict[str, Any]]) -> None:
+        """구조 색인에 변경 반영"""
+        if self.structure_index:
+            self.structure_index.upsert_many("session", [self.structure_entry(m) for m in metadatas])
 
     def _get_session_dir(self, session_id: str) -> Path:
         return self.base_dir / session_id
@@ -49,23 +115,48 @@ class SessionManager:
         with open(path, "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
 
+    def _save_json_atomic(self, path: Path, data: Dict[str, Any]) -> None:
+        """임시 파일에 쓴 뒤 교체 (쓰기 도중 중단되어도 기존 파일 보존)"""
+        tmp_path = path.with_name(path.name + ".tmp")
+        self._save_json(tmp_path, data)
+        os.replace(tmp_path, path)
+
+    def _save_metadata(self, session_id: str, metadata: Dict[str, Any]) -> None:
+        """metadata.json 저장 후 카탈로그 반영"""
+        self._save_json_atomic(self._get_session_dir(session_id) / "metadata.json", metadata)
+        self.catalog.upsert(metadata)
+        self._publish([metadata])
+
+    def rebuild_catalog(self) -> int:
+        """디스크의 metadata.json으로 카탈로그 재구축"""
+        def iter_metadata():
+            for meta_path in self.base_dir.glob("*/metadata.json"):
+                try:
+                    yield self._load_json(meta_path)
+                except Exception as e:
+                    print(f"세션 메타데이터 로드 오류: {e}")
+
+        return self.catalog.rebuild(iter_metadata())
+
     def create_session(
         self,
         audio_path: str,
         title: str,
         participants: str,
         agenda: str,
-        language: str
+        language: str,
+        move_audio: bool = False
     ) -> Tuple[str, Dict[str, Any]]:
-        """새 세션 생성"""
+        """새 세션 생성
+
+        오디오는 저장소에 등록만 한다 (같은 내용이면 재사용, move_audio=True이면 원본을 옮김).
+        """
         session_id = str(uuid.uuid4())
         session_dir = self._get_session_dir(session_id)
         session_dir.mkdir(parents=True, exist_ok=True)
 
-        # 오디오 파일 복사
         src_path = Path(audio_path)
-        dest_path = session_dir / f"audio{src_path.suffix}"
-        shutil.copy2(src_path, dest_path)
+        audio_hash, _ = self.audio_store.add(src_path, session_id, move=move_audio)
 
         # 메타데이터 저장
         metadata = {
@@ -75,9 +166,10 @@ class SessionManager:
             "agenda": agenda,
             "language": language,
             "created_at": datetime.now().isoformat(),
-            "audio_file": dest_path.name
+            "audio_file": f"audio{src_path.suffix.lower()}",
+            "audio_sha256": audio_hash
         }
-        self._save_json(session_dir / "metadata.json", metadata)
+        self._save_metadata(session_id, metadata)
 
         return session_id, metadata
 
@@ -87,10 +179,13 @@ class SessionManager:
         result: Dict[str, Any],
         title: str = "",
         participants: str = "",
-        agenda: str = ""
+        agenda: str = "",
+        move_audio: bool = False
     ) -> str:
         """세션 생성 및 전사 결과 저장"""
-        session_id, _ = self.create_session(audio_path, title, participants, agenda, result.get("language", "ko"))
+        session_id, _ = self.create_session(
+            audio_path, title, participants, agenda, result.get("language", "ko"), move_audio=move_audio
+        )
         self.save_result(session_id, result)
         return session_id
 
@@ -99,19 +194,28 @@ class SessionManager:
         session_dir = self._get_session_dir(session_id)
         if not session_dir.exists():
             raise ValueError(f"세션을 찾을 수 없습니다: {session_id}")
-        self._save_json(session_dir / "result.json", result)
+        with self._get_lock(session_id):
+            # 전체 결과를 새로 쓰므로 미병합 편집은 폐기
+            self._cancel_compaction(session_id)
+
+            # load_session이 돌려준 결과(표시 이름 + speaker_id)도 화자 ID 기준으로 저장
+            previous = self._read_speaker_table(session_id) or {}
+            for seg in result.get("segments", []):
+                speaker_id = seg.pop("speaker_id", None)
+                if speaker_id:
+                    seg["speaker"] = speaker_id
+
+            self.results.save(session_dir, result)
+            self._get_journal_path(session_id).unlink(missing_ok=True)
+            self._save_speaker_table(session_id, self._build_speaker_table(result.get("segments", []), previous))
+            self._segment_counts[session_id] = len(result.get("segments", []))
+
+        if self.search_index:
+            self.search_index.index_segments(session_id, result.get("segments", []))
 
     def list_sessions(self) -> List[Dict[str, Any]]:
         """세션 목록 조회 (최신순)"""
-        sessions = []
-        for meta_path in self.base_dir.glob("*/metadata.json"):
-            try:
-                sessions.append(self._load_json(meta_path))
-            except Exception as e:
-                print(f"세션 메타데이터 로드 오류: {e}")
-
-        sessions.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        return sessions
+        return self.catalog.list_sessions()
 
     def load_session(self, session_id: str) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], Optional[str]]:
         """세션 상세 정보 로드"""
@@ -119,13 +223,56 @@ class SessionManager:
         metadata = self._load_json(session_dir / "metadata.json")
 
         result = None
-        result_path = session_dir / "result.json"
-        if result_path.exists():
-            result = self._load_json(result_path)
-
-        audio_path = str((session_dir / metadata["audio_file"]).resolve())
+        if self.results.exists(session_dir):
+            with self._get_lock(session_id):
+                result = self.results.load(session_dir)
+                self._apply_edits(result, self._read_journal(session_id))
+                table = self._get_speaker_table(session_id, result)
+            self._segment_counts[session_id] = len(result.get("segments", []))
+
+            # 세그먼트의 화자 ID를 표시 이름으로 변환 (ID는 speaker_id로 유지)
+            for seg in result.get("segments", []):
+                speaker_id = seg.get("speaker")
+                if speaker_id:
+                    seg["speaker_id"] = speaker_id
+                    seg["speaker"] = table.get(speaker_id, {}).get("name", speaker_id)
+
+        return metadata, result, str(self._get_audio_path(session_dir, metadata).resolve())
+
+    def _get_audio_path(self, session_dir: Path, metadata: Dict[str, Any]) -> Path:
+        """세션 오디오 경로 (저장소 blob, 이전 세션은 세션 디렉토리의 파일)"""
+        audio_hash = metadata.get("audio_sha256")
+        if audio_hash:
+            blob_path = self.audio_store.path_for(audio_hash)
+            if blob_path:
+                return blob_path
+        return session_dir / metadata["audio_file"]
+
+    def migrate_audio(self) -> int:
+        """세션 디렉토리에 복사된 이전 오디오를 저장소로 이동 (이동한 세션 수 반환)"""
+        count = 0
+        for metadata in self.list_sessions():
+            if metadata.get("audio_sha256"):
+                continue
+            session_id = metadata["id"]
+            audio_path = self._get_session_dir(session_id) / metadata.get("audio_file", "")
+            if not audio_path.is_file():
+                continue
+            try:
+                metadata["audio_sha256"], _ = self.audio_store.add(audio_path, session_id, move=True)
+                self._save_metadata(session_id, metadata)
+                count += 1
+            except Exception as e:
+                print(f"오디오 이전 오류 ({session_id}): {e}")
+        return count
 
-        return metadata, result, audio_path
+    def audio_references(self) -> Dict[str, List[str]]:
+        """오디오 해시별 참조 세션 ID (저장소 참조 복구용)"""
+        refs: Dict[str, List[str]] = {}
+        for metadata in self.list_sessions():
+            if metadata.get("audio_sha256"):
+                refs.setdefault(metadata["audio_sha256"], []).append(metadata["id"])
+        return refs
 
     def update_session_title(self, session_id: str, new_title: str) -> None:
         """세션 제목 수정"""
@@ -133,34 +280,278 @@ class SessionManager:
         meta_path = session_dir / "metadata.json"
         metadata = self._load_json(meta_path)
         metadata["title"] = new_title
-        self._save_json(meta_path, metadata)
+        self._save_metadata(session_id, metadata)
 
     def update_speaker_name(self, session_id: str, old_name: str, new_name: str) -> bool:
-        """화자 이름 변경"""
+        """화자 이름 변경 (화자 테이블만 수정, 세그먼트는 그대로)"""
+        if not self.results.exists(self._get_session_dir(session_id)):
+            return False
+
+        with self._get_lock(session_id):
+            table = self._get_speaker_table(session_id)
+            updated = False
+            for info in table.values():
+                if info["name"] == old_name:
+                    info["name"] = new_name
+                    updated = True
+
+            if updated:
+                self._save_speaker_table(session_id, table)
+
+        return updated
+
+    def get_speakers(self, session_id: str) -> List[Dict[str, Any]]:
+        """화자 목록 (ID, 표시 이름, 색상, 발화 시간/세그먼트 수)"""
+        with self._get_lock(session_id):
+            table = self._get_speaker_table(session_id)
+        return [{"id": speaker_id, **info} for speaker_id, info in table.items()]
+
+    def load_summary(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """저장된 회의 요약 (없으면 None)"""
+        summary_path = self._get_session_dir(session_id) / "summary.json"
+        if not summary_path.exists():
+            return None
+        return self._load_json(summary_path)
+
+    def save_summary(self, session_id: str, summary: Dict[str, Any]) -> None:
+        """회의 요약 저장 ({"summary", "action_items", "model", ...})"""
         session_dir = self._get_session_dir(session_id)
-        result_path = session_dir / "result.json"
+        if not session_dir.exists():
+            raise ValueError(f"세션을 찾을 수 없습니다: {session_id}")
+        self._save_json_atomic(session_dir / "summary.json", {**summary, "created_at": datetime.now().isoformat()})
+
+    # ----- 화자 테이블 -----
+
+    def _get_speakers_path(self, session_id: str) -> Path:
+        return self._get_session_dir(session_id) / "speakers.json"
+
+    def _read_speaker_table(self, session_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        speakers_path = self._get_speakers_path(session_id)
+        if not speakers_path.exists():
+            return None
+        return self._load_json(speakers_path).get("speakers", {})
+
+    def _save_speaker_table(self, session_id: str, table: Dict[str, Dict[str, Any]]) -> None:
+        self._save_json_atomic(self._get_speakers_path(session_id), {"speakers": table})
+
+    def _get_speaker_table(self, session_id: str, result: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """화자 테이블 로드 (기존 세션은 세그먼트에서 최초 1회 생성)"""
+        table = self._read_speaker_table(session_id)
+        if table is None:
+            if result is None:
+                result = self.results.load(self._get_session_dir(session_id)) or {}
+                self._apply_edits(result, self._read_journal(session_id))
+            table = self._build_speaker_table(result.get("segments", []))
+            self._save_speaker_table(session_id, table)
+        return table
+
+    @staticmethod
+    def _build_speaker_table(
+        segments: List[Dict[str, Any]],
+        previous: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """세그먼트의 화자 ID로 테이블 생성 (이전 테이블의 이름/색상은 유지)"""
+        previous = previous or {}
+        table: Dict[str, Dict[str, Any]] = {}
+        for seg in segments:
+            speaker_id = seg.get("speaker")
+            if not speaker_id:
+                continue
+            if speaker_id not in table:
+                prev = previous.get(speaker_id, {})
+                table[speaker_id] = {
+                    "name": prev.get("name", speaker_id),
+                    "color": prev.get("color", SPEAKER_COLORS[len(table) % len(SPEAKER_COLORS)]),
+                    "talk_time": 0.0,
+                    "segment_count": 0
+                }
+            info = table[speaker_id]
+            info["talk_time"] += max(0.0, (seg.get("end") or 0) - (seg.get("start") or 0))
+            info["segment_count"] += 1
+
+        # 세그먼트가 모두 다른 화자로 바뀌어도 이름을 붙인 화자는 유지
+        for speaker_id, prev in previous.items():
+            if speaker_id not in table:
+                table[speaker_id] = {**prev, "talk_time": 0.0, "segment_count": 0}
+
+        for info in table.values():
+            info["talk_time"] = round(info["talk_time"], 3)
+        return table
+
+    def _resolve_speaker_id(self, session_id: str, table: Dict[str, Dict[str, Any]], name: str) -> str:
+        """표시 이름에 해당하는 화자 ID (없으면 새 화자로 등록)"""
+        for speaker_id, info in table.items():
+            if info["name"] == name:
+                return speaker_id
+
+        speaker_id, n = name, 1
+        while speaker_id in table:
+            speaker_id, n = f"{name}_{n}", n + 1
+        table[speaker_id] = {
+            "name": name,
+            "color": SPEAKER_COLORS[len(table) % len(SPEAKER_COLORS)],
+            "talk_time": 0.0,
+            "segment_count": 0
+        }
+        self._save_speaker_table(session_id, table)
+        return speaker_id
 
-        if not result_path.exists():
-            return False
+    # ----- 세그먼트 편집 저널 -----
+
+    def _get_lock(self, session_id: str) -> threading.RLock:
+        with self._locks_guard:
+            return self._locks.setdefault(session_id, threading.RLock())
 
-        result = self._load_json(result_path)
-        updated = False
+    def _get_journal_path(self, session_id: str) -> Path:
+        return self._get_session_dir(session_id) / "edits.jsonl"
 
-        for seg in result.get("segments", []):
-            if seg.get("speaker") == old_name:
-                seg["speaker"] = new_name
-                updated = True
+    def _read_journal(self, session_id: str) -> List[Dict[str, Any]]:
+        journal_path = self._get_journal_path(session_id)
+        if not journal_path.exists():
+            return []
+        edits = []
+        with open(journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    edits.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 중단된 쓰기로 잘린 마지막 줄은 무시
+                    pass
+        return edits
+
+    @staticmethod
+    def _apply_edits(result: Dict[str, Any], edits: List[Dict[str, Any]]) -> None:
+        segments = result.get("segments", [])
+        for edit in edits:
+            index = edit.get("index")
+            if isinstance(index, int) and 0 <= index < len(segments):
+                segments[index][edit["field"]] = edit["value"]
+
+    def append_segment_edits(self, session_id: str, edits: List[Dict[str, Any]]) -> int:
+        """세그먼트 편집을 저널에 추가 (결과 파일에는 백그라운드에서 병합)
+
+        edits: [{"index": int, "field": "speaker"|"text", "value": str}, ...]
+        """
+        metadata_path = self._get_session_dir(session_id) / "metadata.json"
+        if not metadata_path.exists():
+            raise ValueError(f"세션을 찾을 수 없습니다: {session_id}")
 
-        if updated:
-            self._save_json(result_path, result)
+        segment_count = self._get_segment_count(session_id)
+        for edit in edits:
+            index, field = edit.get("index"), edit.get("field")
+            if not isinstance(index, int) or not 0 <= index < segment_count:
+                raise ValueError(f"잘못된 세그먼트 인덱스: {index}")
+            if field not in EDITABLE_SEGMENT_FIELDS:
+                raise ValueError(f"잘못된 필드: {field}")
+
+        if not edits:
+            return 0
+
+        with self._get_lock(session_id):
+            # 화자 편집은 표시 이름을 화자 ID로 바꿔 기록
+            table = self._get_speaker_table(session_id) if any(e["field"] == "speaker" for e in edits) else {}
+            lines = []
+            # 검색 색인 반영용: 세그먼트별 최종 값 (화자는 ID 기준)
+            updates: Dict[int, Dict[str, str]] = {}
+            for edit in edits:
+                value = str(edit.get("value", ""))
+                if edit["field"] == "speaker" and value:
+                    value = self._resolve_speaker_id(session_id, table, value)
+                updates.setdefault(edit["index"], {})[edit["field"]] = value
+                entry = {"index": edit["index"], "field": edit["field"], "value": value,
+                         "ts": datetime.now().isoformat()}
+                lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+            data = "".join(lines).encode("utf-8")
+
+            # O_APPEND + 단일 write 호출로 배치 전체를 원자적으로 추가
+            fd = os.open(self._get_journal_path(session_id), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._pending_edits[session_id] = self._pending_edits.get(session_id, 0) + len(lines)
+            pending = self._pending_edits[session_id]
+
+        self._schedule_compaction(session_id, 0 if pending >= COMPACT_MAX_PENDING else COMPACT_DELAY)
+
+        if self.search_index:
+            for index, fields in updates.items():
+                self.search_index.update_segment(session_id, index, fields.get("text"), fields.get("speaker"))
+        return len(lines)
+
+    def _get_segment_count(self, session_id: str) -> int:
+        """세그먼트 수 (편집으로 바뀌지 않으므로 캐시)"""
+        if session_id not in self._segment_counts:
+            result = self.results.load(self._get_session_dir(session_id))
+            if result is None:
+                return 0
+            self._segment_counts[session_id] = len(result.get("segments", []))
+        return self._segment_counts[session_id]
+
+    def _schedule_compaction(self, session_id: str, delay: float) -> None:
+        """병합 예약 (기존 예약은 취소하고 다시 예약: 편집이 멈추면 한 번만 병합)"""
+        with self._locks_guard:
+            timer = self._compact_timers.pop(session_id, None)
+            if timer:
+                timer.cancel()
+            timer = threading.Timer(delay, self._run_compaction, args=(session_id,))
+            timer.daemon = True
+            self._compact_timers[session_id] = timer
+            timer.start()
+
+    def _cancel_compaction(self, session_id: str) -> None:
+        with self._locks_guard:
+            timer = self._compact_timers.pop(session_id, None)
+        if timer:
+            timer.cancel()
+        self._pending_edits.pop(session_id, None)
+
+    def _run_compaction(self, session_id: str) -> None:
+        with self._locks_guard:
+            self._compact_timers.pop(session_id, None)
+        try:
+            self.compact_edits(session_id)
+        except Exception as e:
+            print(f"편집 저널 병합 오류 ({session_id}): {e}")
 
-        return updated
+    def compact_edits(self, session_id: str) -> bool:
+        """저널의 편집을 결과 파일에 병합하고 저널 비우기"""
+        session_dir = self._get_session_dir(session_id)
+        journal_path = self._get_journal_path(session_id)
+
+        with self._get_lock(session_id):
+            if not journal_path.exists() or not self.results.exists(session_dir):
+                return False
+            edits = self._read_journal(session_id)
+            if edits:
+                result = self.results.load(session_dir)
+                self._apply_edits(result, edits)
+                self.results.save(session_dir, result)
+                if any(edit["field"] == "speaker" for edit in edits):
+                    # 화자가 바뀐 세그먼트가 있으면 발화 통계 재계산
+                    table = self._build_speaker_table(result.get("segments", []), self._read_speaker_table(session_id))
+                    self._save_speaker_table(session_id, table)
+            journal_path.unlink()
+            self._pending_edits.pop(session_id, None)
+        return True
 
     def delete_session(self, session_id: str) -> None:
         """세션 삭제"""
+        self._cancel_compaction(session_id)
+        self._segment_counts.pop(session_id, None)
         session_dir = self._get_session_dir(session_id)
+        metadata = self.catalog.get(session_id) or {}
         if session_dir.exists():
             shutil.rmtree(session_dir)
+        if metadata.get("audio_sha256"):
+            # 다른 세션이 같은 오디오를 참조하지 않을 때만 실제로 삭제됨
+            self.audio_store.release(metadata["audio_sha256"], session_id)
+        self.catalog.remove(session_id)
+        if self.structure_index:
+            self.structure_index.remove("session", session_id)
+        if self.search_index:
+            self.search_index.remove("session", session_id)
 
     def get_display_list(self) -> List[Tuple[str, str]]:
         """UI용 세션 목록 (라벨, ID)"""
@@ -180,8 +571,20 @@ class SessionManager:
             return global_dir
         return self._get_session_dir(session_id) / "chats"
 
-    def list_chat_histories(self, session_id: str) -> List[Dict[str, Any]]:
-        """채팅 목록 조회"""
+    # ----- 채팅 기록 (채팅별 JSONL + 세션별 채팅 인덱스) -----
+
+    def _get_chat_path(self, session_id: str, chat_id: str) -> Path:
+        return self._get_chats_dir(session_id) / f"{chat_id}.jsonl"
+
+    def _get_chat_index_path(self, session_id: str) -> Path:
+        return self._get_chats_dir(session_id) / "index.json"
+
+    def _load_chat_index(self, session_id: str) -> Dict[str, Dict[str, Any]]:
+        """채팅 인덱스 로드 (없으면 기존 JSON 채팅을 JSONL로 변환하며 1회 생성)"""
+        index_path = self._get_chat_index_path(session_id)
+        if index_path.exists():
+            return self._load_json(index_path).get("chats", {})
+
         chats_dir = self._get_chats_dir(session_id)
 
         # Migration: Check for legacy chat.json (skip for 'global')
@@ -189,30 +592,56 @@ class SessionManager:
             legacy_path = self._get_session_dir(session_id) / "chat.json"
             if legacy_path.exists():
                 chats_dir.mkdir(exist_ok=True)
-                # Create a new chat for legacy content
-                chat_id = str(uuid.uuid4())
-                new_path = chats_dir / f"{chat_id}.json"
-                shutil.move(str(legacy_path), str(new_path))
+                shutil.move(str(legacy_path), str(chats_dir / f"{uuid.uuid4()}.json"))
 
         if not chats_dir.exists():
-            return []
+            return {}
 
-        chats = []
+        index = {}
         for chat_file in chats_dir.glob("*.json"):
             try:
-                # 파일 수정 시간 등을 기준으로 정렬?
-                # 아니면 파일 내용의 마지막 timestamp?
-                # 간단히 파일 메타데이터 사용
+                messages = self._load_json(chat_file)
                 stat = chat_file.stat()
-                chats.append({
-                    "id": chat_file.stem,
-                    "updated_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat()
-                })
-            except Exception:
-                pass
-        
-        # 최신순 정렬
+                chat_id = chat_file.stem
+                self._write_chat_messages(self._get_chat_path(session_id, chat_id), messages, "w")
+                index[chat_id] = {
+                    "id": chat_id,
+                    "title": self._chat_title(messages),
+                    "message_count": len(messages),
+                    "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
+                    "updated_at": datetime.fromtimestamp(stat.st_mtime).isoformat()
+                }
+                chat_file.unlink()
+            except Exception as e:
+                print(f"채팅 기록 변환 오류 ({chat_file}): {e}")
+
+        self._save_chat_index(session_id, index)
+        return index
+
+    def _save_chat_index(self, session_id: str, index: Dict[str, Dict[str, Any]]) -> None:
+        chats_dir = self._get_chats_dir(session_id)
+        chats_dir.mkdir(parents=True, exist_ok=True)
+        self._save_json_atomic(self._get_chat_index_path(session_id), {"chats": index})
+
+    @staticmethod
+    def _chat_title(messages: List[Dict[str, Any]]) -> str:
+        """첫 사용자 메시지로 채팅 제목 생성"""
+        for msg in messages:
+            if msg.get("role") == "user" and msg.get("content"):
+                content = " ".join(str(msg["content"]).split())
+                return content[:40] + ("…" if len(content) > 40 else "")
+        return ""
+
+    @staticmethod
+    def _write_chat_messages(chat_path: Path, messages: List[Dict[str, Any]], mode: str) -> None:
+        data = "".join(json.dumps(msg, ensure_ascii=False) + "\n" for msg in messages)
+        with open(chat_path, mode, encoding="utf-8") as f:
+            f.write(data)
+
+    def list_chat_histories(self, session_id: str) -> List[Dict[str, Any]]:
+        """채팅 목록 조회 (최신순)"""
+        with self._get_lock(session_id):
+            chats = list(self._load_chat_index(session_id).values())
         chats.sort(key=lambda x: x["updated_at"], reverse=True)
         return chats
 
@@ -222,43 +651,93 @@ class SessionManager:
         chats_dir.mkdir(exist_ok=True)
         
         chat_id = str(uuid.uuid4())
-        chat_path = chats_dir / f"{chat_id}.json"
-        self._save_json(chat_path, []) # Empty list
+        now = datetime.now().isoformat()
+        with self._get_lock(session_id):
+            index = self._load_chat_index(session_id)
+            self._get_chat_path(session_id, chat_id).touch()
+            index[chat_id] = {"id": chat_id, "title": "", "message_count": 0, "created_at": now, "updated_at": now}
+            self._save_chat_index(session_id, index)
         
         return chat_id
 
+    def append_chat_messages(self, session_id: str, chat_id: str, messages: List[Dict[str, Any]]) -> None:
+        """채팅에 메시지 추가 (파일 끝에 덧붙이고 인덱스만 갱신)"""
+        chats_dir = self._get_chats_dir(session_id)
+        chats_dir.mkdir(parents=True, exist_ok=True)
+
+        now = datetime.now().isoformat()
+        with self._get_lock(session_id):
+            index = self._load_chat_index(session_id)
+            self._write_chat_messages(self._get_chat_path(session_id, chat_id), messages, "a")
+            entry = index.setdefault(chat_id, {"id": chat_id, "title": "", "message_count": 0, "created_at": now})
+            entry["message_count"] += len(messages)
+            entry["updated_at"] = now
+            if not entry["title"]:
+                entry["title"] = self._chat_title(messages)
+            self._save_chat_index(session_id, index)
+
     def save_chat_history(self, session_id: str, chat_id: str, messages: List[Dict[str, Any]]) -> None:
-        """채팅 기록 저장"""
+        """채팅 기록 전체 저장 (덮어쓰기)"""
         chats_dir = self._get_chats_dir(session_id)
         if not chats_dir.exists():
             chats_dir.mkdir(parents=True, exist_ok=True)
-        
-        chat_path = chats_dir / f"{chat_id}.json"
-        self._save_json(chat_path, messages)
 
-    def load_chat_history(self, session_id: str, chat_id: str) -> List[Dict[str, Any]]:
-        """채팅 기록 로드"""
-        # chat_id가 없으면 가장 최신(또는 default) 로드 로직은 호출측에서 처리 권장
-        chats_dir = self._get_chats_dir(session_id)
-        chat_path = chats_dir / f"{chat_id}.json"
-        
-        if chat_path.exists():
+        now = datetime.now().isoformat()
+        with self._get_lock(session_id):
+            index = self._load_chat_index(session_id)
+            self._write_chat_messages(self._get_chat_path(session_id, chat_id), messages, "w")
+            entry = index.setdefault(chat_id, {"id": chat_id, "created_at": now})
+            entry.update({"title": self._chat_title(messages), "message_count": len(messages), "updated_at": now})
+            self._save_chat_index(session_id, index)
+
+    def load_chat_history(
+        self,
+        session_id: str,
+        chat_id: str,
+        limit: Optional[int] = None,
+        before: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """채팅 기록 로드
+
+        limit이 주어지면 before(메시지 순번, 기본: 끝) 직전의 최근 limit개만 반환한다.
+        """
+        with self._get_lock(session_id):
+            self._load_chat_index(session_id)  # 기존 형식이면 변환
+            chat_path = self._get_chat_path(session_id, chat_id)
+            if not chat_path.exists():
+                return []
+
+            end = before if before is not None else float("inf")
+            # 마지막 limit줄만 유지 (해당 줄만 JSON 파싱)
+            window: deque = deque(maxlen=limit)
             try:
-                return self._load_json(chat_path)
+                with open(chat_path, "r", encoding="utf-8") as f:
+                    for i, line in enumerate(f):
+                        if i >= end:
+                            break
+                        window.append(line)
+                return [json.loads(line) for line in window if line.strip()]
             except Exception as e:
                 print(f"Error loading chat history: {e}")
         return []
 
+    def get_chat_info(self, session_id: str, chat_id: str) -> Optional[Dict[str, Any]]:
+        """채팅 인덱스 항목 조회 (제목, 메시지 수, 갱신 시각)"""
+        with self._get_lock(session_id):
+            return self._load_chat_index(session_id).get(chat_id)
+
     def delete_chat_history(self, session_id: str, chat_id: str) -> bool:
         """특정 채팅 기록 삭제"""
-        chats_dir = self._get_chats_dir(session_id)
-        chat_path = chats_dir / f"{chat_id}.json"
-        
-        if chat_path.exists():
+        with self._get_lock(session_id):
+            index = self._load_chat_index(session_id)
+            chat_path = self._get_chat_path(session_id, chat_id)
+
+            if chat_id not in index and not chat_path.exists():
+                return False
             try:
-                chat_path.unlink()
+                chat_path.unlink(missing_ok=True)
+                index.pop(chat_id, None)
+                self._save_chat_index(session_id, index)
                 return True
             except Exception:
                 return False
-        return False
-
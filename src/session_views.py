@@ -0,0 +1,179 @@
+"""
+세션 파생 뷰 캐시 모듈
+회의록(Markdown), 녹취록 문자열, 화자 목록을 결과 내용 해시 기준으로 한 번만 렌더링하여 보관
+
+- 캐시 키: 세그먼트(편집 반영, 표시 이름), 결과 본문, 제목/참석자/안건, 화자 이름, 요약의 sha256
+- 저장 위치: 세션 디렉토리의 views.json + 최근 세션은 메모리(LRU)
+내용이 실제로 바뀌었을 때만 해시가 달라지므로 같은 값으로 편집하거나 폴더만 옮기면 다시 렌더링하지 않는다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .chunk_manifest import transcript_line
+from .meeting_minutes import MeetingMinutesGenerator
+
+VIEWS_FILENAME = "views.json"
+VIEW_CACHE_SIZE = 64
+
+# 뷰 렌더링 방식이 바뀌면 올려서 기존 캐시 무효화
+VIEWS_VERSION = 2
+
+# 회의록/녹취록에 쓰이는 메타데이터 필드 (폴더, 오디오 등은 뷰에 영향 없음)
+_META_FIELDS = ("title", "participants", "agenda")
+_SEGMENT_FIELDS = ("start", "end", "speaker", "text")
+
+
+def split_participants(meta: Dict[str, Any]) -> List[str]:
+    return [p.strip() for p in (meta.get("participants") or "").split(",") if p.strip()]
+
+
+def split_agenda(meta: Dict[str, Any]) -> List[str]:
+    return [a.strip() for a in (meta.get("agenda") or "").split("\n") if a.strip()]
+
+
+def speaker_names(speaker_table: List[Dict[str, Any]]) -> List[str]:
+    return sorted(set(sp["name"] for sp in speaker_table))
+
+
+def content_hash(
+    meta: Dict[str, Any],
+    result: Optional[Dict[str, Any]],
+    speaker_table: List[Dict[str, Any]],
+    summary: Optional[Dict[str, Any]] = None
+) -> str:
+    """뷰 입력의 sha256 (load_session 결과 기준: 편집 반영, 화자는 표시 이름)"""
+    result = result or {}
+    payload = {
+        "v": VIEWS_VERSION,
+        "meta": {field: meta.get(field) for field in _META_FIELDS},
+        "full_text": result.get("full_text"),
+        "text": result.get("text"),
+        "segments": [[seg.get(field) for field in _SEGMENT_FIELDS] for seg in result.get("segments", [])],
+        "speakers": sorted(sp["name"] for sp in speaker_table),
+        "summary": [summary.get("summary"), summary.get("action_items")] if summary else None
+    }
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SessionViewCache:
+    """세션 파생 뷰 캐시 (스레드 안전)"""
+
+    def __init__(self, minutes_generator: Optional[MeetingMinutesGenerator] = None, max_entries: int = VIEW_CACHE_SIZE):
+        self.minutes_generator = minutes_generator or MeetingMinutesGenerator()
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(
+        self,
+        meta: Dict[str, Any],
+        result: Optional[Dict[str, Any]],
+        speaker_table: List[Dict[str, Any]],
+        summary: Optional[Dict[str, Any]] = None,
+        transcript_sections: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """뷰 렌더링 ({"transcript", "minutes", "speakers"})
+
+        transcript_sections: 청크 매니페스트에 청크 해시별로 보관된 녹취록 구간.
+        주면 녹취록 화면과 회의록의 녹취록 절은 구간을 이어 붙이기만 하고, 제목/요약/할 일 부분만 새로 렌더링한다.
+        (없으면 세그먼트로 생성)
+        """
+        if transcript_sections is None:
+            segments = result.get("segments", []) if result else []
+            transcript_sections = [transcript_line(seg) for seg in segments]
+        minutes = self.minutes_generator.generate(
+            result or {},
+            title=meta.get("title", "무제"),
+            participants=split_participants(meta),
+            agenda=split_agenda(meta),
+            summary=summary
+        )
+        return {
+            "transcript": "\n".join(transcript_sections),
+            "minutes": self.minutes_generator.to_markdown(minutes, transcript_sections),
+            "speakers": speaker_names(speaker_table)
+        }
+
+    def get(
+        self,
+        session_dir: Path,
+        meta: Dict[str, Any],
+        result: Optional[Dict[str, Any]],
+        speaker_table: List[Dict[str, Any]],
+        summary: Optional[Dict[str, Any]] = None,
+        transcript_sections: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """캐시된 뷰 (내용 해시가 다르면 다시 렌더링하여 저장)"""
+        session_dir = Path(session_dir)
+        key = session_dir.name
+        digest = content_hash(meta, result, speaker_table, summary)
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and cached["hash"] == digest:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return cached["views"]
+
+        cached = self._read(session_dir)
+        if cached and cached.get("hash") == digest:
+            with self._lock:
+                self.hits += 1
+            self._remember(key, cached)
+            return cached["views"]
+
+        with self._lock:
+            self.misses += 1
+        entry = {"hash": digest, "views": self.render(meta, result, speaker_table, summary, transcript_sections)}
+        self._write(session_dir, entry)
+        self._remember(key, entry)
+        return entry["views"]
+
+    def invalidate(self, session_id: str) -> None:
+        """메모리 캐시에서 제거 (세션 삭제 시)"""
+        with self._lock:
+            self._memory.pop(session_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._memory), "hits": self.hits, "misses": self.misses}
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    @staticmethod
+    def _read(session_dir: Path) -> Optional[Dict[str, Any]]:
+        path = session_dir / VIEWS_FILENAME
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _write(session_dir: Path, entry: Dict[str, Any]) -> None:
+        """임시 파일에 쓴 뒤 교체 (동시에 렌더링해도 마지막 결과만 남음)"""
+        if not session_dir.exists():
+            return
+        path = session_dir / VIEWS_FILENAME
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            print(f"뷰 캐시 저장 실패 ({session_dir.name}): {e}")
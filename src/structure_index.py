@@ -0,0 +1,346 @@
+"""
+라이브러리 구조 색인 모듈
+폴더/세션/문서 목록을 SQLite에 보관하고 변경마다 구조 버전을 증가시켜
+ETag 및 변경분(delta) 조회를 지원
+부모 폴더 -> 자식 색인과 폴더별 하위 아이템 수로 폴더 단위 페이지 조회를 지원
+"""
+
+import json
+import sqlite3
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Set
+
+# 스키마 변경 시 증가 (불일치하면 새로 생성 후 재구축 필요)
+SCHEMA_VERSION = 2
+
+ITEM_TYPES = ("folder", "session", "document")
+
+
+class StructureIndex:
+    """구조 아이템 색인 (각 관리자 메타데이터의 요약 사본)
+
+    모든 변경은 구조 버전을 1 증가시키고, 변경된 아이템에 그 버전을 기록한다.
+    삭제된 아이템은 변경분 조회를 위해 삭제 표시(tombstone)로 남긴다.
+
+    parent_id는 실제 표시 위치(존재하지 않는 폴더를 가리키면 루트=NULL)이며,
+    폴더 행의 subtree_count는 하위 폴더를 포함한 모든 하위 아이템 수이다.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.is_new = not self._has_schema()
+        if self.is_new:
+            self._create_schema()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """트랜잭션 단위 연결 (정상 종료 시 커밋, 예외 시 롤백)"""
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            conn.row_factory = sqlite3.Row
+            with conn:
+                yield conn
+
+    def _has_schema(self) -> bool:
+        if not self.db_path.exists():
+            return False
+        with self._connect() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+    def _create_schema(self) -> None:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(f"""
+                DROP TABLE IF EXISTS items;
+                DROP TABLE IF EXISTS state;
+                CREATE TABLE items (
+                    item_type TEXT NOT NULL,
+                    item_id TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    deleted INTEGER NOT NULL DEFAULT 0,
+                    data TEXT,
+                    parent_id TEXT,
+                    created_at TEXT,
+                    subtree_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (item_type, item_id)
+                );
+                CREATE INDEX idx_items_version ON items (version);
+                CREATE INDEX idx_items_parent ON items (parent_id, deleted, item_type, created_at);
+                CREATE TABLE state (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    version INTEGER NOT NULL
+                );
+                INSERT INTO state (id, version) VALUES (0, 0);
+                PRAGMA user_version = {SCHEMA_VERSION};
+            """)
+
+    @staticmethod
+    def _next_version(conn: sqlite3.Connection) -> int:
+        conn.execute("UPDATE state SET version = version + 1 WHERE id = 0")
+        return conn.execute("SELECT version FROM state WHERE id = 0").fetchone()[0]
+
+    # ----- 갱신 -----
+
+    @staticmethod
+    def _declared_parent(item_type: str, item: Dict[str, Any]) -> Optional[str]:
+        return item.get("parent_id") if item_type == "folder" else item.get("folder_id")
+
+    @staticmethod
+    def _folder_exists(conn: sqlite3.Connection, folder_id: Optional[str]) -> bool:
+        return folder_id is not None and conn.execute(
+            "SELECT 1 FROM items WHERE item_type = 'folder' AND item_id = ? AND deleted = 0", (folder_id,)
+        ).fetchone() is not None
+
+    @staticmethod
+    def _current_parents(conn: sqlite3.Connection, item_type: str, item_ids: List[str]) -> Set[str]:
+        parents = set()
+        for item_id in item_ids:
+            row = conn.execute(
+                "SELECT parent_id FROM items WHERE item_type = ? AND item_id = ? AND deleted = 0", (item_type, item_id)
+            ).fetchone()
+            if row and row["parent_id"]:
+                parents.add(row["parent_id"])
+        return parents
+
+    def _refresh_counts(self, conn: sqlite3.Connection, folder_ids: Set[str]) -> None:
+        """주어진 폴더와 그 조상 폴더의 subtree_count 재계산 (깊은 폴더부터)"""
+        depths: Dict[str, int] = {}
+        for folder_id in folder_ids:
+            chain = []
+            current = folder_id
+            while current and current not in chain and current not in depths:
+                row = conn.execute(
+                    "SELECT parent_id FROM items WHERE item_type = 'folder' AND item_id = ? AND deleted = 0", (current,)
+                ).fetchone()
+                if not row:
+                    break
+                chain.append(current)
+                current = row["parent_id"]
+            base = depths.get(current, -1) if current else -1
+            for offset, fid in enumerate(reversed(chain)):
+                depths[fid] = base + 1 + offset
+
+        for folder_id in sorted(depths, key=depths.get, reverse=True):
+            count = conn.execute(
+                "SELECT COUNT(*) + COALESCE(SUM(subtree_count), 0) FROM items WHERE parent_id = ? AND deleted = 0",
+                (folder_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "UPDATE items SET subtree_count = ? WHERE item_type = 'folder' AND item_id = ?", (count, folder_id)
+            )
+
+    def upsert_many(self, item_type: str, items: Iterable[Dict[str, Any]]) -> None:
+        """아이템 추가/갱신 (한 트랜잭션, 한 버전)"""
+        items = list(items)
+        if not items:
+            return
+        with self._connect() as conn:
+            version = self._next_version(conn)
+            ids = [item["id"] for item in items]
+            affected = self._current_parents(conn, item_type, ids)
+            rows = []
+            for item in items:
+                parent_id = self._declared_parent(item_type, item)
+                if not self._folder_exists(conn, parent_id) or parent_id == item["id"]:
+                    parent_id = None
+                if parent_id:
+                    affected.add(parent_id)
+                rows.append((
+                    item_type, item["id"], version, json.dumps(item, ensure_ascii=False),
+                    parent_id, item.get("created_at") or item.get("date") or ""
+                ))
+            conn.executemany(
+                "INSERT INTO items (item_type, item_id, version, deleted, data, parent_id, created_at) "
+                "VALUES (?, ?, ?, 0, ?, ?, ?) "
+                "ON CONFLICT (item_type, item_id) DO UPDATE SET version = excluded.version, deleted = 0, "
+                "data = excluded.data, parent_id = excluded.parent_id, created_at = excluded.created_at",
+                rows
+            )
+            if item_type == "folder":
+                affected.update(ids)  # 새로 생긴 폴더의 하위 아이템 수 / 이동한 폴더의 조상 갱신
+            self._refresh_counts(conn, affected)
+
+    def upsert(self, item_type: str, item: Dict[str, Any]) -> None:
+        """아이템 하나 추가/갱신"""
+        self.upsert_many(item_type, [item])
+
+    def remove_many(self, item_type: str, item_ids: Iterable[str]) -> None:
+        """아이템 삭제 (삭제 표시로 남김)"""
+        item_ids = list(item_ids)
+        if not item_ids:
+            return
+        with self._connect() as conn:
+            version = self._next_version(conn)
+            affected = self._current_parents(conn, item_type, item_ids)
+            conn.executemany(
+                "INSERT OR REPLACE INTO items (item_type, item_id, version, deleted, data) VALUES (?, ?, ?, 1, NULL)",
+                [(item_type, item_id, version) for item_id in item_ids]
+            )
+            if item_type == "folder":
+                # 삭제된 폴더의 하위 아이템은 루트로 옮기고, 변경분 조회에 나타나도록 버전도 올림
+                placeholders = ",".join("?" * len(item_ids))
+                children = conn.execute(
+                    f"SELECT item_type, item_id, data FROM items WHERE parent_id IN ({placeholders}) AND deleted = 0",
+                    item_ids
+                ).fetchall()
+                rows = []
+                for child in children:
+                    data = json.loads(child["data"])
+                    data["parent_id" if child["item_type"] == "folder" else "folder_id"] = None
+                    rows.append((version, json.dumps(data, ensure_ascii=False), child["item_type"], child["item_id"]))
+                conn.executemany(
+                    "UPDATE items SET parent_id = NULL, version = ?, data = ? WHERE item_type = ? AND item_id = ?", rows
+                )
+                affected.difference_update(item_ids)
+            self._refresh_counts(conn, affected)
+
+    def remove(self, item_type: str, item_id: str) -> None:
+        """아이템 하나 삭제"""
+        self.remove_many(item_type, [item_id])
+
+    def rebuild(self, items_by_type: Dict[str, Iterable[Dict[str, Any]]]) -> int:
+        """색인 전체를 주어진 아이템으로 재구축 (버전은 계속 증가)"""
+        items_by_type = {item_type: list(items) for item_type, items in items_by_type.items()}
+        folder_ids = {folder["id"] for folder in items_by_type.get("folder", [])}
+        with self._connect() as conn:
+            version = self._next_version(conn)
+            # 기존 아이템은 삭제 표시로 바꿔 이전 버전 기준 변경분에도 반영되게 함
+            conn.execute(
+                "UPDATE items SET deleted = 1, data = NULL, parent_id = NULL, subtree_count = 0, version = ?",
+                (version,)
+            )
+            count = 0
+            for item_type, items in items_by_type.items():
+                rows = []
+                for item in items:
+                    parent_id = self._declared_parent(item_type, item)
+                    rows.append((
+                        item_type, item["id"], version, json.dumps(item, ensure_ascii=False),
+                        parent_id if parent_id in folder_ids and parent_id != item["id"] else None,
+                        item.get("created_at") or item.get("date") or ""
+                    ))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO items (item_type, item_id, version, deleted, data, parent_id, created_at) "
+                    "VALUES (?, ?, ?, 0, ?, ?, ?)",
+                    rows
+                )
+                count += len(rows)
+            self._refresh_counts(conn, folder_ids)
+        return count
+
+    # ----- 조회 -----
+
+    def version(self) -> int:
+        """현재 구조 버전"""
+        with self._connect() as conn:
+            return conn.execute("SELECT version FROM state WHERE id = 0").fetchone()[0]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """전체 구조 ({"version", "folders", "sessions", "documents"})"""
+        with self._connect() as conn:
+            version = conn.execute("SELECT version FROM state WHERE id = 0").fetchone()[0]
+            rows = conn.execute("SELECT item_type, data FROM items WHERE deleted = 0").fetchall()
+        result: Dict[str, Any] = {"version": version}
+        for item_type in ITEM_TYPES:
+            result[item_type + "s"] = []
+        for row in rows:
+            result[row["item_type"] + "s"].append(json.loads(row["data"]))
+        return result
+
+    def changes_since(self, since: int) -> Dict[str, Any]:
+        """since 버전 이후 변경분 ({"version", "since", "folders", "sessions", "documents", "deleted"})"""
+        with self._connect() as conn:
+            version = conn.execute("SELECT version FROM state WHERE id = 0").fetchone()[0]
+            rows = conn.execute(
+                "SELECT item_type, item_id, deleted, data FROM items WHERE version > ?", (since,)
+            ).fetchall()
+        result: Dict[str, Any] = {"version": version, "since": since, "deleted": []}
+        for item_type in ITEM_TYPES:
+            result[item_type + "s"] = []
+        for row in rows:
+            if row["deleted"]:
+                result["deleted"].append({"type": row["item_type"], "id": row["item_id"]})
+            else:
+                result[row["item_type"] + "s"].append(json.loads(row["data"]))
+        return result
+
+    def get(self, item_type: str, item_id: str) -> Optional[Dict[str, Any]]:
+        """아이템 조회 (삭제되었으면 None)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT data FROM items WHERE item_type = ? AND item_id = ? AND deleted = 0",
+                (item_type, item_id)
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def list_children(
+        self,
+        parent_id: Optional[str],
+        offset: int = 0,
+        limit: int = 100,
+        item_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """폴더 한 단계의 자식 목록 (폴더 먼저, 최신순, 페이지 단위)
+
+        반환: {"version", "total", "subtree_count", "items": [{..., "type", "item_count"?}]}
+        """
+        where = "parent_id IS ? AND deleted = 0"
+        params: list = [parent_id]
+        if item_type:
+            where += " AND item_type = ?"
+            params.append(item_type)
+
+        with self._connect() as conn:
+            version = conn.execute("SELECT version FROM state WHERE id = 0").fetchone()[0]
+            total = conn.execute(f"SELECT COUNT(*) FROM items WHERE {where}", params).fetchone()[0]
+            if parent_id is None:
+                subtree_count = conn.execute("SELECT COUNT(*) FROM items WHERE deleted = 0").fetchone()[0]
+            else:
+                row = conn.execute(
+                    "SELECT subtree_count FROM items WHERE item_type = 'folder' AND item_id = ? AND deleted = 0",
+                    (parent_id,)
+                ).fetchone()
+                subtree_count = row["subtree_count"] if row else 0
+            rows = conn.execute(
+                f"SELECT item_type, data, subtree_count FROM items WHERE {where} "
+                "ORDER BY item_type != 'folder', created_at DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+
+        items = []
+        for row in rows:
+            item = json.loads(row["data"])
+            item["type"] = row["item_type"]
+            if row["item_type"] == "folder":
+                item["item_count"] = row["subtree_count"]
+            items.append(item)
+        return {"version": version, "total": total, "subtree_count": subtree_count, "items": items}
+
+    def child_ids(self, parent_id: str, item_type: Optional[str] = None) -> List[str]:
+        """폴더 바로 아래 아이템 ID 목록"""
+        sql = "SELECT item_id FROM items WHERE parent_id = ? AND deleted = 0"
+        params: list = [parent_id]
+        if item_type:
+            sql += " AND item_type = ?"
+            params.append(item_type)
+        with self._connect() as conn:
+            return [row["item_id"] for row in conn.execute(sql, params)]
+
+    def descendants(self, folder_id: str) -> List[Dict[str, str]]:
+        """폴더 아래 모든 하위 아이템 ({"type", "id"}, 부모 -> 자식 색인을 재귀 탐색)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                WITH RECURSIVE tree (item_type, item_id) AS (
+                    SELECT item_type, item_id FROM items WHERE parent_id = ? AND deleted = 0
+                    UNION
+                    SELECT i.item_type, i.item_id FROM items i
+                    JOIN tree t ON t.item_type = 'folder' AND i.parent_id = t.item_id
+                    WHERE i.deleted = 0
+                )
+                SELECT item_type, item_id FROM tree
+                """,
+                (folder_id,)
+            ).fetchall()
+        return [{"type": row["item_type"], "id": row["item_id"]} for row in rows]
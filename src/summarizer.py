@@ -0,0 +1,235 @@
+"""
+회의 요약 모듈
+녹취록을 세그먼트/화자 경계로 나누어 로컬 LLM(Ollama)으로 구간별 요약을 동시에 생성(map)하고,
+구간 요약을 합쳐 전체 요약과 할 일 목록을 만든다(reduce).
+
+- 동시 요청 수는 SUMMARY_CONCURRENCY로 제한
+- 구간 요약은 청크 매니페스트와 (모델, 프롬프트) 해시 캐시에 보관하므로 편집 후에는 바뀐 구간과 최종 reduce만 LLM을 호출
+- Ollama HTTP API만 사용 (base_url을 바꾸면 다른 호환 서버로 보낼 수 있음)
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .chunk_manifest import ChunkManifest
+from .config import OLLAMA_BASE_URL, SUMMARY_MODEL, SUMMARY_CONCURRENCY, SUMMARY_CHUNK_CHARS, SUMMARY_CACHE_DIR
+
+# 프롬프트나 출력 형식이 바뀌면 올려서 기존 캐시 무효화
+PROMPT_VERSION = 1
+
+MAP_PROMPT = """다음은 회의 녹취록의 일부입니다.
+이 부분의 핵심 내용을 3~5개 문장으로 요약하고, 언급된 할 일을 뽑아 주세요.
+할 일에 담당자나 기한이 언급되었으면 함께 적어 주세요. 할 일이 없으면 빈 목록으로 두세요.
+반드시 다음 JSON 형식으로만 답하세요: {{"summary": "요약", "action_items": ["할 일", ...]}}
+
+녹취록:
+{text}"""
+
+REDUCE_PROMPT = """다음은 한 회의를 구간별로 요약한 내용과 구간별 할 일 목록입니다.
+전체 회의의 요약을 5~10개 문장으로 작성하고, 할 일 목록은 중복을 합쳐 정리해 주세요.
+반드시 다음 JSON 형식으로만 답하세요: {{"summary": "요약", "action_items": ["할 일", ...]}}
+
+구간별 요약:
+{summaries}
+
+구간별 할 일:
+{action_items}"""
+
+
+def parse_summary(text: str) -> Dict[str, Any]:
+    """LLM 출력에서 {"summary", "action_items"} 추출 (JSON이 아니면 전체를 요약으로 사용)"""
+    data = None
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        match = re.search(r"\{.*\}", text or "", re.DOTALL)
+        if match:
+            try:
+                data = json.loads(match.group(0))
+            except ValueError:
+                data = None
+    if not isinstance(data, dict):
+        return {"summary": (text or "").strip(), "action_items": []}
+
+    items = data.get("action_items") or []
+    if not isinstance(items, list):
+        items = [items]
+    action_items = []
+    for item in items:
+        if isinstance(item, dict):
+            item = " / ".join(str(v) for v in item.values() if v)
+        item = str(item).strip()
+        if item and item not in action_items:
+            action_items.append(item)
+    return {"summary": str(data.get("summary") or "").strip(), "action_items": action_items}
+
+
+class OllamaClient:
+    """Ollama /api/generate 호출 (표준 라이브러리만 사용)"""
+
+    def __init__(self, base_url: str = OLLAMA_BASE_URL, model: str = SUMMARY_MODEL,
+                 timeout: float = 300, temperature: float = 0.2):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.timeout = timeout
+        self.temperature = temperature
+
+    def generate(self, prompt: str, json_format: bool = False) -> str:
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "options": {"temperature": self.temperature}
+        }
+        if json_format:
+            payload["format"] = "json"
+        request = urllib.request.Request(
+            f"{self.base_url}/api/generate",
+            data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode("utf-8")).get("response", "").strip()
+
+
+class SummaryCache:
+    """LLM 출력 캐시 (<cache_dir>/<해시 앞 2자리>/<해시>.json)"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def key(model: str, kind: str, prompt: str) -> str:
+        raw = json.dumps([PROMPT_VERSION, model, kind, prompt], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class MeetingSummarizer:
+    """map-reduce 회의 요약"""
+
+    def __init__(
+        self,
+        client: Optional[OllamaClient] = None,
+        cache_dir: Optional[Path] = None,
+        concurrency: int = SUMMARY_CONCURRENCY,
+        chunk_chars: int = SUMMARY_CHUNK_CHARS
+    ):
+        self.client = client or OllamaClient()
+        self.cache = SummaryCache(cache_dir or SUMMARY_CACHE_DIR)
+        self.concurrency = max(1, concurrency)
+        self.chunk_chars = chunk_chars
+
+    def summarize(self, segments: List[Dict[str, Any]], manifest: Optional[ChunkManifest] = None) -> Dict[str, Any]:
+        """전체 요약과 할 일 목록
+
+        manifest를 주면 청크 경계와 구간 요약을 매니페스트에 보관하여,
+        편집 후에는 내용이 바뀐 청크만 다시 요약하고 reduce를 다시 실행한다.
+        반환: {"summary", "action_items", "model", "chunks", "cached_chunks", "refreshed_chunks"}
+        """
+        manifest = manifest or ChunkManifest(None, self.chunk_chars)
+        with manifest.lock:
+            manifest.load()
+            manifest.refresh(segments)
+            manifest.save()
+            pending = [
+                (chunk["hash"], manifest.text(chunk, segments))
+                for chunk in manifest.chunks
+                if chunk["speakers"] and not self._is_current(chunk.get("summary"))
+            ]
+
+        # 구간 요약은 잠금 없이 동시에 실행 (그동안 화면 갱신이 매니페스트를 써도 해시로 다시 맞춤)
+        outputs = self._run_all("map", [MAP_PROMPT.format(text=text) for _, text in pending]) if pending else []
+        fresh = {chunk_id: {"model": self.client.model, "v": PROMPT_VERSION, **output}
+                 for (chunk_id, _), output in zip(pending, outputs)}
+
+        with manifest.lock:
+            manifest.load()
+            manifest.refresh(segments)
+            for chunk in manifest.chunks:
+                if chunk["hash"] in fresh and not self._is_current(chunk.get("summary")):
+                    chunk["summary"] = fresh[chunk["hash"]]
+            manifest.save()
+            partials = [chunk["summary"] for chunk in manifest.chunks if self._is_current(chunk.get("summary"))]
+
+        report = {
+            "summary": "",
+            "action_items": [],
+            "model": self.client.model,
+            "chunks": len(manifest.chunks),
+            "cached_chunks": len(partials) - len(pending),
+            "refreshed_chunks": len(pending)
+        }
+        if partials:
+            final = self._reduce(partials)
+            report.update(summary=final["summary"], action_items=final["action_items"])
+        return report
+
+    def _is_current(self, summary: Optional[Dict[str, Any]]) -> bool:
+        """매니페스트에 저장된 구간 요약이 현재 모델/프롬프트로 만든 것인지"""
+        return bool(summary) and summary.get("model") == self.client.model and summary.get("v") == PROMPT_VERSION
+
+    def _reduce(self, partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """구간 요약 합치기 (한 번에 넣기에 길면 묶음별로 먼저 합친 뒤 반복)"""
+        if len(partials) == 1:
+            return partials[0]
+
+        groups: List[List[Dict[str, Any]]] = [[]]
+        size = 0
+        for partial in partials:
+            length = len(partial["summary"]) + sum(len(item) for item in partial["action_items"])
+            if groups[-1] and size + length > self.chunk_chars:
+                groups.append([])
+                size = 0
+            groups[-1].append(partial)
+            size += length
+
+        if len(groups) > 1 and len(groups) < len(partials):
+            return self._reduce(self._run_all("reduce", [self._reduce_prompt(group) for group in groups]))
+        return self._run_all("reduce", [self._reduce_prompt(partials)])[0]
+
+    @staticmethod
+    def _reduce_prompt(partials: List[Dict[str, Any]]) -> str:
+        summaries = "\n".join(f"{i}. {p['summary']}" for i, p in enumerate(partials, 1))
+        action_items = "\n".join(f"- {item}" for p in partials for item in p["action_items"]) or "(없음)"
+        return REDUCE_PROMPT.format(summaries=summaries, action_items=action_items)
+
+    def _run_all(self, kind: str, prompts: List[str]) -> List[Dict[str, Any]]:
+        """프롬프트들을 최대 concurrency개씩 동시에 실행 (입력 순서대로 반환)"""
+        if len(prompts) == 1:
+            return [self._run(kind, prompts[0])]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(prompts)), thread_name_prefix="summary") as pool:
+            return list(pool.map(lambda prompt: self._run(kind, prompt), prompts))
+
+    def _run(self, kind: str, prompt: str) -> Dict[str, Any]:
+        key = self.cache.key(self.client.model, kind, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        output = parse_summary(self.client.generate(prompt, json_format=True))
+        self.cache.put(key, output)
+        return output
@@ -8,7 +8,9 @@ import inspect
 import os
 import shutil
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, Tuple
+
+from .audio_cache import load_cached
 
 # Windows 심볼릭 링크 권한 문제 해결: 복사 모드 사용
 os.environ["HF_HUB_LOCAL_DIR_AUTO_SYMLINK_THRESHOLD"] = "0"
@@ -85,6 +87,20 @@ class WhisperXTranscriber:
         self.model = None
         self.diarize_model = None
 
+        # 한 번의 전사 중 전사/정렬/화자분리 단계가 같은 파형을 재사용
+        self._audio_cache: Optional[Tuple[str, Any]] = None
+
+    def _load_audio(self, audio_path: str):
+        """16kHz 모노 파형 로드 (PCM 캐시 우선, 없으면 ffmpeg 디코딩)"""
+        if self._audio_cache and self._audio_cache[0] == audio_path:
+            return self._audio_cache[1]
+
+        audio = load_cached(Path(audio_path))
+        if audio is None:
+            audio = _load_whisperx().load_audio(audio_path)
+        self._audio_cache = (audio_path, audio)
+        return audio
+
     def _load_hf_token(self):
         """설정 파일에서 HF 토큰 로드"""
         from .config import get_hf_token
@@ -119,6 +135,8 @@ class WhisperXTranscriber:
             self.diarize_model = None
             print("Diarization 모델 언로드")
         
+        self._audio_cache = None
+
         gc.collect()
         if self.device == "cuda":
             torch.cuda.empty_cache()
@@ -144,18 +162,17 @@ class WhisperXTranscriber:
 
     def transcribe(self, audio_path: str, language: str = "ko", batch_size: int = 16) -> Dict[str, Any]:
         """기본 전사"""
-        wx = _load_whisperx()
         if self.model is None:
             self.load_model()
 
-        audio = wx.load_audio(audio_path)
+        audio = self._load_audio(audio_path)
         return self.model.transcribe(audio, batch_size=batch_size, language=language)
 
     def transcribe_with_alignment(self, audio_path: str, language: str = "ko", batch_size: int = 16) -> Dict[str, Any]:
         """단어 수준 정렬 포함 전사"""
         wx = _load_whisperx()
         result = self.transcribe(audio_path, language, batch_size)
-        audio = wx.load_audio(audio_path)
+        audio = self._load_audio(audio_path)
 
         try:
             model_a, metadata = wx.load_align_model(language_code=language, device=self.device)
@@ -187,7 +204,7 @@ class WhisperXTranscriber:
 
             if self.diarize_model:
                 try:
-                    audio = wx.load_audio(audio_path)
+                    audio = self._load_audio(audio_path)
                     diarize_kwargs = {}
                     if min_speakers:
                         diarize_kwargs["min_speakers"] = min_speakers
@@ -252,15 +269,24 @@ def format_timestamp(seconds: Optional[float]) -> str:
 
 def format_transcription(result: Dict[str, Any]) -> str:
     """전사 결과를 읽기 좋은 형식으로 포맷"""
-    lines = ["=" * 60, "회의록 전사 결과", "=" * 60, ""]
+    return "".join(iter_transcription(result))
+
+
+def iter_transcription(result: Dict[str, Any]) -> Iterator[str]:
+    """format_transcription 결과를 줄 단위로 생성 (긴 녹음도 전체 문자열을 만들지 않음)"""
+    for i, line in enumerate(_transcription_lines(result)):
+        yield line if i == 0 else "\n" + line
+
+
+def _transcription_lines(result: Dict[str, Any]) -> Iterator[str]:
+    yield from ["=" * 60, "회의록 전사 결과", "=" * 60, ""]
 
     if result.get("segments"):
-        lines.extend(["[타임스탬프별 내용]", "-" * 40])
+        yield from ["[타임스탬프별 내용]", "-" * 40]
         for seg in result["segments"]:
             start, end = format_timestamp(seg.get("start")), format_timestamp(seg.get("end"))
             speaker = seg.get("speaker", "")
             header = f"[{start} - {end}] {speaker}" if speaker else f"[{start} - {end}]"
-            lines.extend([header, f"  {seg.get('text', '').strip()}", ""])
+            yield from [header, f"  {seg.get('text', '').strip()}", ""]
 
-    lines.extend(["-" * 40, "[전체 내용]", result.get("full_text", ""), "=" * 60])
-    return "\n".join(lines)
+    yield from ["-" * 40, "[전체 내용]", result.get("full_text", ""), "=" * 60]
@@ -0,0 +1,272 @@
+"""
+YouTube 다운로드 모듈
+yt-dlp를 비동기 작업으로 실행하고 진행 상황을 스트리밍
+"""
+
+import asyncio
+import re
+import uuid
+from pathlib import Path
+from typing import Optional, Dict, Any, AsyncIterator, List, Set
+
+from .audio_cache import build_decode_command, cache_path_for
+from .config import DOWNLOADS_DIR
+
+# 다운로드 결과로 인정하는 오디오 확장자
+AUDIO_EXTENSIONS = {".mp3", ".m4a", ".opus", ".webm", ".ogg", ".wav", ".aac", ".flac"}
+
+_VIDEO_ID_PATTERN = re.compile(r"(?:v=|youtu\.be/|shorts/|embed/|live/)([A-Za-z0-9_-]{11})")
+_FILENAME_ID_PATTERN = re.compile(r"\[([A-Za-z0-9_-]{11})\]$")
+_PROGRESS_PREFIX = "[progress]"
+
+# fast: 원본 오디오 스트림(opus/m4a) 그대로 저장 후 PCM 캐시 생성
+# mp3: 기존 방식 (MP3 재인코딩)
+DOWNLOAD_MODES = ("fast", "mp3")
+
+
+def _decode(data: bytes) -> str:
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('cp949', errors='replace')
+
+
+class YouTubeDownloader:
+    """yt-dlp 다운로드 작업 관리 (동시 실행 제한, 영상 ID 기반 캐시)"""
+
+    def __init__(
+        self,
+        downloads_dir: Optional[Path] = None,
+        ffmpeg_location: Optional[str] = None,
+        max_concurrent: int = 2,
+        timeout: float = 300,
+        max_finished_jobs: int = 50
+    ):
+        self.downloads_dir = Path(downloads_dir) if downloads_dir else DOWNLOADS_DIR
+        self.ffmpeg_location = ffmpeg_location
+        self.timeout = timeout
+        self.max_finished_jobs = max_finished_jobs
+
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._conditions: Dict[str, asyncio.Condition] = {}
+        # 이벤트 루프는 태스크를 약한 참조로만 보관하므로 실행 중인 작업을 직접 보관
+        self._tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def extract_video_id(url: str) -> Optional[str]:
+        """URL에서 YouTube 영상 ID 추출"""
+        match = _VIDEO_ID_PATTERN.search(url)
+        return match.group(1) if match else None
+
+    def find_cached(self, video_id: str) -> Optional[Path]:
+        """이미 다운로드된 영상 ID의 오디오 파일 찾기"""
+        if not video_id or not self.downloads_dir.exists():
+            return None
+        marker = f"[{video_id}]"
+        for path in self.downloads_dir.iterdir():
+            if path.suffix.lower() in AUDIO_EXTENSIONS and path.stem.endswith(marker):
+                return path
+        return None
+
+    def describe_file(self, file_path: Path) -> Dict[str, Any]:
+        """다운로드 파일 정보 (API 응답용)"""
+        return {
+            "filename": file_path.name,
+            "path": str(file_path),
+            "title": _FILENAME_ID_PATTERN.sub("", file_path.stem).strip()
+        }
+
+    def start(self, url: str, mode: str = "fast") -> Dict[str, Any]:
+        """다운로드 작업 시작 (같은 영상의 진행 중 작업이 있으면 재사용)"""
+        if mode not in DOWNLOAD_MODES:
+            raise ValueError(f"지원하지 않는 다운로드 모드입니다: {mode}")
+
+        video_id = self.extract_video_id(url)
+        if video_id:
+            for job in self._jobs.values():
+                if job["video_id"] == video_id and job["status"] in ("queued", "downloading", "decoding"):
+                    return self.snapshot(job["id"])
+
+        job_id = str(uuid.uuid4())
+        self._jobs[job_id] = {
+            "id": job_id,
+            "url": url,
+            "mode": mode,
+            "video_id": video_id,
+            "status": "queued",
+            "progress": 0.0,
+            "eta": "",
+            "result": None,
+            "detail": "",
+            "version": 0
+        }
+        self._conditions[job_id] = asyncio.Condition()
+        task = asyncio.create_task(self._run(job_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        self._prune_finished()
+        return self.snapshot(job_id)
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 조회"""
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    async def events(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """작업 상태가 바뀔 때마다 스냅샷을 생성 (완료/실패 시 종료)"""
+        job = self._jobs.get(job_id)
+        if not job:
+            return
+        condition = self._conditions[job_id]
+        last_version = -1
+        while True:
+            async with condition:
+                await condition.wait_for(lambda: job["version"] != last_version)
+                last_version = job["version"]
+                snapshot = dict(job)
+            yield snapshot
+            if snapshot["status"] in ("done", "error"):
+                return
+
+    async def _update(self, job_id: str, **changes) -> None:
+        job = self._jobs[job_id]
+        condition = self._conditions[job_id]
+        async with condition:
+            job.update(changes)
+            job["version"] += 1
+            condition.notify_all()
+
+    def _build_command(self, url: str, mode: str) -> List[str]:
+        if mode == "mp3":
+            format_args = ["-x", "--audio-format", "mp3", "--audio-quality", "192K"]
+        else:
+            # 최적 오디오 스트림만 받아 컨테이너만 정리 (재인코딩 없음)
+            format_args = ["-f", "bestaudio", "-x"]
+
+        cmd = [
+            "yt-dlp",
+            *format_args,
+            "-o", str(self.downloads_dir / "%(title)s [%(id)s].%(ext)s"),
+            "--newline",
+            "--progress",
+            "--progress-template", f"download:{_PROGRESS_PREFIX} %(progress._percent_str)s %(progress._eta_str)s",
+            "--print", "after_move:filepath",
+            url
+        ]
+        if self.ffmpeg_location:
+            cmd.extend(["--ffmpeg-location", self.ffmpeg_location])
+        return cmd
+
+    async def _run(self, job_id: str) -> None:
+        job = self._jobs[job_id]
+        async with self._semaphore:
+            # 대기 중 다른 작업이 같은 영상을 받아 두었으면 바로 완료
+            cached = self.find_cached(job["video_id"])
+            if cached:
+                await self._update(job_id, status="done", progress=100.0, result=self.describe_file(cached))
+                return
+
+            await self._update(job_id, status="downloading")
+            self.downloads_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                file_path = await asyncio.wait_for(self._download(job_id), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                await self._update(job_id, status="error", detail="다운로드 시간 초과 (5분)")
+                return
+            except Exception as e:
+                await self._update(job_id, status="error", detail=str(e))
+                return
+
+            if job["mode"] == "fast":
+                await self._update(job_id, status="decoding")
+                try:
+                    await self._decode_pcm(file_path)
+                except Exception as e:
+                    # 캐시 생성 실패 시 전사 단계에서 직접 디코딩
+                    print(f"PCM 캐시 생성 실패: {e}")
+
+        await self._update(job_id, status="done", progress=100.0, result=self.describe_file(file_path))
+
+    async def _download(self, job_id: str) -> Path:
+        """yt-dlp 실행, 진행률 반영 후 결과 파일 경로 반환"""
+        job = self._jobs[job_id]
+        process = await asyncio.create_subprocess_exec(
+            *self._build_command(job["url"], job["mode"]),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        output_lines: List[str] = []
+        error_lines: List[str] = []
+
+        # --print를 쓰면 yt-dlp가 quiet 모드가 되어 진행률 줄은 stderr로 나오므로
+        # 두 스트림을 동시에 한 줄씩 읽는다 (stdout은 결과 파일 경로만 사용)
+        async def read_stdout() -> None:
+            async for raw_line in process.stdout:
+                line = _decode(raw_line).strip()
+                if line and not await self._report_progress(job_id, line):
+                    output_lines.append(line)
+
+        async def read_stderr() -> None:
+            async for raw_line in process.stderr:
+                line = _decode(raw_line).strip()
+                if line and not await self._report_progress(job_id, line):
+                    error_lines.append(line)
+
+        try:
+            await asyncio.gather(read_stdout(), read_stderr())
+            returncode = await process.wait()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+        stderr = "\n".join(error_lines)
+
+        if returncode != 0:
+            raise RuntimeError(stderr or "yt-dlp 오류")
+
+        filename = output_lines[-1] if output_lines else ""
+        file_path = Path(filename)
+        if filename and not file_path.exists():
+            # 파일명만 추출해서 downloads 폴더에서 찾기
+            file_path = self.downloads_dir / file_path.name
+        if not filename or not file_path.exists():
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {filename}")
+
+        if not job["video_id"]:
+            match = _FILENAME_ID_PATTERN.search(file_path.stem)
+            job["video_id"] = match.group(1) if match else None
+        return file_path
+
+    async def _report_progress(self, job_id: str, line: str) -> bool:
+        """진행률 줄이면 작업에 반영하고 True 반환"""
+        if not line.startswith(_PROGRESS_PREFIX):
+            return False
+        parts = line[len(_PROGRESS_PREFIX):].split()
+        try:
+            percent = float(parts[0].rstrip('%'))
+        except (IndexError, ValueError):
+            return True
+        await self._update(job_id, progress=percent, eta=parts[1] if len(parts) > 1 else "")
+        return True
+
+    async def _decode_pcm(self, file_path: Path) -> None:
+        """다운로드한 오디오를 전사용 16kHz 모노 PCM 캐시로 디코딩"""
+        cache_path = cache_path_for(file_path)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        process = await asyncio.create_subprocess_exec(
+            *build_decode_command(file_path, tmp_path, self.ffmpeg_location),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            tmp_path.unlink(missing_ok=True)
+            raise RuntimeError(_decode(stderr)[-500:] or "ffmpeg 오류")
+        tmp_path.replace(cache_path)
+
+    def _prune_finished(self) -> None:
+        finished = [jid for jid, job in self._jobs.items() if job["status"] in ("done", "error")]
+        for jid in finished[:-self.max_finished_jobs or None]:
+            self._jobs.pop(jid, None)
+            self._conditions.pop(jid, None)
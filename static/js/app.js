@@ -76,16 +76,40 @@ function getSpeakerColor(speaker) {
 let libraryData = { folders: [], sessions: [], documents: [] };
 let expandedFolders = new Set(); // Set of folder IDs
 
+// Structure cache: version + items by type/id (refreshed with ?since=version deltas)
+let libraryVersion = null;
+const libraryItems = { folder: new Map(), session: new Map(), document: new Map() };
+
 async function loadLibrary() {
     try {
-        const res = await fetch('/api/structure');
-        libraryData = await res.json();
+        const url = libraryVersion === null ? '/api/structure' : `/api/structure?since=${libraryVersion}`;
+        const headers = libraryVersion === null ? {} : { 'If-None-Match': `"structure-${libraryVersion}"` };
+        const res = await fetch(url, { headers, cache: 'no-store' });
+        if (res.status === 304) return; // unchanged
+        applyStructure(await res.json());
         renderLibrary();
     } catch (e) {
         console.error("Failed to load library:", e);
     }
 }
 
+function applyStructure(data) {
+    if (data.full) {
+        Object.values(libraryItems).forEach(map => map.clear());
+    }
+    data.folders.forEach(f => libraryItems.folder.set(f.id, f));
+    data.sessions.forEach(s => libraryItems.session.set(s.id, s));
+    data.documents.forEach(d => libraryItems.document.set(d.id, d));
+    (data.deleted || []).forEach(item => libraryItems[item.type]?.delete(item.id));
+    libraryVersion = data.version;
+
+    libraryData = {
+        folders: [...libraryItems.folder.values()],
+        sessions: [...libraryItems.session.values()],
+        documents: [...libraryItems.document.values()]
+    };
+}
+
 function renderLibrary() {
     const treeContainer = document.getElementById('libraryTree');
     treeContainer.innerHTML = '';
@@ -171,6 +195,7 @@ function createNodeElement(node, level) {
                     </button>
                     <ul class="dropdown-menu dropdown-menu-dark">
                         <li><a class="dropdown-item" href="#" onclick="renameFolder('${node.id}', '${node.name}')">이름 변경</a></li>
+                        <li><a class="dropdown-item" href="/api/export?folder_id=${node.id}">ZIP 내보내기</a></li>
                         <li><a class="dropdown-item text-danger" href="#" onclick="deleteFolder('${node.id}')">삭제</a></li>
                     </ul>
                 </div>
@@ -527,9 +552,27 @@ function uploadDocuments(files) {
     (async () => {
         try {
             for (let file of files) {
+                const uploadId = crypto.randomUUID();
                 const formData = new FormData();
                 formData.append('file', file);
-                await fetch('/api/documents', { method: 'POST', body: formData });
+                formData.append('upload_id', uploadId);
+
+                // 대용량 문서 처리 진행 상황 표시
+                const poll = setInterval(async () => {
+                    try {
+                        const res = await fetch(`/api/documents/progress/${uploadId}`);
+                        const p = await res.json();
+                        if (p.found && p.total) {
+                            showToast(`${file.name}: ${p.done}/${p.total} 페이지 처리 중`, 1500);
+                        }
+                    } catch (e) { /* ignore */ }
+                }, 1000);
+
+                try {
+                    await fetch('/api/documents', { method: 'POST', body: formData });
+                } finally {
+                    clearInterval(poll);
+                }
             }
             loadLibrary();
         } catch (e) {
@@ -818,6 +861,46 @@ function setupEventListeners() {
 
     // YouTube download
     const youtubeDownloadBtn = document.getElementById('youtubeDownloadBtn');
+
+    function applyYoutubeResult(data) {
+        downloadedFilePath = data.path;
+        // Set the title if available
+        if (data.title) {
+            document.getElementById('titleInput').value = data.title;
+        }
+        // 다운로드 완료 표시
+        const fileNameEl = document.getElementById('selectedFileName');
+        fileNameEl.style.display = 'block';
+        fileNameEl.querySelector('span').textContent = data.filename;
+        document.getElementById('audioFile').required = false;
+        showToast('YouTube 오디오 다운로드 완료!');
+    }
+
+    // 다운로드 작업 진행 상황 구독 (완료 시 결과 반환)
+    function waitForYoutubeJob(jobId) {
+        return new Promise((resolve, reject) => {
+            const source = new EventSource(`/api/youtube/${jobId}/events`);
+            source.onmessage = (e) => {
+                const job = JSON.parse(e.data);
+                if (job.status === 'downloading') {
+                    youtubeDownloadBtn.textContent = `${Math.round(job.progress)}%`;
+                } else if (job.status === 'decoding') {
+                    youtubeDownloadBtn.innerHTML = '<span class="spinner-border spinner-border-sm"></span>';
+                } else if (job.status === 'done') {
+                    source.close();
+                    resolve(job.result);
+                } else if (job.status === 'error') {
+                    source.close();
+                    reject(new Error(job.detail || '알 수 없는 오류'));
+                }
+            };
+            source.onerror = () => {
+                source.close();
+                reject(new Error('진행 상황 연결이 끊어졌습니다'));
+            };
+        });
+    }
+
     youtubeDownloadBtn.addEventListener('click', async () => {
         const url = document.getElementById('youtubeUrl').value;
         if (!url) {
@@ -836,20 +919,16 @@ function setupEventListeners() {
             });
             const data = await res.json();
 
-            if (data.success) {
-                downloadedFilePath = data.path;
-                // Set the title if available
-                if (data.title) {
-                    document.getElementById('titleInput').value = data.title;
+            if (!data.success) {
+                showToast('다운로드 실패: ' + (data.detail || '알 수 없는 오류'));
+            } else if (data.job_id) {
+                try {
+                    applyYoutubeResult(await waitForYoutubeJob(data.job_id));
+                } catch (err) {
+                    showToast('다운로드 실패: ' + err.message);
                 }
-                // 다운로드 완료 표시
-                const fileNameEl = document.getElementById('selectedFileName');
-                fileNameEl.style.display = 'block';
-                fileNameEl.querySelector('span').textContent = data.filename;
-                document.getElementById('audioFile').required = false;
-                showToast('YouTube 오디오 다운로드 완료!');
             } else {
-                showToast('다운로드 실패: ' + (data.detail || '알 수 없는 오류'));
+                applyYoutubeResult(data);
             }
         } catch (err) {
             console.error('YouTube download error:', err);
@@ -976,12 +1055,21 @@ function setupEventListeners() {
 
 async function loadSession(sessionId) {
     try {
-        const res = await fetch(`/api/session/${sessionId}`);
+        // 전송 대기 중인 편집을 먼저 반영
+        if (pendingSegmentEdits.length) await flushSegmentEdits();
+
+        // 녹취록/회의록은 JSON에 넣지 않고 필요할 때 스트리밍 엔드포인트에서 받음
+        const res = await fetch(`/api/session/${sessionId}?text=0`);
         const data = await res.json();
 
         currentSessionId = sessionId;
         segments = data.segments || [];
 
+        // 서버 화자 테이블의 색상 사용
+        (data.speaker_table || []).forEach(sp => {
+            if (sp.color) speakerColorMap[sp.name] = sp.color;
+        });
+
         // Set audio
         if (data.audio.base64) {
             mainAudio.src = `data:${data.audio.mime};base64,${data.audio.base64}`;
@@ -990,14 +1078,27 @@ async function loadSession(sessionId) {
             audioControlsBar.style.display = 'flex';
         }
 
+        // 채팅 출처에서 연 세션이면 인용 시점으로 이동
+        if (pendingSeek && pendingSeek.sessionId === sessionId) {
+            seekAudio(pendingSeek.start);
+            pendingSeek = null;
+        }
+
         // Render segments
         renderSegments();
 
-        // Set transcript
-        document.getElementById('transcriptContent').textContent = data.transcript;
+        // Set transcript (세그먼트로 생성)
+        const transcriptContent = document.getElementById('transcriptContent');
+        if (transcriptContent) {
+            transcriptContent.textContent = segments.map(seg => `[${seg.speaker || 'SPEAKER'}] ${seg.text || ''}`).join('\n');
+        }
 
         // Set minutes (render markdown)
-        document.getElementById('minutesContent').innerHTML = marked.parse(data.minutes);
+        const minutesContent = document.getElementById('minutesContent');
+        if (minutesContent) {
+            const minutesRes = await fetch(`/api/session/${sessionId}/minutes.md`);
+            minutesContent.innerHTML = marked.parse(await minutesRes.text());
+        }
 
         // Set settings
         renameTitleInput.value = data.meta.title || '';
@@ -1133,22 +1234,44 @@ function setupSegmentEditHandlers() {
     });
 }
 
-async function saveSegmentEdit(index, field, value) {
-    try {
-        const formData = new FormData();
-        formData.append('index', index);
-        formData.append('field', field);
-        formData.append('value', value);
+// 세그먼트 편집은 잠시 모았다가 한 번에 전송
+let pendingSegmentEdits = [];
+let segmentEditTimer = null;
 
-        await fetch(`/api/session/${currentSessionId}/segment`, {
-            method: 'PUT',
-            body: formData
-        });
-    } catch (err) {
-        console.error('Failed to save segment edit:', err);
+function saveSegmentEdit(index, field, value) {
+    pendingSegmentEdits.push({ sessionId: currentSessionId, index, field, value });
+    clearTimeout(segmentEditTimer);
+    segmentEditTimer = setTimeout(flushSegmentEdits, 800);
+}
+
+async function flushSegmentEdits() {
+    clearTimeout(segmentEditTimer);
+    const edits = pendingSegmentEdits;
+    pendingSegmentEdits = [];
+
+    const bySession = {};
+    edits.forEach(({ sessionId, ...edit }) => {
+        (bySession[sessionId] = bySession[sessionId] || []).push(edit);
+    });
+
+    for (const [sessionId, sessionEdits] of Object.entries(bySession)) {
+        try {
+            await fetch(`/api/session/${sessionId}/segments`, {
+                method: 'PUT',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ edits: sessionEdits }),
+                keepalive: true
+            });
+        } catch (err) {
+            console.error('Failed to save segment edit:', err);
+        }
     }
 }
 
+window.addEventListener('beforeunload', () => {
+    if (pendingSegmentEdits.length) flushSegmentEdits();
+});
+
 function handleTimeUpdate() {
     const currentTime = mainAudio.currentTime;
     let newActiveIndex = -1;
@@ -1412,7 +1535,7 @@ async function sendChatMessage() {
         removeLoadingMessage(loadingId);
 
         if (data.success) {
-            addMessageToChat('assistant', data.answer);
+            addMessageToChat('assistant', data.answer, data.citations);
         } else {
             addMessageToChat('error', data.detail || '오류가 발생했습니다.');
         }
@@ -1428,7 +1551,7 @@ chatInput.addEventListener('keypress', (e) => {
     if (e.key === 'Enter') sendChatMessage();
 });
 
-function addMessageToChat(role, content) {
+function addMessageToChat(role, content, citations = []) {
     // Remove placeholder if exists
     const placeholder = chatMessages.querySelector('.text-center');
     if (placeholder) placeholder.remove();
@@ -1452,9 +1575,16 @@ function addMessageToChat(role, content) {
                 <div class="bg-transparent border border-warning rounded-3 px-3 py-2" style="max-width: 85%;">
                     <i class="bi bi-robot text-warning me-1"></i>
                     <div class="markdown-content">${renderedContent}</div>
+                    ${renderCitations(citations)}
                 </div>
             </div>
         `;
+        msgDiv.querySelectorAll('.chat-citation').forEach(el => {
+            el.addEventListener('click', () => {
+                const start = el.dataset.start === '' ? null : parseFloat(el.dataset.start);
+                jumpToCitation(el.dataset.source, el.dataset.type, start);
+            });
+        });
     } else if (role === 'error') {
         msgDiv.innerHTML = `
             <div class="d-flex">
@@ -1470,6 +1600,56 @@ function addMessageToChat(role, content) {
     chatMessages.scrollTop = chatMessages.scrollHeight;
 }
 
+// 답변 근거 출처 (녹취록 청크는 시점, 클릭하면 해당 세션의 그 시점으로 이동)
+function renderCitations(citations) {
+    if (!citations || citations.length === 0) return '';
+    const multiSource = new Set(citations.map(c => c.source_id)).size > 1;
+    const chips = citations.map(c => {
+        const hasTime = c.start !== undefined && c.start !== null;
+        const title = citationTitle(c);
+        let label = hasTime ? formatTime(c.start) : title;
+        if (hasTime && multiSource) label = `${title} · ${label}`;
+        const tooltip = [title, hasTime ? `${formatTime(c.start)} - ${formatTime(c.end ?? c.start)}` : '', c.speakers || '']
+            .filter(Boolean).join(' | ');
+        return `<button type="button" class="btn btn-sm btn-outline-warning chat-citation me-1 mt-1"
+                    data-source="${escapeHtml(c.source_id)}" data-type="${escapeHtml(c.source_type || 'session')}"
+                    data-start="${hasTime ? c.start : ''}" title="${escapeHtml(tooltip).replace(/"/g, '&quot;')}">
+                    <i class="bi ${hasTime ? 'bi-play-circle' : 'bi-file-earmark-text'} me-1"></i>${escapeHtml(label)}
+                </button>`;
+    }).join('');
+    return `<div class="chat-citations mt-2">${chips}</div>`;
+}
+
+function citationTitle(citation) {
+    const list = citation.source_type === 'document' ? libraryData?.documents : libraryData?.sessions;
+    return list?.find(item => item.id === citation.source_id)?.title || (citation.source_type === 'document' ? '문서' : '세션');
+}
+
+// 세션을 연 뒤 오디오를 인용 시점으로 이동 (세션을 새로 여는 경우 로드가 끝나면 이동)
+let pendingSeek = null;
+
+function jumpToCitation(sourceId, sourceType, start) {
+    if (sourceType === 'document') {
+        openDocument(sourceId);
+        return;
+    }
+    if (currentSessionId === sourceId && mainAudio.src) {
+        if (start !== null) seekAudio(start);
+        return;
+    }
+    pendingSeek = start !== null ? { sessionId: sourceId, start } : null;
+    openSession(sourceId);
+}
+
+function seekAudio(start) {
+    const seek = () => {
+        mainAudio.currentTime = start;
+        mainAudio.play();
+    };
+    if (mainAudio.readyState >= 1) seek();
+    else mainAudio.addEventListener('loadedmetadata', seek, { once: true });
+}
+
 function addLoadingMessage() {
     const id = 'loading-' + Date.now();
     const msgDiv = document.createElement('div');
@@ -1630,7 +1810,7 @@ async function loadChatList(sessionId) {
             const activeClass = (chat.id === activeChatId) ? 'active' : '';
             return `<li><a class="dropdown-item ${activeClass}" href="#" onclick="switchChat('${chat.id}')">
                 <div class="d-flex justify-content-between align-items-center">
-                    <span>${date}</span>
+                    <span>${chat.title ? escapeHtml(chat.title) : date}</span>
                     <i class="bi bi-chat-text text-secondary ms-2" style="font-size: 0.8em"></i>
                 </div>
             </a></li>`;
@@ -1710,7 +1890,7 @@ async function switchChat(chatId) {
 
         if (data.history && data.history.length > 0) {
             data.history.forEach(msg => {
-                addMessageToChat(msg.role, msg.content);
+                addMessageToChat(msg.role, msg.content, msg.citations);
             });
         } else {
             clearChat(); // Show placeholder
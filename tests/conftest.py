@@ -0,0 +1,84 @@
+"""
+공용 테스트 픽스처
+Ollama HTTP API를 대신하는 로컬 스텁 서버
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+# handler(path, payload) -> (HTTP 상태, 응답 JSON) 또는 (상태, 응답 JSON, 지연 초)
+Handler = Callable[[str, Dict[str, Any]], Tuple]
+
+
+class StubServer:
+    """요청을 기록하고 동시 처리 수를 재는 스텁 서버"""
+
+    def __init__(self):
+        self.handler: Optional[Handler] = None
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def count(self, path: str) -> int:
+        with self._lock:
+            return sum(1 for p, _ in self.requests if p == path)
+
+    def _handler_class(self):
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+                with stub._lock:
+                    stub.requests.append((self.path, payload))
+                    stub.active += 1
+                    stub.peak = max(stub.peak, stub.active)
+                try:
+                    status, body, *rest = stub.handler(self.path, payload)
+                    if rest:
+                        time.sleep(rest[0])
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # 클라이언트가 시간 초과로 먼저 끊은 경우
+
+        return _Handler
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer().start()
+    yield server
+    server.stop()
@@ -0,0 +1,199 @@
+"""
+임베딩 파이프라인 테스트
+로컬 스텁 서버를 Ollama /api/embed 대신 사용
+"""
+
+import threading
+import time
+import urllib.error
+
+import pytest
+
+import src.embedding_pipeline as embedding_pipeline
+from src.embedding_pipeline import EmbeddingPipeline
+
+EMBED = "/api/embed"
+
+
+def vector_for(text):
+    """텍스트마다 다른 벡터 (순서 확인용)"""
+    return [float(len(text)), float(sum(map(ord, text)) % 997), 1.0]
+
+
+def embed_reply(path, payload, delay=0.0):
+    return 200, {"model": payload["model"], "embeddings": [vector_for(t) for t in payload["input"]]}, delay
+
+
+class RecordingTime:
+    """backoff 대기 시간만 기록 (실제로 잠들지 않음)"""
+
+    def __init__(self):
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+    perf_counter = staticmethod(time.perf_counter)
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    recorder = RecordingTime()
+    monkeypatch.setattr(embedding_pipeline, "time", recorder)
+    monkeypatch.setattr(embedding_pipeline.random, "uniform", lambda a, b: b)
+    return recorder
+
+
+def pipeline(server, **kwargs):
+    kwargs.setdefault("timeout", 5)
+    return EmbeddingPipeline("stub-embed", base_url=server.url, **kwargs)
+
+
+def texts(count):
+    return [f"청크 {i} " + "가" * (i % 7) for i in range(count)]
+
+
+def test_batches_requests(stub_server):
+    stub_server.handler = embed_reply
+    vectors = pipeline(stub_server, batch_size=8, concurrency=2).embed_documents(texts(50))
+
+    sizes = [len(payload["input"]) for _, payload in stub_server.requests]
+    assert sorted(sizes) == [2] + [8] * 6
+    assert all(path == EMBED and payload["model"] == "stub-embed" for path, payload in stub_server.requests)
+    assert len(vectors) == 50
+
+
+def test_single_batch_and_query(stub_server):
+    stub_server.handler = embed_reply
+    embeddings = pipeline(stub_server, batch_size=16)
+    assert embeddings.embed_documents([]) == []
+    assert stub_server.requests == []
+    assert embeddings.embed_documents(["하나", "둘"]) == [vector_for("하나"), vector_for("둘")]
+    assert embeddings.embed_query("질문") == vector_for("질문")
+    assert [len(p["input"]) for _, p in stub_server.requests] == [2, 1]
+
+
+def test_results_keep_input_order(stub_server):
+    # 앞 배치일수록 늦게 응답하여 완료 순서를 뒤집음
+    def handler(path, payload):
+        first = int(payload["input"][0].split()[1])
+        return embed_reply(path, payload, delay=max(0.0, 0.2 - first * 0.005))
+
+    stub_server.handler = handler
+    items = texts(40)
+    vectors = pipeline(stub_server, batch_size=4, concurrency=5).embed_documents(items)
+    assert vectors == [vector_for(t) for t in items]
+
+
+def test_concurrency_limit(stub_server):
+    stub_server.handler = lambda path, payload: embed_reply(path, payload, delay=0.05)
+    embeddings = pipeline(stub_server, batch_size=2, concurrency=3)
+    embeddings.embed_documents(texts(30))
+    assert stub_server.peak == 3
+    assert embeddings.stats.snapshot()["peak_in_flight"] == 3
+
+
+def test_concurrency_limit_is_shared_between_callers(stub_server):
+    stub_server.handler = lambda path, payload: embed_reply(path, payload, delay=0.05)
+    embeddings = pipeline(stub_server, batch_size=2, concurrency=3)
+    workers = [threading.Thread(target=embeddings.embed_documents, args=(texts(20),)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert stub_server.peak <= 3
+    assert embeddings.stats.snapshot()["texts"] == 60
+
+
+def test_retries_5xx_with_exponential_backoff(stub_server, no_sleep):
+    failures = {"left": 3}
+
+    def handler(path, payload):
+        if failures["left"]:
+            failures["left"] -= 1
+            return 503, {"error": "loading model"}
+        return embed_reply(path, payload)
+
+    stub_server.handler = handler
+    embeddings = pipeline(stub_server, max_retries=3, backoff=0.5)
+    assert embeddings.embed_documents(["a", "b"]) == [vector_for("a"), vector_for("b")]
+
+    assert no_sleep.sleeps == [0.5, 1.0, 2.0]
+    stats = embeddings.stats.snapshot()
+    assert stats["retries"] == 3
+    assert stats["failures"] == 3
+    assert stats["requests"] == 1
+
+
+def test_backoff_is_capped(stub_server, no_sleep):
+    stub_server.handler = lambda path, payload: (503, {"error": "busy"})
+    embeddings = pipeline(stub_server, max_retries=4, backoff=20)
+    with pytest.raises(urllib.error.HTTPError):
+        embeddings.embed_query("x")
+    assert no_sleep.sleeps == [20, embedding_pipeline.MAX_BACKOFF, embedding_pipeline.MAX_BACKOFF,
+                               embedding_pipeline.MAX_BACKOFF]
+
+
+def test_gives_up_after_max_retries(stub_server, no_sleep):
+    stub_server.handler = lambda path, payload: (500, {"error": "boom"})
+    embeddings = pipeline(stub_server, max_retries=2)
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        embeddings.embed_documents(["a"])
+    assert excinfo.value.code == 500
+    assert stub_server.count(EMBED) == 3
+    stats = embeddings.stats.snapshot()
+    assert stats["retries"] == 2
+    assert stats["failures"] == 3
+    assert stats["in_flight"] == 0
+
+
+def test_client_errors_are_not_retried(stub_server, no_sleep):
+    stub_server.handler = lambda path, payload: (400, {"error": "bad request"})
+    embeddings = pipeline(stub_server, max_retries=3)
+    with pytest.raises(urllib.error.HTTPError):
+        embeddings.embed_query("x")
+    assert stub_server.count(EMBED) == 1
+    assert no_sleep.sleeps == []
+
+
+def test_retries_timeouts(stub_server):
+    slow = {"left": 1}
+
+    def handler(path, payload):
+        if slow["left"]:
+            slow["left"] -= 1
+            return embed_reply(path, payload, delay=1.0)
+        return embed_reply(path, payload)
+
+    stub_server.handler = handler
+    embeddings = pipeline(stub_server, timeout=0.2, max_retries=2, backoff=0.01)
+    assert embeddings.embed_query("느린 요청") == vector_for("느린 요청")
+    assert embeddings.stats.snapshot()["retries"] == 1
+
+
+def test_mismatched_response_is_an_error(stub_server, no_sleep):
+    stub_server.handler = lambda path, payload: (200, {"embeddings": [[1.0]]})
+    embeddings = pipeline(stub_server)
+    with pytest.raises(ValueError):
+        embeddings.embed_documents(["a", "b"])
+    assert stub_server.count(EMBED) == 1
+    assert embeddings.stats.snapshot()["failures"] == 1
+
+
+def test_stats_counters(stub_server):
+    stub_server.handler = lambda path, payload: embed_reply(path, payload, delay=0.01)
+    embeddings = pipeline(stub_server, batch_size=5, concurrency=2)
+    items = texts(23)
+    embeddings.embed_documents(items)
+
+    stats = embeddings.stats.snapshot()
+    assert stats["requests"] == 5
+    assert stats["texts"] == 23
+    assert stats["chars"] == sum(len(t) for t in items)
+    assert stats["retries"] == 0
+    assert stats["failures"] == 0
+    assert stats["in_flight"] == 0
+    assert 1 <= stats["peak_in_flight"] <= 2
+    assert stats["busy_seconds"] > 0
+    assert stats["texts_per_second"] > 0
+    assert stats["mean_request_ms"] >= 10
@@ -0,0 +1,73 @@
+"""
+녹취록 벡터 인덱스 동기화 테스트
+로컬 스텁 서버를 Ollama /api/embed 대신 사용
+"""
+
+import pytest
+
+from src.rag_chat import TranscriptRAG
+
+EMBED = "/api/embed"
+
+
+def embed_reply(path, payload):
+    vectors = [[float(len(t)), float(sum(map(ord, t)) % 997), 1.0] for t in payload["input"]]
+    return 200, {"model": payload["model"], "embeddings": vectors}
+
+
+def make_segments(count=24, names=("김철수", "이영희")):
+    return [
+        {
+            "start": i * 10.0,
+            "end": i * 10.0 + 9.0,
+            "speaker_id": f"SPEAKER_0{(i // 2) % 2}",
+            "speaker": names[(i // 2) % 2],
+            "text": f"{i}번 안건에 대해 예산과 일정을 길게 논의했습니다. " * 2
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def rag(stub_server, tmp_path):
+    stub_server.handler = embed_reply
+    rag = TranscriptRAG(tmp_path / "chroma", embedding_model="stub-embed",
+                        embedding_cache_path=tmp_path / "embeddings.db")
+    rag.embedding_pipeline.base_url = stub_server.url
+    return rag
+
+
+def stored_speakers(rag, source_id):
+    metadatas = rag._collection.get(where={"source_id": source_id}, include=["metadatas"])["metadatas"]
+    return {meta["speakers"] for meta in metadatas}
+
+
+def test_speaker_rename_does_not_reembed(stub_server, rag):
+    first = rag.sync_segments("s1", make_segments())
+    assert first["added"] > 1
+    assert first["removed"] == 0
+    calls = stub_server.count(EMBED)
+    assert calls > 0
+
+    renamed = make_segments(names=("김철수", "이영희 팀장"))
+    diff = rag.sync_segments("s1", renamed)
+
+    assert diff == {"added": 0, "removed": 0, "kept": first["added"]}
+    assert stub_server.count(EMBED) == calls
+    # 표시 이름은 메타데이터에만 반영
+    assert any("이영희 팀장" in speakers for speakers in stored_speakers(rag, "s1"))
+    assert not any(speakers.endswith("이영희") for speakers in stored_speakers(rag, "s1"))
+
+
+def test_text_edit_reembeds_only_changed_chunk(stub_server, rag):
+    segments = make_segments()
+    first = rag.sync_segments("s1", segments)
+    calls = stub_server.count(EMBED)
+
+    segments[5] = {**segments[5], "text": "5번 안건은 다음 회의로 미루기로 했습니다."}
+    diff = rag.sync_segments("s1", segments)
+
+    assert diff["added"] == diff["removed"] == 1
+    assert diff["kept"] == first["added"] - 1
+    assert stub_server.count(EMBED) == calls + 1
+    assert [len(p["input"]) for _, p in stub_server.requests[calls:]] == [1]
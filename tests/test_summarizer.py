@@ -0,0 +1,153 @@
+"""
+회의 요약(map-reduce) 테스트
+로컬 스텁 서버를 Ollama /api/generate 대신 사용
+"""
+
+import json
+import re
+import urllib.error
+
+import pytest
+
+from src.chunk_manifest import ChunkManifest
+from src.summarizer import MeetingSummarizer, OllamaClient, parse_summary
+
+GENERATE = "/api/generate"
+
+
+def make_segments(count=12, speakers=("김철수", "이영희", "박민수")):
+    return [
+        {
+            "start": i * 10.0,
+            "end": i * 10.0 + 9.0,
+            "speaker": speakers[(i // 2) % len(speakers)],
+            "text": f"{i}번 안건에 대해 예산과 일정을 길게 논의했습니다. " * 3
+        }
+        for i in range(count)
+    ]
+
+
+def llm_reply(path, payload):
+    """map 프롬프트는 첫 세그먼트 번호와 길이로 구간 요약을, reduce 프롬프트는 전체 요약을 돌려줌"""
+    prompt = payload["prompt"]
+    if "구간별 요약" in prompt:
+        parts = re.findall(r"^\d+\. (.+)$", prompt, re.MULTILINE)
+        output = {"summary": "전체: " + " / ".join(parts), "action_items": ["예산안 정리 (김철수)"]}
+    else:
+        first = re.search(r"\] [^:]+: (\d+)번", prompt).group(1)
+        output = {"summary": f"구간 {first} ({len(prompt)}자)", "action_items": [f"{first}번 후속 조치", "예산안 정리 (김철수)"]}
+    return 200, {"response": json.dumps(output, ensure_ascii=False)}
+
+
+def reduce_prompts(server):
+    return [p for path, p in server.requests if path == GENERATE and "구간별 요약" in p["prompt"]]
+
+
+def map_prompts(server):
+    return [p for path, p in server.requests if path == GENERATE and "구간별 요약" not in p["prompt"]]
+
+
+@pytest.fixture
+def summarizer(stub_server, tmp_path):
+    def build(**kwargs):
+        client = OllamaClient(base_url=stub_server.url, model="stub", timeout=kwargs.pop("timeout", 5))
+        return MeetingSummarizer(client, cache_dir=tmp_path / "cache", chunk_chars=kwargs.pop("chunk_chars", 400),
+                                 **kwargs)
+    return build
+
+
+def test_map_reduce_output(stub_server, summarizer):
+    stub_server.handler = llm_reply
+    report = summarizer(concurrency=2).summarize(make_segments())
+
+    maps = map_prompts(stub_server)
+    assert report["chunks"] == len(maps) > 1
+    assert len(reduce_prompts(stub_server)) == 1
+    assert report["refreshed_chunks"] == len(maps)
+    assert report["cached_chunks"] == 0
+    assert report["model"] == "stub"
+    # 구간 요약이 청크 순서대로 reduce에 들어감
+    assert report["summary"].startswith("전체: 구간 0 (")
+    assert report["action_items"] == ["예산안 정리 (김철수)"]
+    # 요청 형식
+    assert all(p["format"] == "json" and p["stream"] is False and p["model"] == "stub" for _, p in stub_server.requests)
+
+
+def test_map_concurrency_is_bounded(stub_server, summarizer):
+    stub_server.handler = lambda path, payload: (*llm_reply(path, payload), 0.05)
+    summarizer(concurrency=2).summarize(make_segments(30))
+    assert stub_server.peak == 2
+
+
+def test_rerun_hits_prompt_cache(stub_server, summarizer):
+    stub_server.handler = llm_reply
+    first = summarizer().summarize(make_segments())
+    calls = len(stub_server.requests)
+
+    # 같은 캐시 디렉토리의 새 인스턴스: map/reduce 모두 프롬프트 해시 캐시에서 응답
+    second = summarizer().summarize(make_segments())
+    assert len(stub_server.requests) == calls
+    assert second["summary"] == first["summary"]
+    assert second["action_items"] == first["action_items"]
+
+
+def test_edit_resummarizes_only_changed_chunk(stub_server, summarizer, tmp_path):
+    stub_server.handler = llm_reply
+    segments = make_segments()
+    manifest = ChunkManifest(tmp_path, 400)
+    first = summarizer().summarize(segments, manifest)
+
+    segments[5] = {**segments[5], "text": "5번 안건은 다음 회의로 미루기로 했습니다."}
+    before = len(map_prompts(stub_server))
+    second = summarizer().summarize(segments, ChunkManifest(tmp_path, 400))
+
+    assert len(map_prompts(stub_server)) - before == 1
+    assert second["refreshed_chunks"] == 1
+    assert second["cached_chunks"] == first["chunks"] - 1
+    assert len(reduce_prompts(stub_server)) == 2
+
+
+def test_server_error_propagates_and_is_not_cached(stub_server, summarizer):
+    failing = {"first": None}
+    answered = set()
+
+    def handler(path, payload):
+        # 두 번째 구간만 실패
+        if "구간별 요약" not in payload["prompt"] and re.search(r"\] [^:]+: 2번", payload["prompt"]):
+            failing["first"] = failing["first"] or payload["prompt"]
+            return 500, {"error": "model crashed"}
+        answered.add(payload["prompt"])
+        return llm_reply(path, payload)
+
+    stub_server.handler = handler
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        summarizer().summarize(make_segments())
+    assert excinfo.value.code == 500
+    assert not reduce_prompts(stub_server)
+
+    # 서버가 복구되면 실패했거나 실행되지 못한 구간과 reduce만 다시 호출 (성공한 구간은 캐시)
+    stub_server.handler = llm_reply
+    maps_before = len(map_prompts(stub_server))
+    report = summarizer().summarize(make_segments())
+    retried = [p["prompt"] for p in map_prompts(stub_server)[maps_before:]]
+    assert failing["first"] in retried
+    assert not answered & set(retried)
+    assert report["summary"].startswith("전체: 구간 0 (")
+
+
+def test_timeout_raises(stub_server, summarizer):
+    stub_server.handler = lambda path, payload: (*llm_reply(path, payload), 1.0)
+    with pytest.raises((TimeoutError, urllib.error.URLError)):
+        summarizer(timeout=0.2).summarize(make_segments(2))
+
+
+def test_non_json_output_falls_back_to_text(stub_server, summarizer):
+    stub_server.handler = lambda path, payload: (200, {"response": "그냥 문장으로 된 요약"})
+    report = summarizer().summarize(make_segments(2))
+    assert report["summary"] == "그냥 문장으로 된 요약"
+    assert report["action_items"] == []
+
+
+def test_parse_summary_extracts_embedded_json():
+    text = '요약입니다: {"summary": "회의 요약", "action_items": [{"task": "보고서", "owner": "김철수"}, "보고서 / 김철수"]}'
+    assert parse_summary(text) == {"summary": "회의 요약", "action_items": ["보고서 / 김철수"]}